@@ -0,0 +1,264 @@
+"""
+Benchmarks for :py:class:`uqbar.containers.DependencyGraph`.
+
+Run with ``python benchmarks/bench_dependency_graph.py``.
+"""
+
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import uqbar.containers
+from uqbar.io import Timer
+
+
+def build_graph(node_count, parents_per_node=3, seed=0):
+    rng = random.Random(seed)
+    graph = uqbar.containers.DependencyGraph()
+    graph.add(0)
+    for i in range(1, node_count):
+        for _ in range(parents_per_node):
+            graph.add(i, parent=rng.randrange(i))
+    return graph
+
+
+def bench_load(edge_count=1000000, hub_count=10, seed=0):
+    print(f"loading {edge_count} edges, with {hub_count} hub parents")
+    rng = random.Random(seed)
+    node_count = edge_count // 4
+    edges = []
+    for i in range(edge_count):
+        # Parents always precede children, so the graph stays acyclic.
+        child = rng.randrange(hub_count, node_count)
+        if i % 2:
+            edges.append((child, rng.randrange(child)))
+        else:
+            edges.append((child, rng.randrange(hub_count)))
+    timings = []
+    with Timer(verbose=False) as timer:
+        graph = uqbar.containers.DependencyGraph()
+        for child, parent in edges:
+            graph.add(child, parent=parent)
+    timings.append(f"add() {timer.elapsed_time:.4f}s")
+    with Timer(verbose=False) as timer:
+        graph = uqbar.containers.DependencyGraph()
+        graph.add_edges(edges)
+    timings.append(f"add_edges() {timer.elapsed_time:.4f}s")
+    with Timer(verbose=False) as timer:
+        uqbar.containers.DependencyGraph().update(graph)
+    timings.append(f"update() {timer.elapsed_time:.4f}s")
+    nodes = list(graph)[:10000]
+    with Timer(verbose=False) as timer:
+        for node in nodes:
+            graph.remove(node)
+    timings.append(f"10000 remove() {timer.elapsed_time:.4f}s")
+    print("    " + ", ".join(timings))
+
+
+def bench_strict(node_counts=(1000, 10000, 100000), parents_per_node=3, seed=0):
+    print("adding shuffled edges online")
+    for node_count in node_counts:
+        rng = random.Random(seed)
+        edges = [
+            (i, rng.randrange(i))
+            for i in range(1, node_count)
+            for _ in range(parents_per_node)
+        ]
+        rng.shuffle(edges)
+        # Interleave one backwards edge per hundred, each closing a cycle.
+        mixed_edges = []
+        for i, edge in enumerate(edges):
+            if not i % 100:
+                mixed_edges.append(edge[::-1])
+            mixed_edges.append(edge)
+        timings = []
+        with Timer(verbose=False) as timer:
+            uqbar.containers.DependencyGraph().add_edges(edges)
+        timings.append(f"unchecked {timer.elapsed_time:.4f}s")
+        with Timer(verbose=False) as timer:
+            graph = uqbar.containers.DependencyGraph(strict=True)
+            for child, parent in edges:
+                graph.add(child, parent=parent)
+        timings.append(f"strict {timer.elapsed_time:.4f}s")
+        with Timer(verbose=False) as timer:
+            graph = uqbar.containers.DependencyGraph(strict=True)
+            for child, parent in mixed_edges:
+                try:
+                    graph.add(child, parent=parent)
+                except ValueError:
+                    pass
+        timings.append(f"strict with 1% rejected {timer.elapsed_time:.4f}s")
+        if node_count <= 1000:
+            # Without strict mode each add needs a full rescan to be checked.
+            with Timer(verbose=False) as timer:
+                graph = uqbar.containers.DependencyGraph()
+                for child, parent in edges:
+                    graph.add(child, parent=parent)
+                    graph.is_acyclic()
+            timings.append(f"is_acyclic() per add {timer.elapsed_time:.4f}s")
+        print(f"    {node_count:>8} nodes: " + ", ".join(timings))
+
+
+def bench_compact(node_count=100000, parents_per_node=3):
+    print(f"compact storage of {node_count} nodes, {parents_per_node} parents each")
+    graph = build_graph(node_count, parents_per_node=parents_per_node)
+    for label, function in [
+        ("DependencyGraph", graph.copy),
+        (
+            "CompactDependencyGraph",
+            lambda: uqbar.containers.CompactDependencyGraph.from_graph(graph),
+        ),
+    ]:
+        tracemalloc.start()
+        copied = function()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        with Timer(verbose=False) as iterate_timer:
+            list(copied)
+        data = pickle.dumps(copied, protocol=pickle.HIGHEST_PROTOCOL)
+        with Timer(verbose=False) as load_timer:
+            pickle.loads(data)
+        print(
+            f"    {label}: {size / node_count:.0f} B/node, "
+            f"iterate {iterate_timer.elapsed_time:.4f}s, "
+            f"pickle {len(data) / node_count:.0f} B/node, "
+            f"unpickle {load_timer.elapsed_time:.4f}s"
+        )
+    compact_graph = uqbar.containers.CompactDependencyGraph.from_graph(graph)
+    compact_graph.freeze()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "graph.bin")
+        compact_graph.write(path)
+        for memory_map in (True, False):
+            with Timer(verbose=False) as timer:
+                read_graph = uqbar.containers.CompactDependencyGraph.read(
+                    path, memory_map=memory_map
+                )
+            print(f"    read(memory_map={memory_map}): {timer.elapsed_time:.4f}s")
+            read_graph.release()
+
+
+def bench_reachability(node_count=3000, seed=0):
+    print(f"depth and lineage of every node in a {node_count}-class hierarchy")
+    rng = random.Random(seed)
+    graph = uqbar.containers.DependencyGraph()
+    graph.add(0)
+    for i in range(1, node_count):
+        # Mostly single inheritance from recent classes, with some mixins.
+        for _ in range(1 if rng.random() < 0.8 else 2):
+            graph.add(i, parent=rng.randrange(max(0, i - 50), i))
+    children_to_parents = graph._children_to_parents
+    parents_to_children = graph._parents_to_children
+
+    def old_depth(node, depth=0):
+        # The breadth-first walk InheritanceGraph used before.
+        parents = children_to_parents.get(node, ())
+        while parents:
+            depth += 1
+            new_parents = set()
+            for parent in parents:
+                new_parents.update(children_to_parents.get(parent, ()))
+            parents = new_parents
+        return depth
+
+    def old_lineage(nodes):
+        def upward(node):
+            visited.add(node)
+            for parent in children_to_parents.get(node, ()):
+                upward(parent)
+
+        def downward(node):
+            visited.add(node)
+            for child in parents_to_children.get(node, ()):
+                downward(child)
+
+        visited = set()
+        for node in nodes:
+            upward(node)
+            downward(node)
+        return visited
+
+    def new_lineage(graph, nodes):
+        visited = set(nodes)
+        for node in nodes:
+            visited.update(graph.ancestors(node))
+            visited.update(graph.descendants(node))
+        return visited
+
+    lineage = list(range(node_count // 2, node_count // 2 + 20))
+    timings = []
+    with Timer(verbose=False) as timer:
+        depths = [old_depth(node) for node in children_to_parents]
+    timings.append(f"old depth {timer.elapsed_time:.4f}s")
+    with Timer(verbose=False) as timer:
+        cached_graph = uqbar.containers.DependencyGraph(cached=True)
+        cached_graph.update(graph)
+        assert [cached_graph.depth(node) for node in children_to_parents] == depths
+    timings.append(f"cached depth() {timer.elapsed_time:.4f}s")
+    print("    " + ", ".join(timings))
+    timings = []
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), node_count * 2))
+    with Timer(verbose=False) as timer:
+        visited = old_lineage(lineage)
+    timings.append(f"old lineage walk {timer.elapsed_time:.4f}s")
+    for cached in (False, True):
+        copied = uqbar.containers.DependencyGraph(cached=cached)
+        copied.update(graph)
+        with Timer(verbose=False) as timer:
+            assert new_lineage(copied, lineage) == visited
+        timings.append(
+            f"ancestors()/descendants() cached={cached} {timer.elapsed_time:.4f}s"
+        )
+    print("    " + ", ".join(timings))
+
+
+def pop_all(graph):
+    # The pop()-driven peel which __iter__ and is_acyclic() used to run.
+    trellis = graph.copy()
+    while len(trellis):
+        trellis.pop()
+
+
+def bench_peel(node_counts=(1000, 2000, 4000, 100000)):
+    print("peeling a graph with 3 parents per node")
+    for node_count in node_counts:
+        graph = build_graph(node_count)
+        timings = []
+        for label, function in [
+            ("list(graph)", list),
+            ("is_acyclic", uqbar.containers.DependencyGraph.is_acyclic),
+            ("iter_levels", lambda graph: list(graph.iter_levels())),
+            ("pop() loop", pop_all),
+        ]:
+            if function is pop_all and node_count > 10000:
+                continue
+            with Timer(verbose=False) as timer:
+                function(graph)
+            timings.append(f"{label} {timer.elapsed_time:.4f}s")
+        print(f"    {node_count:>8} nodes: " + ", ".join(timings))
+
+
+def bench_execute(node_count=400, delay=0.002, worker_counts=(1, 4, 16)):
+    print(f"executing {node_count} nodes which each sleep {delay * 1000:.0f}ms")
+    graph = build_graph(node_count, parents_per_node=1)
+    with Timer(verbose=False) as timer:
+        for node in graph:
+            time.sleep(delay)
+    print(f"    serial iteration: {timer.elapsed_time:.4f}s")
+    for worker_count in worker_counts:
+        with Timer(verbose=False) as timer:
+            graph.execute(lambda node: time.sleep(delay), max_workers=worker_count)
+        print(f"    {worker_count:>2} threads: {timer.elapsed_time:.4f}s")
+
+
+if __name__ == "__main__":
+    bench_load()
+    bench_peel()
+    bench_strict()
+    bench_compact()
+    bench_reachability()
+    bench_execute()
@@ -0,0 +1,255 @@
+"""
+Benchmarks for :py:mod:`uqbar.io`.
+
+Run with ``python benchmarks/bench_io.py``.
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import uqbar.io
+from uqbar.book import ConsoleOutput
+from uqbar.io import Timer
+
+
+def iterdir_walk(root_path, top_down=True):
+    # The iterdir()-based walk() which the scandir-based walk() replaces.
+    root_path = Path(root_path)
+    directory_paths, file_paths = [], []
+    for path in sorted(root_path.iterdir()):
+        if path.is_dir():
+            directory_paths.append(path)
+        else:
+            file_paths.append(path)
+    if top_down:
+        yield root_path, directory_paths, file_paths
+    for directory_path in directory_paths:
+        yield from iterdir_walk(directory_path, top_down=top_down)
+    if not top_down:
+        yield root_path, directory_paths, file_paths
+
+
+def read_write(contents, path):
+    # The read-and-compare write() which write_many() replaces.
+    path = Path(path)
+    if path.exists():
+        if path.read_text() == contents:
+            return False
+        path.write_text(contents)
+        return True
+    if not path.parent.exists():
+        path.parent.mkdir(parents=True)
+    path.write_text(contents)
+    return True
+
+
+class TimeTimer:
+    # The time.time()-based, non-reentrant Timer which Timer replaces.
+    def __enter__(self):
+        self.start_time = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop_time = time.time()
+
+
+def build_tree(root_path, depth, fanout, file_count):
+    for i in range(file_count):
+        (root_path / f"module_{i}.py").touch()
+    if depth:
+        for i in range(fanout):
+            path = root_path / f"package_{i}"
+            path.mkdir()
+            build_tree(path, depth - 1, fanout, file_count)
+
+
+def scanning_find_executable(name, flags=os.X_OK):
+    # The find_executable() which checks every PATH entry on every call.
+    result = []
+    extensions = [x for x in os.environ.get("PATHEXT", "").split(os.pathsep) if x]
+    for directory_name in os.environ.get("PATH", "").split(os.pathsep):
+        executable_path = Path(directory_name) / name
+        executable_path = executable_path.resolve().absolute()
+        if os.access(executable_path, flags):
+            result.append(str(executable_path))
+        for extension in extensions:
+            extension_path = executable_path.with_suffix(extension)
+            if os.access(extension_path, flags):
+                result.append(str(extension_path))
+    return result
+
+
+def bench_walk(depth=4, fanout=6, file_count=12):
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        root_path = Path(temporary_directory)
+        build_tree(root_path, depth, fanout, file_count)
+        directory_count = sum(1 for _ in uqbar.io.walk(root_path))
+        print(f"walking {directory_count} directories of {file_count} files")
+        for label, function in [
+            ("iterdir walk", lambda: iterdir_walk(root_path)),
+            ("walk", lambda: uqbar.io.walk(root_path)),
+            ("walk(include=...)", lambda: uqbar.io.walk(root_path, include=["*.py"])),
+            ("walk(max_workers=4)", lambda: uqbar.io.walk(root_path, max_workers=4)),
+        ]:
+            with Timer(verbose=False) as timer:
+                for _ in function():
+                    pass
+            print(f"    {label}: {timer.elapsed_time:.4f}s")
+
+
+def bench_write_many(file_count=500, file_size=20000, directory_count=20):
+    print(f"writing {file_count} files of {file_size} bytes")
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        root_path = Path(temporary_directory)
+        for label, function in [
+            (
+                "write loop",
+                lambda mapping: [read_write(v, k) for k, v in mapping.items()],
+            ),
+            ("write_many", uqbar.io.write_many),
+            (
+                "write_many(max_workers=4)",
+                lambda mapping: uqbar.io.write_many(mapping, max_workers=4),
+            ),
+        ]:
+            mapping = {
+                root_path / label / str(i % directory_count) / f"{i}.rst": (
+                    f"{i:<8}" + "x" * (file_size - 9) + "\n"
+                )
+                for i in range(file_count)
+            }
+            timings = []
+            for phase in ("new", "unchanged", "changed"):
+                if phase == "changed":
+                    mapping = {k: v[::-1] for k, v in mapping.items()}
+                with Timer(verbose=False) as timer:
+                    function(mapping)
+                timings.append(f"{phase} {timer.elapsed_time:.4f}s")
+            print(f"    {label}: " + ", ".join(timings))
+
+
+def fibonacci(n):
+    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+
+def bench_profiler(n=25):
+    print(f"profiling fibonacci({n})")
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        for label, factory in [
+            ("unprofiled", lambda: Timer(verbose=False)),
+            (
+                "deterministic",
+                lambda: uqbar.io.Profiler(
+                    output_directory=temporary_directory, verbose=False
+                ),
+            ),
+            (
+                "sampling",
+                lambda: uqbar.io.Profiler(
+                    mode="sampling", output_directory=temporary_directory, verbose=False
+                ),
+            ),
+        ]:
+            with Timer(verbose=False) as timer:
+                with factory():
+                    fibonacci(n)
+            print(f"    {label}: {timer.elapsed_time:.4f}s")
+
+
+def bench_timer(span_count=100000):
+    print(f"entering {span_count} timer spans")
+    registry = uqbar.io.TimerRegistry()
+    outer_timer = Timer(name="outer", registry=registry)
+    for label, factory in [
+        ("time.time() Timer", TimeTimer),
+        ("Timer", lambda: Timer(verbose=False)),
+        ("Timer(name=...)", lambda: Timer(name="inner", registry=registry)),
+    ]:
+        timers = [factory() for _ in range(span_count)]
+        with outer_timer:
+            with Timer(verbose=False) as timer:
+                for inner_timer in timers:
+                    with inner_timer:
+                        pass
+        print(f"    {label}: {timer.elapsed_time / span_count * 1e9:.0f}ns per span")
+    with Timer(verbose=False) as timer:
+        registry.as_dict()
+    print(f"    summarizing {span_count} spans: {timer.elapsed_time:.4f}s")
+
+
+def bench_memory_profiler(item_count=200000):
+    print(f"building a list of {item_count} strings")
+    for label, factory in [
+        ("unprofiled", lambda: Timer(verbose=False)),
+        ("memory-profiled", lambda: uqbar.io.MemoryProfiler(verbose=False)),
+    ]:
+        with Timer(verbose=False) as timer:
+            with factory():
+                [str(i) for i in range(item_count)]
+        print(f"    {label}: {timer.elapsed_time:.4f}s")
+
+
+def bench_find_executable(lookup_count=1000):
+    names = ["dot", "neato", "unflatten", "python"]
+    path_count = len(os.environ.get("PATH", "").split(os.pathsep))
+    print(f"looking up {len(names)} executables {lookup_count} times")
+    print(f"    ({path_count} PATH entries)")
+    for label, function in [
+        ("per-call scan", lambda: [scanning_find_executable(_) for _ in names]),
+        ("find_executable", lambda: [uqbar.io.find_executable(_) for _ in names]),
+        ("find_executables", lambda: uqbar.io.find_executables(names)),
+    ]:
+        with Timer(verbose=False) as timer:
+            for _ in range(lookup_count):
+                function()
+        print(
+            f"    {label}: {timer.elapsed_time / lookup_count * 1e6:.1f}us per lookup"
+        )
+
+
+class ListCapture:
+    # Console's former capture, keeping one object per write.
+    def __init__(self):
+        self.results = []
+
+    def flush(self):
+        pass
+
+    def write(self, string):
+        self.results.append(ConsoleOutput(string))
+
+
+def bench_capture(line_count=200000):
+    print(f"capturing {line_count} printed lines")
+    for label, factory in [
+        ("one object per write", ListCapture),
+        ("CaptureBuffer", uqbar.io.CaptureBuffer),
+        ("CaptureBuffer(max_size=65536)", lambda: uqbar.io.CaptureBuffer(65536)),
+    ]:
+        # Time without tracemalloc running, which would dominate.
+        with Timer(verbose=False) as timer:
+            with uqbar.io.RedirectedStreams(stdout=factory()):
+                for i in range(line_count):
+                    print(i)
+        stream = factory()
+        with uqbar.io.MemoryProfiler(verbose=False) as memory_profiler:
+            with uqbar.io.RedirectedStreams(stdout=stream):
+                for i in range(line_count):
+                    print(i)
+        print(
+            f"    {label}: {timer.elapsed_time:.4f}s, "
+            f"{memory_profiler.net / 2**20:.1f} MiB retained"
+        )
+        del stream
+
+
+if __name__ == "__main__":
+    bench_walk()
+    bench_write_many()
+    bench_timer()
+    bench_profiler()
+    bench_memory_profiler()
+    bench_find_executable()
+    bench_capture()
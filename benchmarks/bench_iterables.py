@@ -0,0 +1,166 @@
+"""
+Benchmarks for :py:mod:`uqbar.iterables`.
+
+Run with ``python benchmarks/bench_iterables.py``.
+"""
+
+import functools
+import itertools
+
+import uqbar.iterables
+from uqbar.io import Timer
+
+
+def tee_nwise(iterable, n=2):
+    # The tee-based nwise() which sliding_window() replaces.
+    iterables = itertools.tee(iterable, n)
+    return zip(*(itertools.islice(it, i, None) for i, it in enumerate(iterables)))
+
+
+def enumerate_repeat_to_length(sequence, length):
+    # The enumerate-based repeat_to_length() which islice() replaces.
+    for i, x in enumerate(itertools.cycle(sequence)):
+        if i >= length:
+            break
+        yield x
+
+
+def enumerate_zip_cyclic(*args):
+    # The enumerate-based zip_cyclic() which islice() replaces.
+    maximum_i = max(len(_) for _ in args) - 1
+    cycles = [itertools.cycle(_) for _ in args]
+    for i, result in enumerate(zip(*cycles)):
+        yield result
+        if i == maximum_i:
+            break
+
+
+def bench_chunked(item_count=1000000, sizes=(4, 64, 4096)):
+    print(f"chunking {item_count} items")
+    items = list(range(item_count))
+    data = bytes(item_count)
+    for size in sizes:
+        timings = []
+        for label, function in [
+            (
+                "group_by_count(list)",
+                functools.partial(uqbar.iterables.group_by_count, items, size),
+            ),
+            ("chunked(list)", functools.partial(uqbar.iterables.chunked, items, size)),
+            (
+                "group_by_count(bytes)",
+                functools.partial(uqbar.iterables.group_by_count, data, size),
+            ),
+            ("chunked(bytes)", functools.partial(uqbar.iterables.chunked, data, size)),
+        ]:
+            with Timer(verbose=False) as timer:
+                for _ in function():
+                    pass
+            timings.append(f"{label} {timer.elapsed_time:.4f}s")
+        print(f"    size {size:>4}: " + ", ".join(timings))
+
+
+def bench_flatten(group_count=100000, group_size=10):
+    print(f"flattening {group_count} lists of {group_size} items, one level deep")
+    groups = [list(range(group_size)) for _ in range(group_count)]
+    timings = []
+    for label, function in [
+        ("chain.from_iterable", lambda: list(itertools.chain.from_iterable(groups))),
+        (
+            "flatten(max_depth=1)",
+            lambda: list(uqbar.iterables.flatten(groups, max_depth=1)),
+        ),
+        ("flatten()", lambda: list(uqbar.iterables.flatten(groups))),
+    ]:
+        with Timer(verbose=False) as timer:
+            function()
+        timings.append(f"{label} {timer.elapsed_time:.4f}s")
+    print("    " + ", ".join(timings))
+
+
+def bench_flatten_deep(depth=100000):
+    print(f"flattening a list nested {depth} levels deep")
+    nested = ["leaf"]
+    for _ in range(depth):
+        nested = [nested, "leaf"]
+    with Timer(verbose=False) as timer:
+        assert len(list(uqbar.iterables.flatten(nested))) == depth + 1
+    print(f"    flatten() {timer.elapsed_time:.4f}s")
+
+
+def bench_sliding_window(item_count=200000, ns=(2, 8, 32)):
+    print(f"sliding windows over {item_count} items")
+    items = list(range(item_count))
+    for n in ns:
+        timings = []
+        for label, function in [
+            ("tee nwise(list)", functools.partial(tee_nwise, items, n)),
+            (
+                "sliding_window(list)",
+                functools.partial(uqbar.iterables.sliding_window, items, n),
+            ),
+            ("tee nwise(iterator)", functools.partial(tee_nwise, iter(items), n)),
+            (
+                "sliding_window(iterator)",
+                functools.partial(uqbar.iterables.sliding_window, iter(items), n),
+            ),
+        ]:
+            with Timer(verbose=False) as timer:
+                for _ in function():
+                    pass
+            timings.append(f"{label} {timer.elapsed_time:.4f}s")
+        print(f"    n={n:>2}: " + ", ".join(timings))
+
+
+def bench_cyclic(length=1000000, pattern_size=7):
+    print(f"repeating {pattern_size}-item patterns to {length} items")
+    pattern = list(range(pattern_size))
+    long_pattern = list(range(length))
+    functions = [
+        (
+            "enumerate repeat_to_length",
+            lambda: list(enumerate_repeat_to_length(pattern, length)),
+        ),
+        (
+            "repeat_to_length",
+            lambda: list(uqbar.iterables.repeat_to_length(pattern, length)),
+        ),
+        (
+            "enumerate zip_cyclic",
+            lambda: list(enumerate_zip_cyclic(pattern, long_pattern)),
+        ),
+        (
+            "zip_cyclic",
+            lambda: list(uqbar.iterables.zip_cyclic(pattern, long_pattern)),
+        ),
+        (
+            "zip_cyclic(length=...)",
+            lambda: list(
+                uqbar.iterables.zip_cyclic(pattern, long_pattern, length=length)
+            ),
+        ),
+    ]
+    # Without NumPy the array variants fall back to lazy iterators.
+    if uqbar.iterables.numpy is not None:
+        functions += [
+            (
+                "repeat_to_length_array",
+                lambda: uqbar.iterables.repeat_to_length_array(pattern, length),
+            ),
+            (
+                "zip_cyclic_arrays",
+                lambda: uqbar.iterables.zip_cyclic_arrays(pattern, long_pattern),
+            ),
+        ]
+    for label, function in functions:
+        with Timer(verbose=False) as timer:
+            function()
+        print(f"    {label}: {timer.elapsed_time:.4f}s")
+
+
+if __name__ == "__main__":
+    bench_flatten()
+    bench_flatten_deep()
+    bench_sliding_window()
+    bench_chunked()
+    bench_cyclic()
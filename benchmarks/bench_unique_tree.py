@@ -0,0 +1,189 @@
+"""
+Benchmarks for :py:mod:`uqbar.containers.unique_tree`.
+
+Run with ``python benchmarks/bench_unique_tree.py``.
+"""
+
+import copy
+import tracemalloc
+
+import uqbar.containers
+import uqbar.graphs
+from uqbar.io import Timer
+
+
+def build_graph(cluster_count, nodes_per_cluster=100, depth=10, attach=True):
+    graph = uqbar.graphs.Graph()
+    previous_node = None
+    for _ in range(cluster_count):
+        parent = graph
+        for _ in range(depth):
+            cluster = uqbar.graphs.Graph(is_cluster=True)
+            parent.append(cluster)
+            parent = cluster
+        for _ in range(nodes_per_cluster):
+            node = uqbar.graphs.Node()
+            parent.append(node)
+            if attach and previous_node is not None:
+                previous_node.attach(node)
+            previous_node = node
+    return graph
+
+
+def bench_extend(subtree_counts=(250, 500, 1000, 2000), depth=10):
+    print("container.extend(named_subtrees) at depth {}".format(depth))
+    for subtree_count in subtree_counts:
+        root = parent = uqbar.containers.UniqueTreeList(name="root")
+        for i in range(depth):
+            child = uqbar.containers.UniqueTreeList(name=f"level-{i}")
+            parent.append(child)
+            parent = child
+        subtrees = []
+        for i in range(subtree_count):
+            subtree = uqbar.containers.UniqueTreeList(name=f"subtree-{i}")
+            subtree.extend(
+                uqbar.containers.UniqueTreeNode(name=f"leaf-{j}") for j in range(10)
+            )
+            subtrees.append(subtree)
+        with Timer(verbose=False) as timer:
+            parent.extend(subtrees)
+        assert len(root._named_children) == depth + subtree_count + 10
+        print(
+            f"    {subtree_count:>8} subtrees: {timer.elapsed_time:.4f}s "
+            f"({timer.elapsed_time / subtree_count * 1e6:.2f}us/subtree)"
+        )
+
+
+def bench_format(cluster_counts=(10, 20, 40, 80)):
+    print("format(graph, 'graphviz')")
+    for cluster_count in cluster_counts:
+        graph = build_graph(cluster_count)
+        node_count = sum(1 for _ in graph.depth_first())
+        with Timer(verbose=False) as timer:
+            format(graph, "graphviz")
+        print(
+            f"    {node_count:>8} nodes: {timer.elapsed_time:.4f}s "
+            f"({timer.elapsed_time / node_count * 1e6:.2f}us/node)"
+        )
+
+
+def build_named_tree(container_class, node_class, branching=10, depth=4):
+    root = container_class(name="root")
+    parents = [root]
+    for level in range(depth):
+        children = []
+        for i, parent in enumerate(parents):
+            class_ = container_class if level < depth - 1 else node_class
+            nodes = [class_(name=f"{level}-{i}-{j}") for j in range(branching)]
+            parent.extend(nodes)
+            children.extend(nodes)
+        parents = children
+    return root
+
+
+def bench_memory(branching=10, depth=4):
+    class DictList(uqbar.containers.UniqueTreeList):
+        pass
+
+    class DictNode(uqbar.containers.UniqueTreeNode):
+        pass
+
+    print(f"tracemalloc bytes per node, {branching}-way tree of depth {depth}")
+    for label, container_class, node_class in [
+        ("__dict__ subclasses", DictList, DictNode),
+        ("__slots__", uqbar.containers.UniqueTreeList, uqbar.containers.UniqueTreeNode),
+    ]:
+        tracemalloc.start()
+        root = build_named_tree(container_class, node_class, branching, depth)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        node_count = sum(1 for _ in root.depth_first()) + 1
+        print(f"    {label:>24}: {size / node_count:.1f}B/node ({node_count} nodes)")
+
+
+def bench_move(depths=(10, 20, 40, 80), subtree_size=100, move_count=200):
+    print(f"move a {subtree_size}-name subtree between trees of growing depth")
+    for depth in depths:
+        roots = []
+        for _ in range(2):
+            root = parent = uqbar.containers.UniqueTreeList(name="root")
+            for i in range(depth):
+                child = uqbar.containers.UniqueTreeList(name=f"level-{i}")
+                parent.append(child)
+                parent = child
+            roots.append((root, parent))
+        subtree = uqbar.containers.UniqueTreeList(name="subtree")
+        subtree.extend(
+            uqbar.containers.UniqueTreeNode(name=f"leaf-{j}")
+            for j in range(subtree_size)
+        )
+        with Timer(verbose=False) as timer:
+            for i in range(move_count):
+                roots[i % 2][1].append(subtree)
+        assert "leaf-0" in roots[1][0]
+        print(
+            f"    depth {depth:>4}: {timer.elapsed_time:.4f}s "
+            f"({timer.elapsed_time / move_count * 1e6:.2f}us/move)"
+        )
+
+
+def bench_same_name_format(node_counts=(500, 1000, 2000, 4000)):
+    print("format(graph, 'graphviz') with every node sharing one name")
+    for node_count in node_counts:
+        graph = uqbar.graphs.Graph()
+        graph.extend(uqbar.graphs.Node(name="record") for _ in range(node_count))
+        with Timer(verbose=False) as timer:
+            format(graph, "graphviz")
+        print(
+            f"    {node_count:>8} nodes: {timer.elapsed_time:.4f}s "
+            f"({timer.elapsed_time / node_count * 1e6:.2f}us/node)"
+        )
+
+
+def bench_snapshot(cluster_counts=(10, 20, 40, 80)):
+    print("graph.snapshot() after renaming one node, vs copy.deepcopy(graph)")
+    for cluster_count in cluster_counts:
+        # Long edge chains overflow deepcopy's recursion, so skip edges here.
+        graph = build_graph(cluster_count, attach=False)
+        node_count = sum(1 for _ in graph.depth_first())
+        with Timer(verbose=False) as deepcopy_timer:
+            copy.deepcopy(graph)
+        with Timer(verbose=False) as first_timer:
+            graph.snapshot()
+        node = graph[-1]
+        while isinstance(node, uqbar.graphs.Graph):
+            node = node[-1]
+        with Timer(verbose=False) as timer:
+            for i in range(100):
+                node.name = f"renamed-{i}"
+                graph.snapshot()
+        print(
+            f"    {node_count:>8} nodes: deepcopy {deepcopy_timer.elapsed_time:.4f}s, "
+            f"first snapshot {first_timer.elapsed_time:.4f}s, "
+            f"next snapshot {timer.elapsed_time / 100 * 1e6:.2f}us"
+        )
+
+
+def bench_wide_index(child_counts=(1000, 2000, 4000, 8000)):
+    print("cluster.index(node) for every child of a wide cluster")
+    for child_count in child_counts:
+        graph = uqbar.graphs.Graph()
+        graph.extend(uqbar.graphs.Node() for _ in range(child_count))
+        graph.insert(0, uqbar.graphs.Node())
+        with Timer(verbose=False) as timer:
+            for node in graph:
+                graph.index(node)
+        print(
+            f"    {child_count:>8} children: {timer.elapsed_time:.4f}s "
+            f"({timer.elapsed_time / child_count * 1e6:.2f}us/child)"
+        )
+
+
+if __name__ == "__main__":
+    bench_extend()
+    bench_format()
+    bench_memory()
+    bench_move()
+    bench_same_name_format()
+    bench_snapshot()
+    bench_wide_index()
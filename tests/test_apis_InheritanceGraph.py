@@ -43,6 +43,7 @@ def test_01():
                 subgraph "cluster_uqbar.containers.dependency_graph" {
                     graph [label="uqbar.containers.dependency_graph"];
                     node [color=2];
+                    "uqbar.containers.dependency_graph.CompactDependencyGraph" [label="Compact\nDependency\nGraph"];
                     "uqbar.containers.dependency_graph.DependencyGraph" [label="Dependency\nGraph"];
                 }
                 subgraph "cluster_uqbar.containers.unique_tree" {
@@ -53,6 +54,7 @@ def test_01():
                     "uqbar.containers.unique_tree.UniqueTreeList" [label="Unique\nTree\nList"];
                     "uqbar.containers.unique_tree.UniqueTreeNode" [label="Unique\nTree\nNode"];
                     "uqbar.containers.unique_tree.UniqueTreeSet" [label="Unique\nTree\nSet"];
+                    "uqbar.containers.unique_tree.UniqueTreeSnapshot" [label="Unique\nTree\nSnapshot"];
                     "uqbar.containers.unique_tree.UniqueTreeTuple" [label="Unique\nTree\nTuple"];
                     "uqbar.containers.unique_tree.UniqueTreeContainer" -> "uqbar.containers.unique_tree.UniqueTreeDict";
                     "uqbar.containers.unique_tree.UniqueTreeContainer" -> "uqbar.containers.unique_tree.UniqueTreeList";
@@ -60,8 +62,10 @@ def test_01():
                     "uqbar.containers.unique_tree.UniqueTreeContainer" -> "uqbar.containers.unique_tree.UniqueTreeTuple";
                     "uqbar.containers.unique_tree.UniqueTreeNode" -> "uqbar.containers.unique_tree.UniqueTreeContainer";
                 }
+                "builtins.object" -> "uqbar.containers.dependency_graph.CompactDependencyGraph";
                 "builtins.object" -> "uqbar.containers.dependency_graph.DependencyGraph";
                 "builtins.object" -> "uqbar.containers.unique_tree.UniqueTreeNode";
+                "builtins.object" -> "uqbar.containers.unique_tree.UniqueTreeSnapshot";
             }
         """
     )
@@ -110,6 +114,7 @@ def test_02():
                 subgraph "cluster_uqbar.containers.dependency_graph" {
                     graph [label="uqbar.containers.dependency_graph"];
                     node [color=3];
+                    "uqbar.containers.dependency_graph.CompactDependencyGraph" [label="Compact\nDependency\nGraph"];
                     "uqbar.containers.dependency_graph.DependencyGraph" [label="Dependency\nGraph"];
                 }
                 subgraph "cluster_uqbar.containers.unique_tree" {
@@ -120,6 +125,7 @@ def test_02():
                     "uqbar.containers.unique_tree.UniqueTreeList" [label="Unique\nTree\nList"];
                     "uqbar.containers.unique_tree.UniqueTreeNode" [label="Unique\nTree\nNode"];
                     "uqbar.containers.unique_tree.UniqueTreeSet" [label="Unique\nTree\nSet"];
+                    "uqbar.containers.unique_tree.UniqueTreeSnapshot" [label="Unique\nTree\nSnapshot"];
                     "uqbar.containers.unique_tree.UniqueTreeTuple" [label="Unique\nTree\nTuple"];
                     "uqbar.containers.unique_tree.UniqueTreeContainer" -> "uqbar.containers.unique_tree.UniqueTreeDict";
                     "uqbar.containers.unique_tree.UniqueTreeContainer" -> "uqbar.containers.unique_tree.UniqueTreeList";
@@ -151,8 +157,10 @@ def test_02():
                     "uqbar.graphs.records.RecordField" [label="Record\nField"];
                     "uqbar.graphs.records.RecordGroup" [label="Record\nGroup"];
                 }
+                "builtins.object" -> "uqbar.containers.dependency_graph.CompactDependencyGraph";
                 "builtins.object" -> "uqbar.containers.dependency_graph.DependencyGraph";
                 "builtins.object" -> "uqbar.containers.unique_tree.UniqueTreeNode";
+                "builtins.object" -> "uqbar.containers.unique_tree.UniqueTreeSnapshot";
                 "uqbar.containers.unique_tree.UniqueTreeList" -> "uqbar.apis.nodes.PackageNode";
                 "uqbar.containers.unique_tree.UniqueTreeList" -> "uqbar.graphs.core.Graph";
                 "uqbar.containers.unique_tree.UniqueTreeList" -> "uqbar.graphs.core.Node";
@@ -341,6 +349,7 @@ def test_03_py310():
                 subgraph "cluster_uqbar.containers.dependency_graph" {
                     graph [label="uqbar.containers.dependency_graph"];
                     node [color=6];
+                    "uqbar.containers.dependency_graph.CompactDependencyGraph" [label="Compact\nDependency\nGraph"];
                     "uqbar.containers.dependency_graph.DependencyGraph" [label="Dependency\nGraph"];
                 }
                 subgraph "cluster_uqbar.containers.unique_tree" {
@@ -351,6 +360,7 @@ def test_03_py310():
                     "uqbar.containers.unique_tree.UniqueTreeList" [label="Unique\nTree\nList"];
                     "uqbar.containers.unique_tree.UniqueTreeNode" [label="Unique\nTree\nNode"];
                     "uqbar.containers.unique_tree.UniqueTreeSet" [label="Unique\nTree\nSet"];
+                    "uqbar.containers.unique_tree.UniqueTreeSnapshot" [label="Unique\nTree\nSnapshot"];
                     "uqbar.containers.unique_tree.UniqueTreeTuple" [label="Unique\nTree\nTuple"];
                     "uqbar.containers.unique_tree.UniqueTreeContainer" -> "uqbar.containers.unique_tree.UniqueTreeDict";
                     "uqbar.containers.unique_tree.UniqueTreeContainer" -> "uqbar.containers.unique_tree.UniqueTreeList";
@@ -402,9 +412,15 @@ def test_03_py310():
                 subgraph "cluster_uqbar.io" {
                     graph [label="uqbar.io"];
                     node [color=5];
+                    "uqbar.io.CaptureBuffer" [color=black,
+                        fontcolor=white,
+                        label="Capture\nBuffer"];
                     "uqbar.io.DirectoryChange" [color=black,
                         fontcolor=white,
                         label="Directory\nChange"];
+                    "uqbar.io.MemoryProfiler" [color=black,
+                        fontcolor=white,
+                        label="Memory\nProfiler"];
                     "uqbar.io.Profiler" [color=black,
                         fontcolor=white,
                         label=Profiler];
@@ -414,10 +430,21 @@ def test_03_py310():
                     "uqbar.io.Timer" [color=black,
                         fontcolor=white,
                         label=Timer];
+                    "uqbar.io.TimerRegistry" [color=black,
+                        fontcolor=white,
+                        label="Timer\nRegistry"];
+                    "uqbar.io.WriteReport" [color=black,
+                        fontcolor=white,
+                        label="Write\nReport"];
+                }
+                subgraph "cluster_uqbar.iterables" {
+                    graph [label="uqbar.iterables"];
+                    node [color=6];
+                    "uqbar.iterables.SequenceView" [label="Sequence\nView"];
                 }
                 subgraph "cluster_uqbar.sphinx.inheritance" {
                     graph [label="uqbar.sphinx.inheritance"];
-                    node [color=6];
+                    node [color=7];
                     "uqbar.sphinx.inheritance.InheritanceDiagram" [label="Inheritance\nDiagram"];
                     "uqbar.sphinx.inheritance.inheritance_diagram" [label="inheritance\ndiagram"];
                 }
@@ -441,14 +468,21 @@ def test_03_py310():
                 "builtins.object" -> "uqbar.book.ConsoleOutput";
                 "builtins.object" -> "uqbar.book.Extension";
                 "builtins.object" -> "uqbar.book.MonkeyPatch";
+                "builtins.object" -> "uqbar.containers.dependency_graph.CompactDependencyGraph";
                 "builtins.object" -> "uqbar.containers.dependency_graph.DependencyGraph";
                 "builtins.object" -> "uqbar.containers.unique_tree.UniqueTreeNode";
+                "builtins.object" -> "uqbar.containers.unique_tree.UniqueTreeSnapshot";
                 "builtins.object" -> "uqbar.graphs.core.Edge";
                 "builtins.object" -> "uqbar.graphs.graphers.Grapher";
+                "builtins.object" -> "uqbar.io.CaptureBuffer";
                 "builtins.object" -> "uqbar.io.DirectoryChange";
+                "builtins.object" -> "uqbar.io.MemoryProfiler";
                 "builtins.object" -> "uqbar.io.Profiler";
                 "builtins.object" -> "uqbar.io.RedirectedStreams";
                 "builtins.object" -> "uqbar.io.Timer";
+                "builtins.object" -> "uqbar.io.TimerRegistry";
+                "builtins.object" -> "uqbar.io.WriteReport";
+                "builtins.object" -> "uqbar.iterables.SequenceView";
                 "code.InteractiveConsole" -> "uqbar.book.Console";
                 "collections.abc.MutableMapping" -> "uqbar.graphs.attrs.Attributes";
                 "docutils.nodes.Element" -> "uqbar.book.uqbar_book_defaults_block";
@@ -659,6 +693,7 @@ def test_03_py311():
             subgraph "cluster_uqbar.containers.dependency_graph" {
                 graph [label="uqbar.containers.dependency_graph"];
                 node [color=6];
+                "uqbar.containers.dependency_graph.CompactDependencyGraph" [label="Compact\nDependency\nGraph"];
                 "uqbar.containers.dependency_graph.DependencyGraph" [label="Dependency\nGraph"];
             }
             subgraph "cluster_uqbar.containers.unique_tree" {
@@ -669,6 +704,7 @@ def test_03_py311():
                 "uqbar.containers.unique_tree.UniqueTreeList" [label="Unique\nTree\nList"];
                 "uqbar.containers.unique_tree.UniqueTreeNode" [label="Unique\nTree\nNode"];
                 "uqbar.containers.unique_tree.UniqueTreeSet" [label="Unique\nTree\nSet"];
+                "uqbar.containers.unique_tree.UniqueTreeSnapshot" [label="Unique\nTree\nSnapshot"];
                 "uqbar.containers.unique_tree.UniqueTreeTuple" [label="Unique\nTree\nTuple"];
                 "uqbar.containers.unique_tree.UniqueTreeContainer" -> "uqbar.containers.unique_tree.UniqueTreeDict";
                 "uqbar.containers.unique_tree.UniqueTreeContainer" -> "uqbar.containers.unique_tree.UniqueTreeList";
@@ -720,9 +756,15 @@ def test_03_py311():
             subgraph "cluster_uqbar.io" {
                 graph [label="uqbar.io"];
                 node [color=5];
+                "uqbar.io.CaptureBuffer" [color=black,
+                    fontcolor=white,
+                    label="Capture\nBuffer"];
                 "uqbar.io.DirectoryChange" [color=black,
                     fontcolor=white,
                     label="Directory\nChange"];
+                "uqbar.io.MemoryProfiler" [color=black,
+                    fontcolor=white,
+                    label="Memory\nProfiler"];
                 "uqbar.io.Profiler" [color=black,
                     fontcolor=white,
                     label=Profiler];
@@ -732,10 +774,21 @@ def test_03_py311():
                 "uqbar.io.Timer" [color=black,
                     fontcolor=white,
                     label=Timer];
+                "uqbar.io.TimerRegistry" [color=black,
+                    fontcolor=white,
+                    label="Timer\nRegistry"];
+                "uqbar.io.WriteReport" [color=black,
+                    fontcolor=white,
+                    label="Write\nReport"];
+            }
+            subgraph "cluster_uqbar.iterables" {
+                graph [label="uqbar.iterables"];
+                node [color=6];
+                "uqbar.iterables.SequenceView" [label="Sequence\nView"];
             }
             subgraph "cluster_uqbar.sphinx.inheritance" {
                 graph [label="uqbar.sphinx.inheritance"];
-                node [color=6];
+                node [color=7];
                 "uqbar.sphinx.inheritance.InheritanceDiagram" [label="Inheritance\nDiagram"];
                 "uqbar.sphinx.inheritance.inheritance_diagram" [label="inheritance\ndiagram"];
             }
@@ -759,14 +812,21 @@ def test_03_py311():
             "builtins.object" -> "uqbar.book.ConsoleOutput";
             "builtins.object" -> "uqbar.book.Extension";
             "builtins.object" -> "uqbar.book.MonkeyPatch";
+            "builtins.object" -> "uqbar.containers.dependency_graph.CompactDependencyGraph";
             "builtins.object" -> "uqbar.containers.dependency_graph.DependencyGraph";
             "builtins.object" -> "uqbar.containers.unique_tree.UniqueTreeNode";
+            "builtins.object" -> "uqbar.containers.unique_tree.UniqueTreeSnapshot";
             "builtins.object" -> "uqbar.graphs.core.Edge";
             "builtins.object" -> "uqbar.graphs.graphers.Grapher";
+            "builtins.object" -> "uqbar.io.CaptureBuffer";
             "builtins.object" -> "uqbar.io.DirectoryChange";
+            "builtins.object" -> "uqbar.io.MemoryProfiler";
             "builtins.object" -> "uqbar.io.Profiler";
             "builtins.object" -> "uqbar.io.RedirectedStreams";
             "builtins.object" -> "uqbar.io.Timer";
+            "builtins.object" -> "uqbar.io.TimerRegistry";
+            "builtins.object" -> "uqbar.io.WriteReport";
+            "builtins.object" -> "uqbar.iterables.SequenceView";
             "code.InteractiveConsole" -> "uqbar.book.Console";
             "collections.abc.MutableMapping" -> "uqbar.graphs.attrs.Attributes";
             "docutils.nodes.Element" -> "uqbar.book.uqbar_book_defaults_block";
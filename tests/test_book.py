@@ -1,14 +1,17 @@
+import asyncio
 import sys
 
 import pytest
 from docutils.parsers.rst import directives
 
 from uqbar.book import (
+    Console,
     ConsoleError,
     ConsoleInput,
     ConsoleOutput,
     UqbarBookDirective,
     collect_literal_blocks,
+    find_traceback,
     interpret_code_blocks,
     parse_rst,
     rebuild_document,
@@ -422,3 +425,49 @@ async def test_rebuild_document(source: str, expected: str) -> None:
     node_mapping = await interpret_code_blocks(blocks, extensions=extensions)
     rebuild_document(document, node_mapping)
     assert normalize(document.pformat()) == normalize(expected)
+
+
+@pytest.mark.asyncio
+async def test_Console_max_output_size() -> None:
+    console = Console(max_output_size=20)
+    results, errored = await console.interpret(
+        ["for i in range(100000):", "    print(i)", "", "print('done')"]
+    )
+    assert not errored
+    assert results == [
+        ConsoleInput(string=">>> for i in range(100000):\n...     print(i)\n... \n"),
+        ConsoleOutput(string="0\n1\n2\n3\n4\n5\n6\n7\n8\n9\n\n[output truncated]\n"),
+        ConsoleInput(string=">>> print('done')\n"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_Console_max_output_size_traceback() -> None:
+    console = Console(max_output_size=100)
+    results, errored = await console.interpret(
+        ["for i in range(1000):", "    print(i)", "", "1 / 0", "print('after')"]
+    )
+    assert errored
+    assert "[output truncated]" in results[1].string
+    assert find_traceback(results).endswith("ZeroDivisionError: division by zero\n")
+    assert results[-1] == ConsoleInput(string=">>> print('after')\n")
+
+
+@pytest.mark.asyncio
+async def test_Console_per_context() -> None:
+    async def interpret(name):
+        console = Console(per_context=True)
+        return await console.interpret(
+            [
+                "import asyncio",
+                "for i in range(3):",
+                f"    print('{name}', i)",
+                "    await asyncio.sleep(0)",
+                "",
+            ]
+        )
+
+    results = await asyncio.gather(interpret("a"), interpret("b"))
+    for name, (result, errored) in zip("ab", results):
+        assert not errored
+        assert result[-1] == ConsoleOutput(string=f"{name} 0\n{name} 1\n{name} 2\n")
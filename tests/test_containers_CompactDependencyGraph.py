@@ -0,0 +1,123 @@
+import pickle
+import random
+
+import pytest
+
+import uqbar.containers
+
+
+def build_graphs(seed, node_count=30, edge_count=80):
+    rng = random.Random(seed)
+    graph = uqbar.containers.DependencyGraph()
+    compact_graph = uqbar.containers.CompactDependencyGraph()
+    for _ in range(edge_count):
+        child, parent = rng.randrange(node_count), rng.randrange(node_count)
+        if child == parent:
+            parent = None
+        elif child < parent:
+            child, parent = parent, child
+        graph.add(child, parent=parent)
+        compact_graph.add(child, parent=parent)
+    return graph, compact_graph
+
+
+def assert_equivalent(graph, compact_graph):
+    assert len(compact_graph) == len(graph)
+    for node in graph._parents_to_children:
+        assert node in compact_graph
+        assert compact_graph[node] == graph[node]
+    assert list(compact_graph) == list(graph)
+    assert list(compact_graph.iter_levels()) == list(graph.iter_levels())
+
+
+def test_add():
+    for seed in range(20):
+        graph, compact_graph = build_graphs(seed)
+        assert_equivalent(graph, compact_graph)
+        graph.add("A", parent=0)
+        compact_graph.add("A", parent=0)
+        compact_graph.add("A", parent=0)
+        assert_equivalent(graph, compact_graph)
+
+
+def test_children():
+    graph = uqbar.containers.CompactDependencyGraph()
+    graph.add("A", parent="B")
+    graph.add("C", parent="B")
+    assert graph.children("B") == frozenset(["A", "C"])
+    assert graph.children("A") == frozenset()
+    with pytest.raises(ValueError):
+        graph.children("D")
+
+
+def test_freeze():
+    graph = uqbar.containers.CompactDependencyGraph()
+    graph.add("A", parent="B")
+    assert not graph.frozen
+    graph.freeze()
+    assert graph.frozen
+    with pytest.raises(TypeError):
+        graph.add("C")
+    assert "C" not in graph
+    assert list(graph) == ["A", "B"]
+
+
+def test_from_graph():
+    for seed in range(20):
+        graph, _ = build_graphs(seed)
+        compact_graph = uqbar.containers.CompactDependencyGraph.from_graph(graph)
+        assert_equivalent(graph, compact_graph)
+        assert compact_graph.to_graph() == graph
+        compact_graph.add("A", parent=0)
+        graph.add("A", parent=0)
+        assert_equivalent(graph, compact_graph)
+
+
+def test_is_acyclic():
+    graph = uqbar.containers.CompactDependencyGraph()
+    assert graph.is_acyclic()
+    graph.add("A", parent="B")
+    graph.add("B", parent="C")
+    assert graph.is_acyclic()
+    graph.add("C", parent="A")
+    assert not graph.is_acyclic()
+    with pytest.raises(ValueError):
+        list(graph)
+
+
+def test_parents():
+    graph = uqbar.containers.CompactDependencyGraph()
+    graph.add("A", parent="B")
+    graph.add("A", parent="C")
+    assert graph.parents("A") == frozenset(["B", "C"])
+    assert graph.parents("B") == frozenset()
+    with pytest.raises(ValueError):
+        graph.parents("D")
+
+
+def test_pickle():
+    graph, compact_graph = build_graphs(0)
+    for frozen in (False, True):
+        if frozen:
+            compact_graph.freeze()
+        unpickled_graph = pickle.loads(pickle.dumps(compact_graph))
+        assert unpickled_graph.frozen == frozen
+        assert_equivalent(graph, unpickled_graph)
+
+
+def test_read_write(tmp_path):
+    graph, compact_graph = build_graphs(0)
+    path = tmp_path / "graph.bin"
+    compact_graph.write(path)
+    for memory_map in (True, False):
+        read_graph = uqbar.containers.CompactDependencyGraph.read(
+            path, memory_map=memory_map
+        )
+        assert read_graph.frozen
+        assert_equivalent(graph, read_graph)
+        assert_equivalent(graph, pickle.loads(pickle.dumps(read_graph)))
+        read_graph.release()
+        assert len(read_graph) == (0 if memory_map else len(graph))
+    path.write_bytes(b"\x00" * 64)
+    with pytest.raises(ValueError):
+        uqbar.containers.CompactDependencyGraph.read(path)
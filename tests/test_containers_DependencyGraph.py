@@ -1,3 +1,7 @@
+import random
+import sys
+import threading
+
 import pytest
 
 import uqbar.containers
@@ -96,6 +100,41 @@ def test_add():
     assert "C" in graph
 
 
+def test_add_edges():
+    edges = [(i, i // 2 or None) for i in range(1, 20)] + [(3, 5), (5, 3), (7, 7)]
+    expected = uqbar.containers.DependencyGraph()
+    for child, parent in edges:
+        expected.add(child, parent=parent)
+    graph = uqbar.containers.DependencyGraph()
+    graph.add_edges(iter(edges))
+    assert graph == expected
+    assert list(graph._parents_to_children) == list(expected._parents_to_children)
+    for node in expected._parents_to_children:
+        assert graph[node] == expected[node]
+    graph.add_edges(edges)
+    assert graph == expected
+
+
+def test_ancestors():
+    for cached in (False, True):
+        graph = uqbar.containers.DependencyGraph(cached=cached)
+        graph.add("A", parent="B")
+        graph.add("B", parent="C")
+        graph.add("D", parent="C")
+        assert graph.ancestors("A") == frozenset(["B", "C"])
+        assert graph.ancestors("C") == frozenset()
+        graph.add("C", parent="E")
+        assert graph.ancestors("A") == frozenset(["B", "C", "E"])
+        graph.add("E", parent="A")
+        assert graph.ancestors("A") == frozenset(["A", "B", "C", "E"])
+        assert graph.ancestors("D") == frozenset(["A", "B", "C", "E"])
+        graph.remove("B")
+        assert graph.ancestors("A") == frozenset()
+        assert graph.ancestors("D") == frozenset(["A", "C", "E"])
+        with pytest.raises(ValueError):
+            graph.ancestors("B")
+
+
 def test_children():
     graph = uqbar.containers.DependencyGraph()
     graph.add("B", parent="A")
@@ -121,6 +160,122 @@ def test_copy():
     assert graph_one != graph_two
 
 
+def test_depth():
+    for cached in (False, True):
+        graph = uqbar.containers.DependencyGraph(cached=cached)
+        graph.add_edges((i, i + 1) for i in range(sys.getrecursionlimit() * 2))
+        assert graph.depth(0) == sys.getrecursionlimit() * 2
+        assert len(graph.ancestors(0)) == sys.getrecursionlimit() * 2
+        graph.add(0, parent="A")
+        assert graph.depth(0) == sys.getrecursionlimit() * 2
+        graph.remove(1)
+        assert graph.depth(0) == 1
+        graph.add("A", parent=0)
+        with pytest.raises(ValueError):
+            graph.depth(0)
+
+
+def test_descendants():
+    for cached in (False, True):
+        graph = uqbar.containers.DependencyGraph(cached=cached)
+        graph.add("A", parent="B")
+        graph.add("C", parent="B")
+        graph.add("D", parent="C")
+        assert graph.descendants("B") == frozenset(["A", "C", "D"])
+        assert graph.descendants("A") == frozenset()
+        graph.add("E", parent="D")
+        assert graph.descendants("B") == frozenset(["A", "C", "D", "E"])
+        graph.add_edges([("B", "E")])
+        assert graph.descendants("E") == frozenset(["A", "B", "C", "D", "E"])
+
+
+def test_execute():
+    graph = uqbar.containers.DependencyGraph()
+    for i in range(1, 20):
+        graph.add(i, parent=i // 3)
+    lock = threading.Lock()
+    finished = []
+
+    def function(node):
+        with lock:
+            assert all(child in finished for child in graph.children(node))
+            finished.append(node)
+        return node * 2
+
+    executions = graph.execute(function, max_workers=4)
+    assert sorted(finished) == sorted(executions) == list(range(20))
+    order = list(executions)
+    for node in order:
+        assert all(order.index(_) < order.index(node) for _ in graph.children(node))
+    for node, execution in executions.items():
+        assert execution.node == node
+        assert execution.status == "finished"
+        assert execution.result == node * 2
+        assert execution.elapsed_time >= 0
+    graph.add(0, parent=19)
+    with pytest.raises(ValueError):
+        graph.execute(function)
+
+
+def test_execute_failure():
+    graph = uqbar.containers.DependencyGraph()
+    graph.add("A", parent="B")
+    graph.add("B", parent="C")
+    graph.add("D", parent="E")
+
+    def function(node):
+        if node == "A":
+            raise RuntimeError(node)
+        return node
+
+    with pytest.raises(RuntimeError):
+        graph.execute(function, max_workers=1)
+    executions = graph.execute(function, max_workers=1, return_exceptions=True)
+    assert executions["A"].status == "failed"
+    assert isinstance(executions["A"].exception, RuntimeError)
+    for node in "BCE":
+        assert executions[node].status == "cancelled"
+        assert executions[node].elapsed_time is None
+    executions = graph.execute(
+        function, cancel_on_failure=False, return_exceptions=True
+    )
+    assert [executions[node].status for node in "ABCDE"] == [
+        "failed",
+        "cancelled",
+        "cancelled",
+        "finished",
+        "finished",
+    ]
+
+
+def test_execute_processes():
+    graph = uqbar.containers.DependencyGraph()
+    graph.add("a", parent="b")
+    graph.add("c", parent="b")
+    executions = graph.execute(str.upper, max_workers=2, use_processes=True)
+    assert list(executions)[-1] == "b"
+    assert {node: _.result for node, _ in executions.items()} == {
+        "a": "A",
+        "b": "B",
+        "c": "C",
+    }
+
+
+def test_find_cycle():
+    graph = uqbar.containers.DependencyGraph()
+    assert graph.find_cycle() is None
+    graph.add("B", parent="A")
+    graph.add("C", parent="B")
+    graph.add("D", parent="C")
+    assert graph.find_cycle() is None
+    graph.add("B", parent="D")
+    assert graph.find_cycle() == ["B", "C", "D"]
+    graph.remove("C")
+    assert graph.find_cycle() is None
+    graph.add("A", parent="A")
+    assert graph.find_cycle() == ["A"]
+
+
 def test_is_acyclic():
     graph = uqbar.containers.DependencyGraph()
     assert graph.is_acyclic()
@@ -136,6 +291,27 @@ def test_is_acyclic():
     assert graph.is_acyclic()
 
 
+def test_iter_levels():
+    graph = uqbar.containers.DependencyGraph()
+    assert list(graph.iter_levels()) == []
+    graph.add("A")
+    graph.add("B", parent="A")
+    graph.add("C", parent="A")
+    graph.add("D", parent="B")
+    graph.add("D", parent="C")
+    graph.add("E", parent="A")
+    assert list(graph.iter_levels()) == [
+        frozenset(["D", "E"]),
+        frozenset(["B", "C"]),
+        frozenset(["A"]),
+    ]
+    graph.add("A", parent="D")
+    with pytest.raises(ValueError):
+        list(graph.iter_levels())
+    with pytest.raises(ValueError):
+        list(graph)
+
+
 def test_parents():
     graph = uqbar.containers.DependencyGraph()
     graph.add("B", parent="A")
@@ -150,6 +326,95 @@ def test_parents():
     assert graph.parents("E") == frozenset(["A", "D"])
 
 
+def test_strict():
+    graph = uqbar.containers.DependencyGraph(strict=True)
+    assert graph.strict
+    assert not uqbar.containers.DependencyGraph().strict
+    graph.add("A", parent="B")
+    graph.add("B", parent="C")
+    graph.add("D", parent="A")
+    graph.add("D", parent="C")
+    for child, parent in [("C", "A"), ("C", "D"), ("B", "B"), ("E", "E")]:
+        with pytest.raises(ValueError):
+            graph.add(child, parent=parent)
+    assert "E" not in graph
+    assert graph["C"] == (frozenset(), frozenset(["B", "D"]))
+    with pytest.raises(ValueError):
+        graph.add_edges([("X", "Y"), ("B", "D")])
+    assert "X" in graph and "D" not in graph.parents("B")
+    graph.remove("A")
+    graph.add("D", parent="B")
+    assert graph.is_acyclic() and graph.find_cycle() is None
+    assert list(graph) == ["D", "B", "C", "X", "Y"]
+    copied = graph.copy()
+    assert copied.strict and copied == graph
+    with pytest.raises(ValueError):
+        copied.add("C", parent="B")
+    other = uqbar.containers.DependencyGraph()
+    other.add("B", parent="X")
+    other.add("X", parent="B")
+    with pytest.raises(ValueError):
+        graph.update(other)
+
+
+def test_strict_random():
+    rng = random.Random(0)
+    for _ in range(50):
+        strict_graph = uqbar.containers.DependencyGraph(strict=True)
+        graph = uqbar.containers.DependencyGraph()
+        for _ in range(100):
+            child, parent = rng.randrange(20), rng.randrange(20)
+            copied = graph.copy()
+            copied.add(child, parent=parent)
+            if copied.is_acyclic():
+                graph = copied
+                strict_graph.add(child, parent=parent)
+            else:
+                with pytest.raises(ValueError):
+                    strict_graph.add(child, parent=parent)
+            assert strict_graph == graph
+
+
+def test_transitive_reduction():
+    graph = uqbar.containers.DependencyGraph(cached=True)
+    graph.add("A", parent="B")
+    graph.add("A", parent="C")
+    graph.add("A", parent="D")
+    graph.add("B", parent="C")
+    graph.add("C", parent="D")
+    graph.add("E", parent="D")
+    reduced = graph.transitive_reduction()
+    assert reduced.cached
+    assert reduced["A"] == (frozenset(["B"]), frozenset())
+    assert reduced["D"] == (frozenset(), frozenset(["C", "E"]))
+    assert list(reduced) == list(graph)
+    assert graph["A"] == (frozenset(["B", "C", "D"]), frozenset())
+    for node in "ABCDE":
+        assert reduced.ancestors(node) == graph.ancestors(node)
+    graph.add("D", parent="A")
+    with pytest.raises(ValueError):
+        graph.transitive_reduction()
+
+
+def test_update():
+    graph = uqbar.containers.DependencyGraph()
+    graph.add("A", parent="B")
+    graph.add("C")
+    other = uqbar.containers.DependencyGraph()
+    other.add("B", parent="D")
+    other.add("A", parent="D")
+    other.add("E")
+    graph.update(other)
+    assert list(graph._parents_to_children) == ["B", "A", "C", "D", "E"]
+    assert graph["A"] == (frozenset(["B", "D"]), frozenset())
+    assert graph["D"] == (frozenset(), frozenset(["A", "B"]))
+    assert list(graph) == ["A", "B", "C", "D", "E"]
+    other.add("F", parent="A")
+    assert "F" not in graph
+    graph.update(graph.copy())
+    assert len(graph) == 5
+
+
 def test_remove():
     graph = uqbar.containers.DependencyGraph()
     with pytest.raises(ValueError):
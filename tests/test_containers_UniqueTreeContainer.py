@@ -1,3 +1,8 @@
+import copy
+import pickle
+import random
+import sys
+import threading
 import unittest
 
 import uqbar.containers
@@ -288,3 +293,401 @@ class TestCase(unittest.TestCase):
         assert node_a[:] == [node_b, node_d]
         assert node_c not in node_a
         assert node_c.parent is None
+
+    def test_index(self):
+        """
+        Indices track insertions, removals and copies.
+        """
+        node_a = uqbar.containers.UniqueTreeList()
+        nodes = [uqbar.containers.UniqueTreeNode() for _ in range(5)]
+        node_a.extend(nodes[:3])
+        assert [node_a.index(node) for node in nodes[:3]] == [0, 1, 2]
+        node_a.insert(1, nodes[3])
+        assert node_a.index(nodes[3]) == 1
+        assert node_a.index(nodes[2]) == 3
+        node_a.remove(nodes[0])
+        assert [node_a.index(node) for node in node_a] == [0, 1, 2]
+        assert node_a.index(nodes[1]) == 1
+        with self.assertRaises(ValueError):
+            node_a.index(nodes[4])
+        assert nodes[4] not in node_a
+        node_b = copy.deepcopy(node_a)
+        assert [node_b.index(node) for node in node_b] == [0, 1, 2]
+        assert node_b[0] not in node_a
+
+    def test_extend_03(self):
+        """
+        Extending with nodes from several parents keeps names consistent.
+        """
+        node_a = uqbar.containers.UniqueTreeList(name="a")
+        node_b = uqbar.containers.UniqueTreeList(name="b")
+        node_c = uqbar.containers.UniqueTreeList(name="c")
+        node_d = uqbar.containers.UniqueTreeNode(name="d")
+        node_e = uqbar.containers.UniqueTreeNode(name="e")
+        node_f = uqbar.containers.UniqueTreeNode(name="f")
+        node_a.append(node_b)
+        node_b.extend([node_d, node_e])
+        node_c.append(node_f)
+        node_a.extend([node_d, node_f, node_b])
+        assert node_a[:] == [node_d, node_f, node_b]
+        assert node_b[:] == [node_e]
+        assert node_c[:] == []
+        assert node_a["d"] is node_d
+        assert node_a["e"] is node_e
+        assert node_a["f"] is node_f
+        assert "d" not in node_b
+        assert "f" not in node_c
+        node_c.extend([node_b, node_e])
+        assert node_c[:] == [node_b, node_e]
+        assert "b" not in node_a
+        assert "e" not in node_a
+        assert node_c["e"] is node_e
+
+    def test_batch(self):
+        """
+        State-flag invalidation is deferred until the outermost batch exits.
+        """
+
+        class FlaggedList(uqbar.containers.UniqueTreeList):
+            _state_flag_names = ("_is_valid",)
+
+            def __init__(self, children=None, name=None):
+                super().__init__(children=children, name=name)
+                self._is_valid = True
+
+        node_a = FlaggedList()
+        node_b = FlaggedList()
+        node_c = FlaggedList()
+        node_a.append(node_b)
+        node_a._is_valid = node_b._is_valid = True
+        with node_a.batch():
+            with node_a.batch():
+                node_b.append(node_c)
+            assert node_a._is_valid and node_b._is_valid
+        assert not node_a._is_valid
+        assert not node_b._is_valid
+        node_a._is_valid = node_b._is_valid = True
+        with node_b.batch():
+            pass
+        assert node_a._is_valid and node_b._is_valid
+
+    def test_depth_first_01(self):
+        """
+        Pre-order, post-order, pruning and depth reporting.
+        """
+        node_a = uqbar.containers.UniqueTreeList(name="a")
+        node_b = uqbar.containers.UniqueTreeList(name="b")
+        node_c = uqbar.containers.UniqueTreeDict(name="c")
+        node_d = uqbar.containers.UniqueTreeNode(name="d")
+        node_e = uqbar.containers.UniqueTreeNode(name="e")
+        node_f = uqbar.containers.UniqueTreeNode(name="f")
+        node_a.extend([node_b, node_f])
+        node_b.append(node_c)
+        node_c.update({"x": node_d, "y": node_e})
+        assert list(node_a.depth_first()) == [node_b, node_c, node_d, node_e, node_f]
+        assert list(node_a.depth_first(top_down=False)) == [
+            node_d,
+            node_e,
+            node_c,
+            node_b,
+            node_f,
+        ]
+        assert list(node_a.depth_first(prune=lambda x: x is node_c)) == [
+            node_b,
+            node_c,
+            node_f,
+        ]
+        assert list(
+            node_a.depth_first(
+                prototype=uqbar.containers.UniqueTreeNode,
+                top_down=False,
+                with_depth=True,
+            )
+        ) == [(node_d, 3), (node_e, 3), (node_c, 2), (node_b, 1), (node_f, 1)]
+        assert list(node_c.depth_first()) == [node_d, node_e]
+
+    def test_depth_first_02(self):
+        """
+        Traversal does not recurse.
+        """
+        root = parent = uqbar.containers.UniqueTreeList()
+        for _ in range(sys.getrecursionlimit() * 2):
+            child = uqbar.containers.UniqueTreeList()
+            parent.append(child)
+            parent = child
+        assert sum(1 for _ in root.depth_first()) == sys.getrecursionlimit() * 2
+        assert list(root.depth_first(top_down=False))[-1] is root[0]
+
+    def test_find_all(self):
+        """
+        Named lookups stay in graph order as the tree is re-ordered.
+        """
+        node_a = uqbar.containers.UniqueTreeList()
+        node_b = uqbar.containers.UniqueTreeList()
+        node_c = uqbar.containers.UniqueTreeNode(name="foo")
+        node_d = uqbar.containers.UniqueTreeNode(name="foo")
+        node_e = uqbar.containers.UniqueTreeNode(name="foo")
+        node_a.extend([node_b, node_c])
+        node_b.append(node_d)
+        assert list(node_a.find_all("foo")) == [node_d, node_c]
+        assert node_a.find_first("foo") is node_d
+        assert node_a["foo"] == [node_d, node_c]
+        node_a.append(node_b)
+        assert list(node_a.find_all("foo")) == [node_c, node_d]
+        assert node_a.find_first("foo") is node_c
+        node_b.insert(0, node_e)
+        assert list(node_a.find_all("foo")) == [node_c, node_e, node_d]
+        node_e.name = "bar"
+        assert list(node_a.find_all("foo")) == [node_c, node_d]
+        assert list(node_a.find_all("bar")) == [node_e]
+        node_a.remove(node_c)
+        assert list(node_a.find_all("foo")) == [node_d]
+        assert node_a["foo"] is node_d
+        assert list(node_a.find_all("quux")) == []
+        assert node_a.find_first("quux") is None
+
+    def test_name_registry(self):
+        """
+        Names are registered only on the root, and non-root containers still
+        answer named lookups for their own subtree.
+        """
+        node_a = uqbar.containers.UniqueTreeList(name="a")
+        node_b = uqbar.containers.UniqueTreeList(name="b")
+        node_c = uqbar.containers.UniqueTreeNode(name="foo")
+        node_d = uqbar.containers.UniqueTreeNode(name="foo")
+        node_e = uqbar.containers.UniqueTreeSet(name="e")
+        node_b.append(node_d)
+        assert node_b["foo"] is node_d
+        node_a.extend([node_b, node_c])
+        assert node_a._named_children == {"b": {node_b}, "foo": {node_c, node_d}}
+        assert node_b._named_children == {}
+        assert node_a["foo"] == [node_d, node_c]
+        assert node_b["foo"] is node_d
+        assert "foo" in node_b
+        assert "b" not in node_b
+        assert list(node_b.find_all("foo")) == [node_d]
+        assert node_b.find_first("foo") is node_d
+        node_d.name = "bar"
+        assert "foo" not in node_b
+        assert node_a.find_first("bar") is node_d
+        node_a.append(node_e)
+        node_e.add(node_b)
+        assert "bar" in node_e
+        assert node_a._named_children.keys() == {"b", "bar", "e", "foo"}
+        node_e.remove(node_b)
+        assert "bar" not in node_e
+        assert node_a._named_children.keys() == {"e", "foo"}
+        assert node_b._named_children == {"bar": {node_d}}
+        assert node_b["bar"] is node_d
+
+    def test_concurrency_set_and_dict(self):
+        """
+        Concurrent set and dict containers replace their children on
+        mutation, so iteration started before a mutation is unaffected.
+        """
+        node_set = uqbar.containers.UniqueTreeSet(
+            [uqbar.containers.UniqueTreeNode(name=str(i)) for i in range(3)]
+        )
+        node_dict = uqbar.containers.UniqueTreeDict(
+            {i: uqbar.containers.UniqueTreeNode(name=str(i)) for i in range(3)}
+        )
+        root = uqbar.containers.UniqueTreeList([node_set, node_dict])
+        assert not any(node._concurrent for node in [root, *root.depth_first()])
+        root.enable_concurrency()
+        assert all(node._concurrent for node in [root, *root.depth_first()])
+        for mutate in [
+            lambda: node_set.add(uqbar.containers.UniqueTreeNode()),
+            lambda: node_set.pop(),
+            lambda: node_set.remove(next(iter(node_set))),
+            lambda: node_dict.update({9: uqbar.containers.UniqueTreeNode()}),
+            lambda: node_dict.pop(0),
+            lambda: node_dict.__delitem__(next(iter(node_dict))),
+        ]:
+            iterators = [iter(node_set), iter(node_dict), root.depth_first()]
+            for iterator in iterators:
+                next(iterator)
+            mutate()
+            for iterator in iterators:
+                list(iterator)
+        assert node_dict.pop("missing", None) is None
+        # Nodes attached to a concurrent tree join it.
+        leaf = uqbar.containers.UniqueTreeNode()
+        assert not leaf._concurrent
+        node_set.add(leaf)
+        assert leaf._concurrent
+
+    def test_concurrency(self):
+        """
+        Many threads mutate one concurrent tree while others read it lock-free.
+        """
+        root = uqbar.containers.UniqueTreeList(name="root")
+        branches = [uqbar.containers.UniqueTreeList(name=f"b{i}") for i in range(4)]
+        root.extend(branches)
+        root.enable_concurrency()
+        assert root.is_concurrent
+        assert branches[0].is_concurrent
+        stop = threading.Event()
+        errors = []
+
+        def write(seed):
+            rng = random.Random(seed)
+            try:
+                for i in range(200):
+                    branch = rng.choice(branches)
+                    action = rng.random()
+                    if action < 0.5:
+                        fragment = uqbar.containers.UniqueTreeList(
+                            [uqbar.containers.UniqueTreeNode(name="leaf")],
+                            name=f"fragment-{seed}-{i}",
+                        )
+                        branch.append(fragment)
+                    elif action < 0.8:
+                        with root.locked():
+                            if not len(branch):
+                                continue
+                            node = branch[rng.randrange(len(branch))]
+                        rng.choice(branches).append(node)
+                    elif action < 0.9:
+                        with root.locked():
+                            if len(branch):
+                                branch.pop(0)
+                    else:
+                        with root.locked():
+                            if len(branch):
+                                branch[-1].name = f"renamed-{seed}-{i}"
+            except Exception as exception:
+                errors.append(exception)
+
+        def read():
+            try:
+                while not stop.is_set():
+                    for node in root.depth_first():
+                        if isinstance(node, uqbar.containers.UniqueTreeList):
+                            children = [child for child in node]
+                            assert len(set(map(id, children))) == len(children)
+            except Exception as exception:
+                errors.append(exception)
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            readers = [threading.Thread(target=read) for _ in range(2)]
+            writers = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+            for thread in readers + writers:
+                thread.start()
+            for thread in writers:
+                thread.join()
+            stop.set()
+            for thread in readers:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        assert not errors, errors
+        expected_names = {}
+        for node in root.depth_first():
+            assert node.parentage[-1] is root
+            if node.name is not None:
+                expected_names.setdefault(node.name, set()).add(node)
+            if isinstance(node, uqbar.containers.UniqueTreeList):
+                for i, child in enumerate(node):
+                    assert child.parent is node
+                    assert node.index(child) == i
+        assert root._named_children == expected_names
+        for branch in branches:
+            leaves = [node for node in branch.depth_first() if node.name == "leaf"]
+            assert list(branch.find_all("leaf")) == leaves
+
+    def test_snapshot(self):
+        """
+        Snapshots are unaffected by later mutation and share unchanged
+        subtrees.
+        """
+        node_a = uqbar.containers.UniqueTreeList(name="a")
+        node_b = uqbar.containers.UniqueTreeList(name="b")
+        node_c = uqbar.containers.UniqueTreeList(name="c")
+        node_d = uqbar.containers.UniqueTreeNode(name="d")
+        node_e = uqbar.containers.UniqueTreeNode(name="e")
+        node_a.extend([node_b, node_c])
+        node_b.append(node_d)
+        node_c.append(node_e)
+        snapshot_1 = node_a.snapshot()
+        assert node_a.snapshot() is snapshot_1
+        assert [x.name for x in snapshot_1.depth_first()] == ["b", "d", "c", "e"]
+        node_e.name = "f"
+        snapshot_2 = node_a.snapshot()
+        assert snapshot_2 is not snapshot_1
+        assert snapshot_2[0] is snapshot_1[0]
+        assert snapshot_2[1] is not snapshot_1[1]
+        assert [x.name for x in snapshot_1.depth_first()] == ["b", "d", "c", "e"]
+        assert [x.name for x in snapshot_2.depth_first()] == ["b", "d", "c", "f"]
+        node_c.append(node_d)
+        snapshot_3 = node_a.snapshot()
+        assert [x.name for x in snapshot_2.depth_first()] == ["b", "d", "c", "f"]
+        assert [x.name for x in snapshot_3.depth_first()] == ["b", "c", "f", "d"]
+        assert snapshot_3[1][1] is snapshot_2[0][0]
+        assert [x.node for x in snapshot_3.find_all("d")] == [node_d]
+        assert node_c.snapshot() is snapshot_3[1]
+
+    def test_snapshot_dict(self):
+        """
+        Snapshots of dict nodes record their keys.
+        """
+        node_a = uqbar.containers.UniqueTreeDict(name="a")
+        node_b = uqbar.containers.UniqueTreeNode(name="b")
+        node_c = uqbar.containers.UniqueTreeNode(name="c")
+        node_a.update({"x": node_b, "y": node_c})
+        snapshot_1 = node_a.snapshot()
+        assert snapshot_1.keys == ("x", "y")
+        assert [(key, x.node) for key, x in snapshot_1.items()] == [
+            ("x", node_b),
+            ("y", node_c),
+        ]
+        # Re-keying a child invalidates the snapshot.
+        node_a["z"] = node_b
+        snapshot_2 = node_a.snapshot()
+        assert snapshot_1.keys == ("x", "y")
+        assert snapshot_2.keys == ("y", "z")
+        assert [x.node for x in snapshot_2] == [node_c, node_b]
+        assert snapshot_2[0].keys is None
+        with self.assertRaises(TypeError):
+            snapshot_2[0].items()
+        node_list = uqbar.containers.UniqueTreeList([node_a])
+        assert node_list.snapshot().keys is None
+        assert node_list.snapshot()[0].keys == ("y", "z")
+
+    def test_snapshot_immutable(self):
+        node_a = uqbar.containers.UniqueTreeDict(name="a")
+        node_a["x"] = uqbar.containers.UniqueTreeNode(name="b")
+        snapshot = node_a.snapshot()
+        assert isinstance(snapshot.children, tuple)
+        assert isinstance(snapshot.keys, tuple)
+        with self.assertRaises(AttributeError):
+            snapshot._children = ()
+        with self.assertRaises(AttributeError):
+            del snapshot._keys
+        with self.assertRaises(AttributeError):
+            snapshot.name = "c"
+        assert copy.copy(snapshot) is snapshot
+        assert copy.deepcopy(snapshot) is snapshot
+        node_list = uqbar.containers.UniqueTreeList(
+            [uqbar.containers.UniqueTreeNode(name="b")], name="a"
+        )
+        copied = pickle.loads(pickle.dumps(node_list.snapshot()))
+        assert copied.name == "a"
+        assert [x.name for x in copied] == ["b"]
+
+    def test_pickle(self):
+        """
+        Slotted trees survive pickling and copying.
+        """
+        node_a = uqbar.containers.UniqueTreeList(name="a")
+        node_b = uqbar.containers.UniqueTreeList(name="b")
+        node_c = uqbar.containers.UniqueTreeNode(name="c")
+        node_a.append(node_b)
+        node_b.append(node_c)
+        assert node_a.index(node_b) == 0
+        for copied in (pickle.loads(pickle.dumps(node_a)), copy.deepcopy(node_a)):
+            assert copied.name == "a"
+            assert copied.index(copied[0]) == 0
+            assert copied["c"].parentage == (copied["c"], copied["b"], copied)
+            assert copied["c"] is not node_c
@@ -1,3 +1,5 @@
+import copy
+import pickle
 import unittest
 
 import uqbar.containers
@@ -53,3 +55,88 @@ class TestCase(unittest.TestCase):
             node_a["bar"]
         with self.assertRaises(KeyError):
             node_b["bar"]
+
+    def test_graph_order_01(self):
+        """
+        Cached graph-order tracks insertions and removals of siblings.
+        """
+        node_a = uqbar.containers.UniqueTreeList()
+        node_b = uqbar.containers.UniqueTreeList()
+        node_c = uqbar.containers.UniqueTreeNode()
+        node_d = uqbar.containers.UniqueTreeNode()
+        node_e = uqbar.containers.UniqueTreeNode()
+        node_a.append(node_b)
+        node_b.extend([node_c, node_d])
+        assert node_c.graph_order == (0, 0)
+        assert node_d.graph_order == (0, 1)
+        node_a.insert(0, node_e)
+        assert node_e.graph_order == (0,)
+        assert node_b.graph_order == (1,)
+        assert node_c.graph_order == (1, 0)
+        assert node_d.graph_order == (1, 1)
+        node_b.remove(node_c)
+        assert node_c.graph_order == ()
+        assert node_d.graph_order == (1, 0)
+        node_a.remove(node_e)
+        assert node_d.graph_order == (0, 0)
+
+    def test_graph_order_02(self):
+        """
+        Cached graph-order survives repeated partial invalidation.
+        """
+        nodes = [uqbar.containers.UniqueTreeNode() for _ in range(4)]
+        container = uqbar.containers.UniqueTreeList(nodes[:2])
+        assert [_.graph_order for _ in nodes[:2]] == [(0,), (1,)]
+        container.insert(1, nodes[2])
+        assert nodes[0].graph_order == (0,)
+        container.insert(0, nodes[3])
+        assert [_.graph_order for _ in container] == [(0,), (1,), (2,), (3,)]
+        assert list(container) == [nodes[3], nodes[0], nodes[2], nodes[1]]
+
+    def test_parentage_01(self):
+        """
+        Cached parentage, depth and root track reparenting.
+        """
+        node_a = uqbar.containers.UniqueTreeList()
+        node_b = uqbar.containers.UniqueTreeList()
+        node_c = uqbar.containers.UniqueTreeList()
+        node_d = uqbar.containers.UniqueTreeNode()
+        node_a.append(node_b)
+        node_b.append(node_d)
+        assert node_d.parentage == (node_d, node_b, node_a)
+        assert node_d.depth == 2
+        assert node_d.root is node_a
+        node_c.append(node_b)
+        assert node_d.parentage == (node_d, node_b, node_c)
+        assert node_d.root is node_c
+        node_a.append(node_c)
+        assert node_d.parentage == (node_d, node_b, node_c, node_a)
+        assert node_d.depth == 3
+        assert node_d.root is node_a
+        node_b.remove(node_d)
+        assert node_d.parentage == (node_d,)
+        assert node_d.depth == 0
+        assert node_d.root is None
+
+    def test_copy(self):
+        """
+        Copies don't inherit the original's cached parentage.
+        """
+        node = uqbar.containers.UniqueTreeNode(name="foo")
+        assert node.parentage == (node,)
+        copied = copy.copy(node)
+        assert copied.parentage == (copied,)
+        assert node.parentage == (node,)
+
+    def test_ad_hoc_attributes(self):
+        """
+        Slotted nodes still accept ad-hoc attributes, which survive pickling.
+        """
+        node = uqbar.containers.UniqueTreeNode(name="foo")
+        node.color = "red"
+        copied = pickle.loads(pickle.dumps(node))
+        assert copied.color == "red"
+        assert copied.name == "foo"
+        container = uqbar.containers.UniqueTreeList([node])
+        container.color = "blue"
+        assert copy.deepcopy(container).color == "blue"
@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from uqbar.io import CaptureBuffer
+
+
+def test_CaptureBuffer_coalesces():
+    buffer_ = CaptureBuffer(chunk_size=100)
+    for i in range(1000):
+        assert buffer_.write(f"{i}\n") == len(f"{i}\n")
+    expected = "".join(f"{i}\n" for i in range(1000))
+    assert len(buffer_._chunks) < 50
+    assert buffer_.getvalue() == expected
+    assert buffer_.getvalue() == expected
+    assert buffer_.size == len(expected)
+    assert not buffer_.truncated
+
+
+def test_CaptureBuffer_truncates():
+    buffer_ = CaptureBuffer(max_size=10, truncation_marker="<cut>")
+    buffer_.write("12345")
+    assert buffer_.write("67890abc") == 8
+    buffer_.write("def")
+    assert buffer_.getvalue() == "1234567890<cut>"
+    assert buffer_.size == 10
+    assert buffer_.truncated
+
+
+def test_CaptureBuffer_truncates_multibyte():
+    buffer_ = CaptureBuffer(max_size=5, truncation_marker="")
+    buffer_.write("aé€")  # 1 + 2 + 3 bytes
+    assert buffer_.getvalue() == "aé"
+    assert buffer_.size == 3
+
+
+def test_CaptureBuffer_drain_and_clear():
+    buffer_ = CaptureBuffer(max_size=6, truncation_marker="!")
+    buffer_.write("abcd")
+    assert buffer_.drain() == "abcd"
+    assert buffer_.getvalue() == ""
+    # Draining doesn't reset the limit.
+    buffer_.write("efgh")
+    assert buffer_.drain() == "ef!"
+    buffer_.clear()
+    buffer_.write("ijkl")
+    assert buffer_.getvalue() == "ijkl"
+    assert not buffer_.truncated
+
+
+def test_CaptureBuffer_threads():
+    buffer_ = CaptureBuffer(max_size=50_000)
+
+    def write():
+        for _ in range(10_000):
+            buffer_.write("x")
+
+    threads = [threading.Thread(target=write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert buffer_.size == 50_000
+    assert buffer_.getvalue().count("x") == 50_000
+
+
+def test_CaptureBuffer_invalid_max_size():
+    with pytest.raises(ValueError):
+        CaptureBuffer(max_size=-1)
@@ -0,0 +1,62 @@
+import tracemalloc
+
+import pytest
+
+from uqbar.io import MemoryProfiler
+
+
+def allocate(size):
+    return bytearray(size)
+
+
+def test_MemoryProfiler():
+    messages = []
+    with MemoryProfiler(name="block", limit=3, logger_func=messages.append) as profiler:
+        kept = allocate(5_000_000)
+        freed = allocate(10_000_000)
+        del freed
+    assert len(kept) == 5_000_000
+    assert 5_000_000 <= profiler.net < 5_100_000
+    assert 15_000_000 <= profiler.peak < 15_100_000
+    assert len(profiler.sites) <= 3
+    assert profiler.sites[0]["site"].startswith(__file__)
+    assert profiler.sites[0]["size"] >= 5_000_000
+    assert len(messages) == 1
+    assert messages[0].startswith("block: net +4.8 MiB, peak 14.3 MiB")
+    assert not tracemalloc.is_tracing()
+
+
+def test_MemoryProfiler_nested():
+    with MemoryProfiler(name="outer", verbose=False) as outer:
+        kept = allocate(2_000_000)
+        with MemoryProfiler(name="inner", verbose=False) as inner:
+            freed = allocate(8_000_000)
+            del freed
+        with MemoryProfiler(name="sibling", verbose=False):
+            pass
+    assert len(kept) == 2_000_000
+    assert inner.net < 100_000
+    assert 8_000_000 <= inner.peak < 8_100_000
+    # The inner block's peak still counts towards the outer block's.
+    assert 10_000_000 <= outer.peak < 10_100_000
+    assert 2_000_000 <= outer.net < 2_100_000
+    children = outer.as_dict()["children"]
+    assert [child["name"] for child in children] == ["inner", "sibling"]
+    assert children[0]["peak"] == inner.peak
+
+
+def test_MemoryProfiler_already_tracing():
+    tracemalloc.start()
+    try:
+        with MemoryProfiler(group_by="filename", verbose=False) as profiler:
+            kept = allocate(1_000_000)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    assert len(kept) == 1_000_000
+    assert profiler.sites[0]["site"] == __file__
+
+
+def test_MemoryProfiler_invalid_group_by():
+    with pytest.raises(ValueError):
+        MemoryProfiler(group_by="function")
@@ -0,0 +1,103 @@
+import pstats
+import sys
+import threading
+
+import pytest
+
+from uqbar.io import Profiler
+
+
+def fibonacci(n):
+    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+
+def work():
+    for _ in range(5):
+        fibonacci(20)
+
+
+def test_Profiler(tmp_path):
+    messages = []
+    with Profiler(
+        output_directory=tmp_path,
+        sort_keys=["tottime"],
+        limit=2,
+        logger_func=messages.append,
+    ) as profiler:
+        work()
+    assert profiler.output_path.parent == tmp_path
+    assert profiler.output_path.suffix == ".prof"
+    assert "fibonacci" in str(pstats.Stats(str(profiler.output_path)).stats)
+    functions = profiler.as_dict()["functions"]
+    assert len(functions) == 2
+    assert functions[0]["function"].endswith("(fibonacci)")
+    assert functions[0]["calls"] == 5 * 21891
+    assert len(messages) == 1 and "fibonacci" in messages[0]
+
+
+def test_Profiler_unique_paths(tmp_path):
+    output_paths = []
+    for _ in range(3):
+        with Profiler(output_directory=tmp_path, verbose=False) as profiler:
+            pass
+        output_paths.append(profiler.output_path)
+    assert len(set(output_paths)) == 3
+    assert all(path.exists() for path in output_paths)
+
+
+def test_Profiler_invalid():
+    with pytest.raises(ValueError):
+        Profiler(mode="statistical")
+    with pytest.raises(ValueError):
+        Profiler(sort_keys=["nonsense"])
+    with pytest.raises(ValueError):
+        Profiler(mode="sampling", sort_keys=["ncalls"])
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="sampling requires signal.setitimer()"
+)
+def test_Profiler_sampling(tmp_path):
+    with Profiler(
+        mode="sampling", output_directory=tmp_path, verbose=False
+    ) as profiler:
+        while sum(profiler.samples.values()) < 50:
+            work()
+    assert profiler.output_path.suffix == ".collapsed"
+    lines = profiler.output_path.read_text().splitlines()
+    total = 0
+    for line in lines:
+        stack, _, count = line.rpartition(" ")
+        frames = stack.split(";")
+        assert frames[0].endswith("(test_Profiler_sampling)")
+        total += int(count)
+    assert total == sum(profiler.samples.values())
+    assert any("(fibonacci)" in line for line in lines)
+    functions = {_["function"]: _ for _ in profiler.as_dict()["functions"]}
+    function = functions[f"{__file__}:{work.__code__.co_firstlineno}(work)"]
+    assert function["calls"] is None
+    assert 0 < function["cumulative"] <= total * 0.001 + 1e-9
+    assert "sampled every 0.001s" in profiler.report()
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="sampling requires signal.setitimer()"
+)
+def test_Profiler_sampling_restrictions(tmp_path):
+    with Profiler(mode="sampling", output_directory=tmp_path, verbose=False):
+        with pytest.raises(RuntimeError):
+            with Profiler(mode="sampling", output_directory=tmp_path):
+                pass
+    errors = []
+
+    def profile():
+        try:
+            with Profiler(mode="sampling", output_directory=tmp_path):
+                pass
+        except RuntimeError as exception:
+            errors.append(exception)
+
+    thread = threading.Thread(target=profile)
+    thread.start()
+    thread.join()
+    assert len(errors) == 1
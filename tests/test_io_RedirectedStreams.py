@@ -0,0 +1,73 @@
+import asyncio
+import io
+import sys
+import threading
+
+from uqbar.io import CaptureBuffer, RedirectedStreams
+
+
+def test_RedirectedStreams():
+    stdout, stderr = io.StringIO(), io.StringIO()
+    original_stdout, original_stderr = sys.stdout, sys.stderr
+    with RedirectedStreams(stdout=stdout, stderr=stderr):
+        assert sys.stdout is stdout
+        print("out")
+        print("err", file=sys.stderr)
+    assert (sys.stdout, sys.stderr) == (original_stdout, original_stderr)
+    assert stdout.getvalue() == "out\n"
+    assert stderr.getvalue() == "err\n"
+
+
+def test_RedirectedStreams_per_context():
+    original_stdout, original_stderr = sys.stdout, sys.stderr
+
+    async def capture(name, count):
+        buffer_ = CaptureBuffer()
+        with RedirectedStreams(stdout=buffer_, stderr=buffer_, per_context=True):
+            for i in range(count):
+                print(f"{name} {i}")
+                print(f"{name} error", file=sys.stderr)
+                await asyncio.sleep(0)
+        return buffer_.getvalue()
+
+    async def main():
+        return await asyncio.gather(*(capture(name, 5) for name in "abc"))
+
+    results = asyncio.run(main())
+    assert results == [
+        "".join(f"{name} {i}\n{name} error\n" for i in range(5)) for name in "abc"
+    ]
+    assert (sys.stdout, sys.stderr) == (original_stdout, original_stderr)
+
+
+def test_RedirectedStreams_per_context_nested():
+    original_stdout = sys.stdout
+    outer, inner = CaptureBuffer(), CaptureBuffer()
+    with RedirectedStreams(stdout=outer, per_context=True):
+        print("outer 1")
+        with RedirectedStreams(stdout=inner, per_context=True):
+            print("inner")
+        # Defaulting to sys.stdout redirects to the current redirection.
+        with RedirectedStreams(per_context=True) as redirected:
+            assert redirected.stdout is outer
+            print("outer 2")
+        print("outer 3")
+    assert sys.stdout is original_stdout
+    assert outer.getvalue() == "outer 1\nouter 2\nouter 3\n"
+    assert inner.getvalue() == "inner\n"
+
+
+def test_RedirectedStreams_per_context_threads():
+    captured, uncaptured = CaptureBuffer(), io.StringIO()
+
+    def write():
+        print("from thread")
+
+    with RedirectedStreams(stdout=uncaptured):
+        with RedirectedStreams(stdout=captured, per_context=True):
+            print("from main")
+            thread = threading.Thread(target=write)
+            thread.start()
+            thread.join()
+    assert captured.getvalue() == "from main\n"
+    assert uncaptured.getvalue() == "from thread\n"
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from uqbar.io import Timer, TimerRegistry
+
+
+def test_Timer():
+    timer = Timer(verbose=False)
+    assert timer.elapsed_time is None
+    with timer:
+        time.sleep(0.01)
+        assert timer.stop_time is None
+        assert timer.elapsed_time >= 0.01
+    elapsed_time = timer.elapsed_time
+    assert elapsed_time >= 0.01
+    assert timer.elapsed_time == elapsed_time
+    assert timer.stop_time - timer.start_time == pytest.approx(elapsed_time)
+
+
+def test_Timer_nested():
+    registry = TimerRegistry()
+    with Timer(name="a", registry=registry):
+        with Timer(name="b", registry=registry):
+            # Unnamed timers are transparent.
+            with Timer(verbose=False):
+                with Timer(name="c", registry=registry):
+                    pass
+        with Timer(name="b", registry=registry):
+            pass
+    with Timer(name="b", registry=registry):
+        pass
+    statistics = registry.as_dict()
+    assert list(statistics) == ["a", "a/b", "a/b/c", "b"]
+    assert [_["count"] for _ in statistics.values()] == [1, 2, 1, 1]
+    assert statistics["a"]["total"] >= statistics["a/b"]["total"]
+
+
+def test_Timer_reentrant():
+    registry = TimerRegistry()
+    timer = Timer(name="recurse", registry=registry)
+
+    def recurse(depth):
+        with timer:
+            if depth:
+                recurse(depth - 1)
+
+    recurse(2)
+    assert list(registry.as_dict()) == [
+        "recurse",
+        "recurse/recurse",
+        "recurse/recurse/recurse",
+    ]
+    assert timer.elapsed_time == registry.as_dict()["recurse"]["total"]
+
+
+def test_Timer_exception():
+    registry = TimerRegistry()
+    with pytest.raises(ZeroDivisionError):
+        with Timer(name="a", registry=registry):
+            1 / 0
+    with Timer(name="b", registry=registry):
+        pass
+    assert list(registry.as_dict()) == ["a", "b"]
+
+
+def test_Timer_threads():
+    registry = TimerRegistry()
+    timer = Timer(name="outer", registry=registry)
+    barrier = threading.Barrier(4)
+
+    def work(i):
+        with timer:
+            barrier.wait()
+            with Timer(name=f"inner{i % 2}", registry=registry):
+                pass
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    statistics = registry.as_dict()
+    assert {name: _["count"] for name, _ in statistics.items()} == {
+        "outer": 4,
+        "outer/inner0": 2,
+        "outer/inner1": 2,
+    }
+
+
+def test_Timer_tasks():
+    registry = TimerRegistry()
+    timer = Timer(name="outer", registry=registry)
+
+    async def work(i):
+        with timer:
+            await asyncio.sleep(0.01 * (3 - i))
+            with Timer(name="inner", registry=registry):
+                await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.gather(*(work(i) for i in range(3)))
+
+    asyncio.run(main())
+    statistics = registry.as_dict()
+    assert {name: _["count"] for name, _ in statistics.items()} == {
+        "outer": 3,
+        "outer/inner": 3,
+    }
+
+
+def test_Timer_registry():
+    registry = Timer.registry
+    assert isinstance(registry, TimerRegistry)
+    registry.clear()
+    with Timer(name="test_Timer_registry"):
+        pass
+    assert "test_Timer_registry" in registry
+    registry.clear()
+    assert not len(registry)
+
+
+def test_TimerRegistry():
+    registry = TimerRegistry()
+    for i in range(1, 101):
+        registry.record("a", i * 1_000_000)
+    registry.record("a/b", 5_000_000_000)
+    statistics = registry.as_dict()
+    assert statistics["a"] == {
+        "count": 100,
+        "total": 5.05,
+        "p50": 0.05,
+        "p95": 0.095,
+        "max": 0.1,
+    }
+    assert json.loads(registry.to_json()) == statistics
+    lines = registry.report().splitlines()
+    assert lines[0].split() == ["name", "count", "total", "p50", "p95", "max"]
+    assert lines[1].split()[:2] == ["a", "100"]
+    assert lines[2].startswith("  b ")
+
+
+def test_Timer_exit_out_of_order():
+    registry = TimerRegistry()
+    outer = Timer(name="outer", registry=registry)
+    inner = Timer(name="inner", registry=registry)
+    outer.__enter__()
+    inner.__enter__()
+    outer.__exit__(None, None, None)
+    # The inner span is still open, and still nested under the outer name.
+    with Timer(name="innermost", registry=registry):
+        pass
+    inner.__exit__(None, None, None)
+    assert list(registry.as_dict()) == [
+        "outer",
+        "outer/inner",
+        "outer/inner/innermost",
+    ]
+    with pytest.raises(RuntimeError):
+        inner.__exit__(None, None, None)
+
+
+def test_TimerRegistry_bounded():
+    registry = TimerRegistry(sample_size=100)
+    for i in range(1, 10_001):
+        registry.record("a", i * 1_000_000)
+    assert len(registry._durations["a"][3]) == 100
+    statistics = registry.as_dict()["a"]
+    assert statistics["count"] == 10_000
+    assert statistics["total"] == pytest.approx(50_005.0)
+    assert statistics["max"] == 10.0
+    assert 3.0 < statistics["p50"] < 7.0
+    assert statistics["p95"] > 8.0
+    with pytest.raises(ValueError):
+        TimerRegistry(sample_size=0)
+
+
+def test_Timer_exit_unentered_with_exception():
+    timer = Timer(name="unentered", registry=TimerRegistry())
+    with pytest.raises(ValueError):
+        try:
+            raise ValueError
+        except ValueError as exception:
+            timer.__exit__(type(exception), exception, exception.__traceback__)
+            raise
+    assert "unentered" not in timer._registry
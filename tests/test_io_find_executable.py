@@ -1,7 +1,11 @@
+import os
 import platform
+import shutil
 import sys
 from pathlib import Path
 
+import pytest
+
 import uqbar.io
 
 
@@ -15,3 +19,49 @@ def test_find_executable():
     print(f"{sys_executable=}")
     print(f"{found=}")
     assert sys_executable in found
+
+
+def make_executable(path):
+    path.write_text("")
+    path.chmod(0o755)
+    return str(path.resolve())
+
+
+@pytest.mark.skipif(os.name != "posix", reason="requires POSIX permissions")
+def test_find_executables(tmp_path, monkeypatch):
+    bin_a, bin_b = tmp_path / "a", tmp_path / "b"
+    bin_a.mkdir()
+    bin_b.mkdir()
+    monkeypatch.setenv("PATH", os.pathsep.join([str(bin_a), str(bin_b)]))
+    monkeypatch.setenv("PATHEXT", "")
+    foo_a = make_executable(bin_a / "foo")
+    foo_b = make_executable(bin_b / "foo")
+    bar_b = make_executable(bin_b / "bar")
+    (bin_b / "baz").write_text("")
+    assert uqbar.io.find_executables(["foo", "bar", "baz", "quux"]) == {
+        "foo": [foo_a, foo_b],
+        "bar": [bar_b],
+        "baz": [],
+        "quux": [],
+    }
+    assert uqbar.io.find_executable("baz", os.R_OK) == [str((bin_b / "baz").resolve())]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="requires POSIX permissions")
+def test_find_executable_invalidation(tmp_path, monkeypatch):
+    bin_a, bin_b = tmp_path / "a", tmp_path / "b"
+    bin_a.mkdir()
+    bin_b.mkdir()
+    monkeypatch.setenv("PATH", str(bin_a))
+    assert uqbar.io.find_executable("foo") == []
+    # Directory modification times may be coarser than the time between
+    # writes, so bump the time explicitly.
+    foo_a = make_executable(bin_a / "foo")
+    stat = os.stat(bin_a)
+    os.utime(bin_a, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert uqbar.io.find_executable("foo") == [foo_a]
+    foo_b = make_executable(bin_b / "foo")
+    monkeypatch.setenv("PATH", os.pathsep.join([str(bin_b), str(bin_a)]))
+    assert uqbar.io.find_executable("foo") == [foo_b, foo_a]
+    shutil.rmtree(bin_b)
+    assert uqbar.io.find_executable("foo") == [foo_a]
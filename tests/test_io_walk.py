@@ -0,0 +1,154 @@
+import os
+import random
+from pathlib import Path
+
+import pytest
+
+import uqbar.io
+
+
+def build_tree(root_path, seed=0, node_count=60):
+    rng = random.Random(seed)
+    directory_paths = [root_path]
+    for i in range(node_count):
+        parent_path = rng.choice(directory_paths)
+        if rng.random() < 0.4:
+            path = parent_path / f"d{i}"
+            path.mkdir()
+            directory_paths.append(path)
+        else:
+            (parent_path / f"f{i}{rng.choice(['.py', '.txt'])}").touch()
+
+
+def os_walk(root_path, top_down=True):
+    for directory_path, directory_names, file_names in os.walk(
+        root_path, topdown=top_down
+    ):
+        directory_names.sort()
+        yield (
+            Path(directory_path),
+            [Path(directory_path) / _ for _ in directory_names],
+            sorted(Path(directory_path) / _ for _ in file_names),
+        )
+
+
+@pytest.mark.parametrize("top_down", [True, False])
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_walk(tmp_path, top_down, max_workers):
+    for seed in range(5):
+        root_path = tmp_path / str(seed)
+        root_path.mkdir()
+        build_tree(root_path, seed=seed)
+        expected = list(os_walk(root_path, top_down=top_down))
+        if not top_down:
+            # os.walk() sorts bottom-up output only once its listings are
+            # complete, so compare per-directory rather than by order.
+            expected.sort()
+        actual = list(
+            uqbar.io.walk(root_path, top_down=top_down, max_workers=max_workers)
+        )
+        if not top_down:
+            assert [_[0] for _ in actual] == [
+                _[0] for _ in uqbar.io.walk(root_path, top_down=False)
+            ]
+            for i, (directory_path, directory_paths, _) in enumerate(actual):
+                # Children precede their parents.
+                for child_path in directory_paths:
+                    assert [_[0] for _ in actual].index(child_path) < i
+            actual.sort()
+        assert actual == expected
+
+
+def test_walk_filters(tmp_path):
+    build_tree(tmp_path)
+    for directory_path, directory_paths, file_paths in uqbar.io.walk(
+        tmp_path, include=["*.py"], exclude=["d1*"]
+    ):
+        assert all(_.suffix == ".py" for _ in file_paths)
+        assert not any(_.name.startswith("d1") for _ in directory_paths)
+        assert not any(
+            _.startswith("d1") for _ in directory_path.relative_to(tmp_path).parts
+        )
+    assert list(uqbar.io.walk(tmp_path, include=[])) == [
+        (directory_path, directory_paths, [])
+        for directory_path, directory_paths, _ in uqbar.io.walk(tmp_path)
+    ]
+
+
+def test_walk_prune(tmp_path):
+    build_tree(tmp_path)
+    visited_paths = []
+    for max_workers in (None, 2):
+        visited_paths.clear()
+        for directory_path, directory_paths, _ in uqbar.io.walk(
+            tmp_path, max_workers=max_workers
+        ):
+            visited_paths.append(directory_path)
+            directory_paths[:] = directory_paths[:1]
+        assert all(
+            len(_.relative_to(tmp_path).parts) == i for i, _ in enumerate(visited_paths)
+        )
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="requires symlinks")
+def test_walk_symlinks(tmp_path):
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "c.txt").touch()
+    try:
+        (tmp_path / "a" / "link").symlink_to(tmp_path / "a" / "b")
+        (tmp_path / "a" / "b" / "loop").symlink_to(tmp_path / "a")
+    except OSError:
+        pytest.skip("cannot create symlinks")
+
+    def walk(symlinks):
+        return [
+            (
+                directory_path.relative_to(tmp_path).as_posix(),
+                [_.name for _ in directory_paths],
+            )
+            for directory_path, directory_paths, _ in uqbar.io.walk(
+                tmp_path, symlinks=symlinks
+            )
+        ]
+
+    assert walk("follow") == [
+        (".", ["a"]),
+        ("a", ["b", "link"]),
+        ("a/b", ["loop"]),
+        ("a/link", ["loop"]),
+    ]
+    assert walk("list") == [
+        (".", ["a"]),
+        ("a", ["b", "link"]),
+        ("a/b", ["loop"]),
+    ]
+    assert walk("skip") == [(".", ["a"]), ("a", ["b"]), ("a/b", [])]
+    with pytest.raises(ValueError):
+        walk("ignore")
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="requires symlinks")
+@pytest.mark.parametrize("max_workers", [None, 2])
+def test_walk_symlinks_mutual(tmp_path, max_workers):
+    (tmp_path / "A").mkdir()
+    (tmp_path / "B").mkdir()
+    try:
+        (tmp_path / "A" / "link").symlink_to(Path("..") / "B")
+        (tmp_path / "B" / "link").symlink_to(Path("..") / "A")
+    except OSError:
+        pytest.skip("cannot create symlinks")
+    assert [
+        (
+            directory_path.relative_to(tmp_path).as_posix(),
+            [_.name for _ in directory_paths],
+        )
+        for directory_path, directory_paths, _ in uqbar.io.walk(
+            tmp_path, max_workers=max_workers
+        )
+    ] == [
+        (".", ["A", "B"]),
+        ("A", ["link"]),
+        ("A/link", ["link"]),
+        ("B", ["link"]),
+        ("B/link", ["link"]),
+    ]
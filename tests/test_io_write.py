@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+import uqbar.io
+
+
+def test_write(tmp_path):
+    path = tmp_path / "a" / "b.txt"
+    assert uqbar.io.write("one", path)
+    assert not uqbar.io.write("one", path)
+    assert uqbar.io.write("two", path)
+    assert path.read_text() == "two"
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="requires symlinks")
+def test_write_symlink(tmp_path):
+    target_path = tmp_path / "target.txt"
+    target_path.write_text("one")
+    link_path = tmp_path / "link.txt"
+    try:
+        link_path.symlink_to(target_path.name)
+    except OSError:
+        pytest.skip("cannot create symlinks")
+    assert uqbar.io.write("two", link_path)
+    assert link_path.is_symlink()
+    assert target_path.read_text() == "two"
+    assert sorted(_.name for _ in tmp_path.iterdir()) == ["link.txt", "target.txt"]
+
+
+@pytest.mark.skipif(not hasattr(os, "link"), reason="requires hardlinks")
+def test_write_hardlink(tmp_path):
+    path = tmp_path / "one.txt"
+    path.write_text("one")
+    other_path = tmp_path / "other.txt"
+    os.link(path, other_path)
+    assert uqbar.io.write("two", path)
+    assert other_path.read_text() == "two"
+    assert os.stat(path).st_ino == os.stat(other_path).st_ino
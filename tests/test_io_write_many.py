@@ -0,0 +1,50 @@
+import os
+import stat
+
+import pytest
+
+import uqbar.io
+
+
+@pytest.mark.parametrize("max_workers", [None, 1, 4])
+def test_write_many(tmp_path, max_workers):
+    mapping = {tmp_path / "a" / f"{i}.txt": f"contents {i}\n" * i for i in range(20)}
+    report = uqbar.io.write_many(mapping, max_workers=max_workers)
+    assert report == uqbar.io.WriteReport(written=tuple(mapping))
+    for path, contents in mapping.items():
+        assert path.read_text() == contents
+    # Same size, different contents; different size; unchanged.
+    mapping[tmp_path / "a" / "1.txt"] = "CONTENTS 1\n"
+    mapping[tmp_path / "a" / "2.txt"] = "contents 2\n"
+    mapping[tmp_path / "b" / "c" / "new.txt"] = ""
+    report = uqbar.io.write_many(mapping, max_workers=max_workers)
+    assert report.written == (tmp_path / "b" / "c" / "new.txt",)
+    assert report.rewritten == (tmp_path / "a" / "1.txt", tmp_path / "a" / "2.txt")
+    assert len(report.preserved) == 18
+    for path, contents in mapping.items():
+        assert path.read_text() == contents
+    assert not [_ for _ in tmp_path.rglob("*") if _.suffix == ".tmp"]
+
+
+def test_write_many_verbose(tmp_path):
+    messages = []
+    with uqbar.io.DirectoryChange(tmp_path):
+        uqbar.io.write_many({"b.txt": "b", "a.txt": "a"})
+        uqbar.io.write_many(
+            {"b.txt": "b", "a.txt": "A", "c/d.txt": "d"},
+            verbose=True,
+            logger_func=messages.append,
+        )
+    assert messages == ["preserved b.txt", "rewrote a.txt", "wrote c/d.txt"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="requires POSIX permissions")
+def test_write_many_permissions(tmp_path):
+    path = tmp_path / "script.sh"
+    path.write_text("old")
+    path.chmod(0o755)
+    uqbar.io.write_many({path: "new", tmp_path / "new.txt": "new"})
+    assert stat.S_IMODE(path.stat().st_mode) == 0o755
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE((tmp_path / "new.txt").stat().st_mode) == 0o666 & ~umask
@@ -0,0 +1,32 @@
+import pytest
+
+import uqbar.iterables
+
+
+def test_SequenceView():
+    sequence = list(range(10))
+    view = uqbar.iterables.SequenceView(sequence, 1, 8, 2)
+    assert list(view) == sequence[1:8:2]
+    assert len(view) == 4
+    assert view[0] == 1 and view[-1] == 7
+    assert list(view[::-1]) == sequence[1:8:2][::-1]
+    assert list(view[1:][1:]) == [5, 7]
+    assert list(reversed(view)) == [7, 5, 3, 1]
+    assert 5 in view and 4 not in view
+    assert view.index(5) == 2
+    assert view.count(5) == 1
+    assert view.sequence is sequence
+    with pytest.raises(IndexError):
+        view[4]
+    with pytest.raises(ValueError):
+        view.index(4)
+    sequence[3] = "x"
+    assert list(view) == [1, "x", 5, 7]
+
+
+def test_strided():
+    assert list(uqbar.iterables.strided("abcdefg", 3)) == ["a", "d", "g"]
+    assert list(uqbar.iterables.strided(range(10), 4, start=2)) == [2, 6]
+    view = uqbar.iterables.strided(bytearray(b"abcdefg"), 2, start=1)
+    assert isinstance(view, memoryview)
+    assert bytes(view) == b"bdf"
@@ -0,0 +1,33 @@
+import array
+
+import pytest
+
+import uqbar.iterables
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 8])
+def test_chunked(size):
+    sequence = list(range(7))
+    chunks = list(uqbar.iterables.chunked(sequence, size))
+    assert [list(chunk) for chunk in chunks] == list(
+        uqbar.iterables.group_by_count(sequence, size)
+    )
+    assert all(isinstance(_, uqbar.iterables.SequenceView) for _ in chunks)
+
+
+def test_chunked_buffer():
+    data = bytearray(b"abcdefg")
+    chunks = list(uqbar.iterables.chunked(data, 3))
+    assert all(isinstance(chunk, memoryview) for chunk in chunks)
+    assert [bytes(chunk) for chunk in chunks] == [b"abc", b"def", b"g"]
+    data[0:1] = b"z"
+    assert bytes(chunks[0]) == b"zbc"
+    del chunks
+    numbers = array.array("d", range(5))
+    assert [chunk.tolist() for chunk in uqbar.iterables.chunked(numbers, 2)] == [
+        [0.0, 1.0],
+        [2.0, 3.0],
+        [4.0],
+    ]
+    with pytest.raises(ValueError):
+        list(uqbar.iterables.chunked(data, 0))
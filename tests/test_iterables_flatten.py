@@ -0,0 +1,52 @@
+import itertools
+import sys
+
+import pytest
+
+import uqbar.iterables
+
+
+@pytest.mark.parametrize(
+    "iterable, kwargs, expected",
+    [
+        ([], {}, []),
+        ([1, [2, [3, [4]]]], {}, [1, 2, 3, 4]),
+        ([1, [2, [3, [4]]]], {"max_depth": 0}, [1, [2, [3, [4]]]]),
+        ([1, [2, [3, [4]]]], {"max_depth": 1}, [1, 2, [3, [4]]]),
+        ([1, [2, [3, [4]]]], {"max_depth": 3}, [1, 2, 3, 4]),
+        (["ab", [b"cd", ("ef",)]], {}, ["ab", b"cd", "ef"]),
+        (["ab", [b"cd", ("ef",)]], {"atom_types": bytes}, ["a", "b", b"cd", "e", "f"]),
+        ([{"a": 1}, (x for x in range(3)), None], {}, ["a", 0, 1, 2, None]),
+        ([(1, 2), [(3, 4)]], {"atom_types": tuple}, [(1, 2), (3, 4)]),
+    ],
+)
+def test_flatten(iterable, kwargs, expected):
+    assert list(uqbar.iterables.flatten(iterable, **kwargs)) == expected
+
+
+def test_flatten_deep():
+    nested = [0]
+    for i in range(1, sys.getrecursionlimit() * 2):
+        nested = [nested, i]
+    assert list(uqbar.iterables.flatten(nested)) == list(
+        range(sys.getrecursionlimit() * 2)
+    )
+
+
+def test_flatten_one_level():
+    groups = [[1, 2], (3,), [], "ab", 4]
+    assert list(uqbar.iterables.flatten(groups, max_depth=1)) == [1, 2, 3, "ab", 4]
+    groups = [[1, 2], (3,), [], ["ab", [4]]]
+    assert list(uqbar.iterables.flatten(groups, max_depth=1)) == list(
+        itertools.chain.from_iterable(groups)
+    )
+
+
+def test_flatten_str_subclass():
+    class Char(str):
+        def __iter__(self):
+            return iter([Char(_) for _ in str.__str__(self)])
+
+    char = Char("a")
+    assert list(uqbar.iterables.flatten([char], atom_types=bytes))[0] is char
+    assert list(uqbar.iterables.flatten([Char("bc")], atom_types=bytes)) == ["b", "c"]
@@ -0,0 +1,42 @@
+import pytest
+
+import uqbar.iterables
+
+
+@pytest.mark.parametrize(
+    "sequence, length, expected",
+    [
+        ([1, 2, 3], 7, [1, 2, 3, 1, 2, 3, 1]),
+        ([1, 2, 3], 2, [1, 2]),
+        ([1, 2, 3], 0, []),
+        ([1, 2, 3], -1, []),
+        ([], 3, []),
+        ("ab", 3, ["a", "b", "a"]),
+        (iter([1, 2]), 5, [1, 2, 1, 2, 1]),
+    ],
+)
+def test_repeat_to_length(sequence, length, expected):
+    assert list(uqbar.iterables.repeat_to_length(sequence, length)) == expected
+
+
+def test_repeat_to_length_array_fallback():
+    result = uqbar.iterables.repeat_to_length_array(iter([1, 2]), 5)
+    assert list(result) == [1, 2, 1, 2, 1]
+    result = uqbar.iterables.repeat_to_length_array("ab", 3)
+    assert list(result) == ["a", "b", "a"]
+    # Ragged or mixed input can't become an array.
+    result = uqbar.iterables.repeat_to_length_array([1, [2, 3]], 3)
+    assert list(result) == [1, [2, 3], 1]
+    result = uqbar.iterables.repeat_to_length_array([1, None], 3)
+    assert list(result) == [1, None, 1]
+
+
+def test_repeat_to_length_array_numpy():
+    numpy = pytest.importorskip("numpy")
+    result = uqbar.iterables.repeat_to_length_array([1, 2, 3], 7)
+    assert isinstance(result, numpy.ndarray)
+    assert result.tolist() == [1, 2, 3, 1, 2, 3, 1]
+    result = uqbar.iterables.repeat_to_length_array(numpy.arange(6).reshape(3, 2), 4)
+    assert result.tolist() == [[0, 1], [2, 3], [4, 5], [0, 1]]
+    assert uqbar.iterables.repeat_to_length_array([], 3).tolist() == []
+    assert uqbar.iterables.repeat_to_length_array([1], -1).tolist() == []
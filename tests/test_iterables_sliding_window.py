@@ -0,0 +1,15 @@
+import pytest
+
+import uqbar.iterables
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 6, 7])
+def test_sliding_window(n):
+    sequence = list(range(6))
+    expected = [tuple(sequence[i : i + n]) for i in range(len(sequence) - n + 1)]
+    if n < 1:
+        expected = []
+    assert list(uqbar.iterables.sliding_window(sequence, n)) == expected
+    assert list(uqbar.iterables.sliding_window(iter(sequence), n)) == expected
+    assert list(uqbar.iterables.sliding_window(tuple(sequence), n)) == expected
+    assert list(uqbar.iterables.nwise(iter(sequence), n)) == expected
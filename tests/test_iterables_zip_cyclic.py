@@ -0,0 +1,53 @@
+import pytest
+
+import uqbar.iterables
+
+
+def test_zip_cyclic():
+    assert list(uqbar.iterables.zip_cyclic([1, 2, 3], "ab")) == [
+        (1, "a"),
+        (2, "b"),
+        (3, "a"),
+    ]
+    assert list(uqbar.iterables.zip_cyclic([1, 2, 3], [])) == []
+    with pytest.raises(ValueError):
+        uqbar.iterables.zip_cyclic()
+
+
+def test_zip_cyclic_length():
+    assert list(uqbar.iterables.zip_cyclic([1, 2], "abc", length=4)) == [
+        (1, "a"),
+        (2, "b"),
+        (1, "c"),
+        (2, "a"),
+    ]
+    # Lengths are not computed, so unsized iterables are accepted.
+    assert list(uqbar.iterables.zip_cyclic(iter([1, 2]), "a", length=3)) == [
+        (1, "a"),
+        (2, "a"),
+        (1, "a"),
+    ]
+    assert list(uqbar.iterables.zip_cyclic([1, 2], length=0)) == []
+
+
+def test_zip_cyclic_arrays_fallback():
+    result = uqbar.iterables.zip_cyclic_arrays(iter([1, 2]), [3], length=3)
+    assert result == ((1, 2, 1), (3, 3, 3))
+    result = uqbar.iterables.zip_cyclic_arrays(iter([1, 2]), [], length=3)
+    assert result == ((), ())
+    # Ragged input can't become an array.
+    result = uqbar.iterables.zip_cyclic_arrays([1, [2, 3]], [4])
+    assert result == ((1, [2, 3]), (4, 4))
+
+
+def test_zip_cyclic_arrays_numpy():
+    numpy = pytest.importorskip("numpy")
+    left, right = uqbar.iterables.zip_cyclic_arrays([1, 2, 3], numpy.array([4, 5]))
+    assert isinstance(left, numpy.ndarray)
+    assert left.tolist() == [1, 2, 3]
+    assert right.tolist() == [4, 5, 4]
+    left, right = uqbar.iterables.zip_cyclic_arrays([1, 2], [3], length=5)
+    assert left.tolist() == [1, 2, 1, 2, 1]
+    assert right.tolist() == [3, 3, 3, 3, 3]
+    left, right = uqbar.iterables.zip_cyclic_arrays([1, 2], [])
+    assert left.tolist() == right.tolist() == []
@@ -554,6 +554,49 @@ def test_sphinx_book_text_uncached(app, status, warning, rm_dirs):
         assert actual_content == expected_content
 
 
+@pytest.mark.sphinx(
+    "text",
+    testroot="uqbar-sphinx-book",
+    confoverrides={"uqbar_book_profile": "doctree-read"},
+)
+def test_sphinx_book_text_profiled(app, status, warning, rm_dirs):
+    profiles_path = pathlib.Path(app.doctreedir).parent / "uqbar-profiles"
+    shutil.rmtree(profiles_path, ignore_errors=True)
+    app.build()
+    assert not warning.getvalue().strip()
+    names = sorted(path.name.partition("-2")[0] for path in profiles_path.iterdir())
+    assert names == [
+        "doctree-read-api",
+        "doctree-read-directives",
+        "doctree-read-index",
+    ]
+    assert all(path.suffix == ".prof" for path in profiles_path.iterdir())
+    shutil.rmtree(profiles_path)
+
+
+@pytest.mark.skipif(
+    sys.platform == "win32", reason="sampling requires signal.setitimer()"
+)
+@pytest.mark.sphinx(
+    "text",
+    testroot="uqbar-sphinx-book",
+    confoverrides={
+        "uqbar_book_profile": "suite",
+        "uqbar_book_profile_mode": "sampling",
+        "uqbar_book_use_cache": False,
+    },
+)
+def test_sphinx_book_text_profiled_suites(app, status, warning, rm_dirs):
+    profiles_path = pathlib.Path(app.doctreedir).parent / "uqbar-profiles"
+    shutil.rmtree(profiles_path, ignore_errors=True)
+    app.build()
+    assert not warning.getvalue().strip()
+    paths = list(profiles_path.iterdir())
+    assert any(path.name.startswith("suite-fake.GrandParent.one-") for path in paths)
+    assert all(path.suffix == ".collapsed" for path in paths)
+    shutil.rmtree(profiles_path)
+
+
 @pytest.mark.sphinx("text", testroot="uqbar-sphinx-book-broken")
 def test_sphinx_book_text_broken_strict(app, status, warning, rm_dirs):
     """
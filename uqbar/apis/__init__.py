@@ -5,6 +5,7 @@ Tools for auto-generating API documention.
 import importlib
 import pathlib
 
+from .. import io
 from .builders import APIBuilder
 from .documenters import (
     ClassDocumenter,
@@ -39,11 +40,13 @@ def collect_source_paths(source_paths, recurse_subpackages=True):
             if not (current_path / "__init__.py").exists():
                 continue
             if recurse_subpackages:
-                for path in current_path.iterdir():
-                    if path.is_dir() and (path / "__init__.py").exists():
-                        path_stack.append(path)
-                    elif path.suffix in (".py", ".pyx"):
-                        visited_paths.add(path)
+                for _, directory_paths, file_paths in io.walk(
+                    current_path, include=["*.py", "*.pyx"]
+                ):
+                    if not any(path.name == "__init__.py" for path in file_paths):
+                        directory_paths.clear()
+                        continue
+                    visited_paths.update(file_paths)
             else:
                 visited_paths.add(current_path / "__init__.py")
                 for path in current_path.iterdir():
@@ -100,20 +100,27 @@ class APIBuilder(object):
         """
         import uqbar.apis
 
-        # Make sure target directory exists.
-        if not self._target_directory.exists():
-            self._target_directory.mkdir(parents=True)
-        self._target_directory = self._target_directory.resolve()
-        # What files to document?
-        source_paths = uqbar.apis.collect_source_paths(self._initial_source_paths)
-        # Build the node tree
-        node_tree = self.build_node_tree(source_paths)
-        # Get the documenters, in depth-first order.
-        documenters = self.collect_module_documenters(node_tree)
-        # Execute each documenter, writing to the target directory.
-        visited_paths = self.write(documenters)
-        # Iterate the target directory, removing un-touched files.
-        self.prune(visited_paths)
+        with io.Timer(name="uqbar.apis.APIBuilder"):
+            # Make sure target directory exists.
+            if not self._target_directory.exists():
+                self._target_directory.mkdir(parents=True)
+            self._target_directory = self._target_directory.resolve()
+            # What files to document?
+            with io.Timer(name="collect_source_paths"):
+                source_paths = uqbar.apis.collect_source_paths(
+                    self._initial_source_paths
+                )
+            # Build the node tree
+            with io.Timer(name="build_node_tree"):
+                node_tree = self.build_node_tree(source_paths)
+            # Get the documenters, in depth-first order.
+            documenters = self.collect_module_documenters(node_tree)
+            # Execute each documenter, writing to the target directory.
+            with io.Timer(name="write"):
+                visited_paths = self.write(documenters)
+            # Iterate the target directory, removing un-touched files.
+            with io.Timer(name="prune"):
+                self.prune(visited_paths)
         return visited_paths
 
     ### PRIVATE METHODS ###
@@ -223,18 +230,15 @@ class APIBuilder(object):
                 yield node.documenter
 
     def write(self, documenters):
-        visited_paths = set()
+        mapping = {}
+        cwd = pathlib.Path.cwd()
         for documenter in documenters:
-            new_documentation = str(documenter)
             path = self._target_directory.joinpath(documenter.documentation_path)
-            cwd = pathlib.Path.cwd()
             if str(path).startswith(str(cwd)):
-                path = path.relative_to(pathlib.Path.cwd())
-            io.write(
-                new_documentation, path, verbose=True, logger_func=self._logger_func
-            )
-            visited_paths.add(path.absolute())
-        return visited_paths
+                path = path.relative_to(cwd)
+            mapping[path] = str(documenter)
+        io.write_many(mapping, verbose=True, logger_func=self._logger_func)
+        return set(path.absolute() for path in mapping)
 
     def prune(self, visited_paths):
         generator = io.walk(self._target_directory, top_down=False)
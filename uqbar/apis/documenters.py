@@ -210,10 +210,18 @@ class ModuleDocumenter:
         <BLANKLINE>
         .. currentmodule:: uqbar.io
         <BLANKLINE>
+        .. autoclass:: CaptureBuffer
+           :members:
+           :undoc-members:
+        <BLANKLINE>
         .. autoclass:: DirectoryChange
            :members:
            :undoc-members:
         <BLANKLINE>
+        .. autoclass:: MemoryProfiler
+           :members:
+           :undoc-members:
+        <BLANKLINE>
         .. autoclass:: Profiler
            :members:
            :undoc-members:
@@ -226,10 +234,20 @@ class ModuleDocumenter:
            :members:
            :undoc-members:
         <BLANKLINE>
+        .. autoclass:: TimerRegistry
+           :members:
+           :undoc-members:
+        <BLANKLINE>
+        .. autoclass:: WriteReport
+           :members:
+           :undoc-members:
+        <BLANKLINE>
         .. autofunction:: find_common_prefix
         <BLANKLINE>
         .. autofunction:: find_executable
         <BLANKLINE>
+        .. autofunction:: find_executables
+        <BLANKLINE>
         .. autofunction:: open_path
         <BLANKLINE>
         .. autofunction:: relative_to
@@ -237,6 +255,8 @@ class ModuleDocumenter:
         .. autofunction:: walk
         <BLANKLINE>
         .. autofunction:: write
+        <BLANKLINE>
+        .. autofunction:: write_many
 
     .. tip::
 
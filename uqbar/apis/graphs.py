@@ -15,6 +15,7 @@ from typing import (  # noqa
     Union,
 )
 
+import uqbar.containers
 import uqbar.graphs
 import uqbar.strings
 
@@ -63,6 +64,7 @@ class InheritanceGraph:
             subgraph "cluster_uqbar.containers.dependency_graph" {
                 graph [label="uqbar.containers.dependency_graph"];
                 node [color=2];
+                "uqbar.containers.dependency_graph.CompactDependencyGraph" [label="Compact\nDependency\nGraph"];
                 "uqbar.containers.dependency_graph.DependencyGraph" [label="Dependency\nGraph"];
             }
             subgraph "cluster_uqbar.containers.unique_tree" {
@@ -73,6 +75,7 @@ class InheritanceGraph:
                 "uqbar.containers.unique_tree.UniqueTreeList" [label="Unique\nTree\nList"];
                 "uqbar.containers.unique_tree.UniqueTreeNode" [label="Unique\nTree\nNode"];
                 "uqbar.containers.unique_tree.UniqueTreeSet" [label="Unique\nTree\nSet"];
+                "uqbar.containers.unique_tree.UniqueTreeSnapshot" [label="Unique\nTree\nSnapshot"];
                 "uqbar.containers.unique_tree.UniqueTreeTuple" [label="Unique\nTree\nTuple"];
                 "uqbar.containers.unique_tree.UniqueTreeContainer" -> "uqbar.containers.unique_tree.UniqueTreeDict";
                 "uqbar.containers.unique_tree.UniqueTreeContainer" -> "uqbar.containers.unique_tree.UniqueTreeList";
@@ -80,8 +83,10 @@ class InheritanceGraph:
                 "uqbar.containers.unique_tree.UniqueTreeContainer" -> "uqbar.containers.unique_tree.UniqueTreeTuple";
                 "uqbar.containers.unique_tree.UniqueTreeNode" -> "uqbar.containers.unique_tree.UniqueTreeContainer";
             }
+            "builtins.object" -> "uqbar.containers.dependency_graph.CompactDependencyGraph";
             "builtins.object" -> "uqbar.containers.dependency_graph.DependencyGraph";
             "builtins.object" -> "uqbar.containers.unique_tree.UniqueTreeNode";
+            "builtins.object" -> "uqbar.containers.unique_tree.UniqueTreeSnapshot";
         }
 
     We can calculate the "aspect ratio" of the graph - the number of
@@ -141,6 +146,7 @@ class InheritanceGraph:
             subgraph "cluster_uqbar.containers.dependency_graph" {
                 graph [label="uqbar.containers.dependency_graph"];
                 node [color=3];
+                "uqbar.containers.dependency_graph.CompactDependencyGraph" [label="Compact\nDependency\nGraph"];
                 "uqbar.containers.dependency_graph.DependencyGraph" [label="Dependency\nGraph"];
             }
             subgraph "cluster_uqbar.containers.unique_tree" {
@@ -151,6 +157,7 @@ class InheritanceGraph:
                 "uqbar.containers.unique_tree.UniqueTreeList" [label="Unique\nTree\nList"];
                 "uqbar.containers.unique_tree.UniqueTreeNode" [label="Unique\nTree\nNode"];
                 "uqbar.containers.unique_tree.UniqueTreeSet" [label="Unique\nTree\nSet"];
+                "uqbar.containers.unique_tree.UniqueTreeSnapshot" [label="Unique\nTree\nSnapshot"];
                 "uqbar.containers.unique_tree.UniqueTreeTuple" [label="Unique\nTree\nTuple"];
                 "uqbar.containers.unique_tree.UniqueTreeContainer" -> "uqbar.containers.unique_tree.UniqueTreeDict";
                 "uqbar.containers.unique_tree.UniqueTreeContainer" -> "uqbar.containers.unique_tree.UniqueTreeList";
@@ -182,8 +189,10 @@ class InheritanceGraph:
                 "uqbar.graphs.records.RecordField" [label="Record\nField"];
                 "uqbar.graphs.records.RecordGroup" [label="Record\nGroup"];
             }
+            "builtins.object" -> "uqbar.containers.dependency_graph.CompactDependencyGraph";
             "builtins.object" -> "uqbar.containers.dependency_graph.DependencyGraph";
             "builtins.object" -> "uqbar.containers.unique_tree.UniqueTreeNode";
+            "builtins.object" -> "uqbar.containers.unique_tree.UniqueTreeSnapshot";
             "uqbar.containers.unique_tree.UniqueTreeList" -> "uqbar.apis.nodes.PackageNode";
             "uqbar.containers.unique_tree.UniqueTreeList" -> "uqbar.graphs.core.Graph";
             "uqbar.containers.unique_tree.UniqueTreeList" -> "uqbar.graphs.core.Node";
@@ -304,25 +313,23 @@ class InheritanceGraph:
 
     ### PRIVATE METHODS ###
 
-    def _calculate_aspect_ratio(self, children_to_parents):
-        def calculate_depth(class_, depth=0):
-            parents = children_to_parents.get(class_, ())
-            while parents:
-                depth += 1
-                new_parents = set()
-                for parent in parents:
-                    new_parents.update(children_to_parents.get(parent, ()))
-                parents = new_parents
-            return depth
+    def _build_dependency_graph(self, children_to_parents, cached=False):
+        graph = uqbar.containers.DependencyGraph(cached=cached)
+        graph.add_edges(
+            (child, parent)
+            for child, parents in children_to_parents.items()
+            for parent in parents
+        )
+        return graph
 
+    def _calculate_aspect_ratio(self, children_to_parents):
         if not children_to_parents:
             return None
-        class_to_depth = {}
-        for class_ in children_to_parents:
-            class_to_depth[class_] = calculate_depth(class_)
+        # Caching shares each class's depth with its subclasses.
+        graph = self._build_dependency_graph(children_to_parents, cached=True)
         depth_to_classes = {}
-        for class_, depth in class_to_depth.items():
-            depth_to_classes.setdefault(depth, set()).add(class_)
+        for class_ in children_to_parents:
+            depth_to_classes.setdefault(graph.depth(class_), set()).add(class_)
         width = len(depth_to_classes)
         height = max(len(classes) for classes in depth_to_classes.values())
         return width, height
@@ -502,21 +509,17 @@ class InheritanceGraph:
     def _strip_nonlineage_classes(
         self, parents_to_children, children_to_parents, lineage_classes
     ):
-        def _recurse_upward(current_class):
-            visited_classes.add(current_class)
-            for parent in children_to_parents.get(current_class, ()):
-                _recurse_upward(parent)
-
-        def _recurse_downward(current_class):
+        def _visit_lineage(current_class):
             visited_classes.add(current_class)
-            for child in parents_to_children.get(current_class, ()):
-                _recurse_downward(child)
+            if current_class in graph:
+                visited_classes.update(graph.ancestors(current_class))
+                visited_classes.update(graph.descendants(current_class))
 
+        graph = self._build_dependency_graph(children_to_parents)
         visited_classes = set()
         # Check for hierarchies interecting the lineage classes
         for class_ in lineage_classes:
-            _recurse_upward(class_)
-            _recurse_downward(class_)
+            _visit_lineage(class_)
         # Check if lineage paths are prefixes for class module paths
         lineage_paths_parts = [
             lineage_path.split(".") for lineage_path in self._lineage_paths
@@ -525,8 +528,7 @@ class InheritanceGraph:
             module_parts = class_.__module__.split(".")
             for parts in lineage_paths_parts:
                 if module_parts[: len(parts)] == parts:
-                    _recurse_upward(class_)
-                    _recurse_downward(class_)
+                    _visit_lineage(class_)
                     break
 
         for parent, children in tuple(parents_to_children.items()):
@@ -336,15 +336,27 @@ class SummarizingModuleDocumenter(ModuleDocumenter):
         .. autosummary::
            :nosignatures:
         <BLANKLINE>
+           ~CaptureBuffer
            ~DirectoryChange
+           ~MemoryProfiler
            ~Profiler
            ~RedirectedStreams
            ~Timer
+           ~TimerRegistry
+           ~WriteReport
+        <BLANKLINE>
+        .. autoclass:: CaptureBuffer
+           :members:
+           :undoc-members:
         <BLANKLINE>
         .. autoclass:: DirectoryChange
            :members:
            :undoc-members:
         <BLANKLINE>
+        .. autoclass:: MemoryProfiler
+           :members:
+           :undoc-members:
+        <BLANKLINE>
         .. autoclass:: Profiler
            :members:
            :undoc-members:
@@ -357,6 +369,14 @@ class SummarizingModuleDocumenter(ModuleDocumenter):
            :members:
            :undoc-members:
         <BLANKLINE>
+        .. autoclass:: TimerRegistry
+           :members:
+           :undoc-members:
+        <BLANKLINE>
+        .. autoclass:: WriteReport
+           :members:
+           :undoc-members:
+        <BLANKLINE>
         .. raw:: html
         <BLANKLINE>
            <hr/>
@@ -369,15 +389,19 @@ class SummarizingModuleDocumenter(ModuleDocumenter):
         <BLANKLINE>
            ~find_common_prefix
            ~find_executable
+           ~find_executables
            ~open_path
            ~relative_to
            ~walk
            ~write
+           ~write_many
         <BLANKLINE>
         .. autofunction:: find_common_prefix
         <BLANKLINE>
         .. autofunction:: find_executable
         <BLANKLINE>
+        .. autofunction:: find_executables
+        <BLANKLINE>
         .. autofunction:: open_path
         <BLANKLINE>
         .. autofunction:: relative_to
@@ -385,6 +409,8 @@ class SummarizingModuleDocumenter(ModuleDocumenter):
         .. autofunction:: walk
         <BLANKLINE>
         .. autofunction:: write
+        <BLANKLINE>
+        .. autofunction:: write_many
 
     :param package_path: the module path of the module to document
     :param document_private_members: whether to documenter private module members
@@ -553,10 +579,14 @@ class SummarizingRootDocumenter(RootDocumenter):
         .. autosummary::
            :nosignatures:
         <BLANKLINE>
+           ~uqbar.io.CaptureBuffer
            ~uqbar.io.DirectoryChange
+           ~uqbar.io.MemoryProfiler
            ~uqbar.io.Profiler
            ~uqbar.io.RedirectedStreams
            ~uqbar.io.Timer
+           ~uqbar.io.TimerRegistry
+           ~uqbar.io.WriteReport
         <BLANKLINE>
         .. raw:: html
         <BLANKLINE>
@@ -570,10 +600,12 @@ class SummarizingRootDocumenter(RootDocumenter):
         <BLANKLINE>
            ~uqbar.io.find_common_prefix
            ~uqbar.io.find_executable
+           ~uqbar.io.find_executables
            ~uqbar.io.open_path
            ~uqbar.io.relative_to
            ~uqbar.io.walk
            ~uqbar.io.write
+           ~uqbar.io.write_many
         <BLANKLINE>
         .. raw:: html
         <BLANKLINE>
@@ -32,7 +32,7 @@ from sphinx.addnodes import desc_signature
 from sphinx.util.nodes import set_source_info
 from typing_extensions import ClassVar
 
-from ..io import RedirectedStreams
+from ..io import CaptureBuffer, RedirectedStreams, Timer
 from ..strings import ansi_escape
 
 try:
@@ -94,6 +94,13 @@ class Console(code.InteractiveConsole):
     """
     Interactive console providing a sandboxed namespace for executing code
     examples.
+
+    Output is captured in a :py:class:`~uqbar.io.CaptureBuffer`, keeping at
+    most ``max_output_size`` bytes per call to :py:meth:`interpret`.
+    Tracebacks and syntax errors are always kept in full. With
+    ``per_context=True``, output is redirected only within the current
+    :py:mod:`contextvars` context, so that consoles can interpret
+    concurrently in separate asyncio tasks.
     """
 
     ### INITIALIZER ###
@@ -102,6 +109,8 @@ class Console(code.InteractiveConsole):
         self,
         namespace: dict[str, Any] | None = None,
         extensions: list["Extension"] | None = None,
+        max_output_size: int | None = None,
+        per_context: bool = False,
     ) -> None:
         super().__init__(
             filename="<stdin>",
@@ -111,6 +120,9 @@ class Console(code.InteractiveConsole):
         self.extensions = extensions
         self.errored = False
         self.results: list[Any] = []
+        self.output = CaptureBuffer(max_size=max_output_size)
+        self._writing_error = False
+        self.per_context = per_context
         self.monkeypatch = MonkeyPatch()
         self.proxy_options: dict[str, dict[str, Any]] = {}
 
@@ -129,6 +141,10 @@ class Console(code.InteractiveConsole):
 
     ### PRIVATE METHODS ###
 
+    def _flush_output(self) -> None:
+        if string := self.output.drain():
+            self.results.append(ConsoleOutput(string))
+
     def _showtraceback(self, *args) -> None:
         """
         Re-implementation of code.InteractiveConsole's showtraceback().
@@ -138,6 +154,7 @@ class Console(code.InteractiveConsole):
         """
         sys.last_type, sys.last_value, last_tb = ei = sys.exc_info()
         sys.last_traceback = last_tb
+        self._writing_error = True
         try:
             self.write(
                 "".join(
@@ -147,6 +164,7 @@ class Console(code.InteractiveConsole):
                 )
             )
         finally:
+            self._writing_error = False
             last_tb = ei = None  # type: ignore
 
     ### PUBLIC METHODS ###
@@ -160,10 +178,12 @@ class Console(code.InteractiveConsole):
         self.resetbuffer()
         self.errored = False
         self.results[:] = []
+        self.output.clear()
         is_incomplete_statement = False
-        with RedirectedStreams(self, self), self:
+        with RedirectedStreams(self, self, per_context=self.per_context), self:
             prompt = ">>> "
             for line_number, line in enumerate(lines, 1):
+                self._flush_output()
                 self.results.append(ConsoleInput(prompt + line + "\n"))
                 try:
                     is_incomplete_statement = await self.push_async(line)
@@ -171,6 +191,7 @@ class Console(code.InteractiveConsole):
                     self.resetbuffer()
                 prompt = "... " if is_incomplete_statement else ">>> "
             if is_incomplete_statement:
+                self._flush_output()
                 self.results.append(ConsoleInput(prompt + "\n"))
                 try:
                     is_incomplete_statement = await self.push_async("\n")
@@ -178,6 +199,7 @@ class Console(code.InteractiveConsole):
                     self.resetbuffer()
             if is_incomplete_statement:
                 self.errored = True
+            self._flush_output()
         results = []
         for class_, grouper in itertools.groupby(self.results, lambda x: type(x)):
             if class_ is ConsoleInput:
@@ -201,6 +223,7 @@ class Console(code.InteractiveConsole):
         return more
 
     def push_proxy(self, proxy: "Extension") -> None:
+        self._flush_output()
         self.results.append(proxy)
 
     def push_proxy_options(self, options: dict | None = None) -> None:
@@ -231,7 +254,11 @@ class Console(code.InteractiveConsole):
         return False
 
     def showsyntaxerror(self, filename: str | None = None, *, source: str = "") -> None:
-        super().showsyntaxerror(filename=filename, source=source)
+        self._writing_error = True
+        try:
+            super().showsyntaxerror(filename=filename, source=source)
+        finally:
+            self._writing_error = False
         self.errored = True
 
     def showtraceback(self) -> None:
@@ -239,7 +266,12 @@ class Console(code.InteractiveConsole):
         self.errored = True
 
     def write(self, string: str) -> None:
-        self.results.append(ConsoleOutput(string))
+        # Errors bypass the output limit, so that tracebacks survive it.
+        if self._writing_error:
+            self._flush_output()
+            self.results.append(ConsoleOutput(string))
+        else:
+            self.output.write(string)
 
 
 class Extension:
@@ -501,19 +533,30 @@ def find_traceback(
 
 @contextlib.asynccontextmanager
 async def console_context(
-    *, extensions, namespace=None, setup_lines=None, teardown_lines=None, document=None
+    *,
+    extensions,
+    namespace=None,
+    setup_lines=None,
+    teardown_lines=None,
+    document=None,
+    max_output_size=None,
 ) -> AsyncGenerator[Console, None]:
-    console = Console(extensions=extensions, namespace=namespace)
-    console_output, errored = await console.interpret(setup_lines or [])
-    if errored:
-        raise ConsoleError(find_traceback(console_output), document)
-    try:
-        yield console
-    finally:
-        console.resetbuffer()
-        console_output, errored = await console.interpret(teardown_lines or [])
+    with Timer(name="uqbar.book.console_context"):
+        console = Console(
+            extensions=extensions,
+            namespace=namespace,
+            max_output_size=max_output_size,
+        )
+        console_output, errored = await console.interpret(setup_lines or [])
         if errored:
             raise ConsoleError(find_traceback(console_output), document)
+        try:
+            yield console
+        finally:
+            console.resetbuffer()
+            console_output, errored = await console.interpret(teardown_lines or [])
+            if errored:
+                raise ConsoleError(find_traceback(console_output), document)
 
 
 async def interpret_code_blocks(
@@ -528,6 +571,7 @@ async def interpret_code_blocks(
     document: document | None = None,
     extensions: list[Extension] | None = None,
     logger_func: Callable[[str], None] | None = None,
+    max_output_size: int | None = None,
     namespace: dict[str, Any] | None = None,
     setup_lines: list[str] | None = None,
     teardown_lines: list[str] | None = None,
@@ -547,6 +591,7 @@ async def interpret_code_blocks(
     async with console_context(
         document=document,
         extensions=extensions,
+        max_output_size=max_output_size,
         namespace=namespace,
         setup_lines=setup_lines,
         teardown_lines=teardown_lines,
@@ -599,6 +644,7 @@ async def interpret_code_blocks_with_cache(
     document: document | None = None,
     extensions: list[Extension] | None = None,
     logger_func: Callable[[str], None] | None = None,
+    max_output_size: int | None = None,
     namespace: dict[str, Any] | None = None,
     setup_lines: list[str] | None = None,
     teardown_lines: list[str] | None = None,
@@ -615,6 +661,7 @@ async def interpret_code_blocks_with_cache(
         document=document,
         extensions=extensions,
         logger_func=logger_func,
+        max_output_size=max_output_size,
         namespace=namespace,
         setup_lines=setup_lines,
         teardown_lines=teardown_lines,
@@ -635,7 +682,8 @@ async def interpret_import_block(
     attr = getattr(module, attr_name)
     source = inspect.getsource(attr)
     lines = [f"from {module_name} import {attr_name}"]
-    output, errored = await console.interpret(lines)
+    with Timer(name="interpret_import_block"):
+        output, errored = await console.interpret(lines)
     output = [ConsoleOutput(string=source)]
     return output, errored, False
 
@@ -658,10 +706,12 @@ async def interpret_literal_block(
             has_exception = True
     if use_black:
         try:
-            lines = black_format(lines)
+            with Timer(name="black_format"):
+                lines = black_format(lines)
         except Exception:
             raise ConsoleError(traceback.format_exc(), block)
-    console_output, errored = await console.interpret(lines)
+    with Timer(name="interpret_literal_block"):
+        console_output, errored = await console.interpret(lines)
     return console_output, errored, has_exception
 
 
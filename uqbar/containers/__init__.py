@@ -2,20 +2,23 @@
 Specialized container classes.
 """
 
-from .dependency_graph import DependencyGraph
+from .dependency_graph import CompactDependencyGraph, DependencyGraph
 from .unique_tree import (
     UniqueTreeDict,
     UniqueTreeList,
     UniqueTreeNode,
     UniqueTreeSet,
+    UniqueTreeSnapshot,
     UniqueTreeTuple,
 )
 
 __all__ = [
+    "CompactDependencyGraph",
     "DependencyGraph",
     "UniqueTreeDict",
     "UniqueTreeList",
     "UniqueTreeNode",
     "UniqueTreeSet",
+    "UniqueTreeSnapshot",
     "UniqueTreeTuple",
 ]
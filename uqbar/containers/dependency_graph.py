@@ -1,4 +1,66 @@
 import collections
+import concurrent.futures
+import dataclasses
+import heapq
+import itertools
+import mmap
+import pickle
+import struct
+import time
+from array import array
+from typing import Any, Hashable, Optional
+
+
+def _call_timed(function, node):
+    start_time = time.perf_counter()
+    try:
+        result, exception = function(node), None
+    except Exception as caught:
+        result, exception = None, caught
+    return result, exception, time.perf_counter() - start_time
+
+
+def _iterate(nodes, parent_indices, counts):
+    # Always release the earliest-inserted childless node, as pop() does.
+    ready = [i for i, count in enumerate(counts) if not count]
+    while ready:
+        i = heapq.heappop(ready)
+        yield nodes[i]
+        for j in parent_indices[i]:
+            counts[j] -= 1
+            if not counts[j]:
+                heapq.heappush(ready, j)
+    if any(counts):
+        raise ValueError("Graph contains cycles.")
+
+
+def _iterate_levels(nodes, parent_indices, counts):
+    level = [i for i, count in enumerate(counts) if not count]
+    while level:
+        yield frozenset(nodes[i] for i in level)
+        next_level = []
+        for i in level:
+            for j in parent_indices[i]:
+                counts[j] -= 1
+                if not counts[j]:
+                    next_level.append(j)
+        level = next_level
+    if any(counts):
+        raise ValueError("Graph contains cycles.")
+
+
+def _peel(parent_indices, counts):
+    """
+    Peel childless nodes, ignoring order, and return the remaining children
+    counts. Nodes with nonzero counts lie on or above a cycle.
+    """
+    ready = [i for i, count in enumerate(counts) if not count]
+    while ready:
+        for j in parent_indices[ready.pop()]:
+            counts[j] -= 1
+            if not counts[j]:
+                ready.append(j)
+    return counts
 
 
 class DependencyGraph:
@@ -29,23 +91,120 @@ class DependencyGraph:
         >>> list(graph)
         ['D', 'E', 'F', 'C', 'A', 'B']
 
+    ::
+
+        >>> [sorted(level) for level in graph.iter_levels()]
+        [['D', 'E', 'F'], ['C'], ['A'], ['B']]
+
     ::
 
         >>> graph.add('A', parent='F')
         >>> graph.is_acyclic()
         False
 
+    ::
+
+        >>> graph.find_cycle()
+        ['A', 'C', 'F']
+
+    Iteration, levels and cycle detection peel the graph by counting each
+    node's remaining children, in time linear in the number of nodes and
+    edges. Parents and children are kept in insertion-ordered dictionaries,
+    so adding or removing an edge takes constant time however many
+    neighbors a node has.
+
+    Strict graphs reject any edge which would close a cycle, as it is added:
+
+    ::
+
+        >>> graph = uqbar.containers.DependencyGraph(strict=True)
+        >>> graph.add('A', parent='B')
+        >>> graph.add('B', parent='C')
+        >>> graph.add('C', parent='A')
+        Traceback (most recent call last):
+            ...
+        ValueError: Adding 'C' as a child of 'A' would create a cycle.
+
+    ::
+
+        >>> graph['C']
+        (frozenset(), frozenset({'B'}))
+
+    They maintain a topological order of their nodes, repairing only the
+    region between an edge's endpoints when an edge contradicts it, after
+    Pearce and Kelly's dynamic topological sort.
+
+    Reachability is queried with :py:meth:`ancestors`,
+    :py:meth:`descendants` and :py:meth:`depth`:
+
+    ::
+
+        >>> graph = uqbar.containers.DependencyGraph(cached=True)
+        >>> graph.add('A', parent='B')
+        >>> graph.add('B', parent='C')
+        >>> graph.add('A', parent='C')
+        >>> sorted(graph.ancestors('A'))
+        ['B', 'C']
+
+    ::
+
+        >>> sorted(graph.descendants('C')), graph.depth('A')
+        (['A', 'B'], 2)
+
+    ::
+
+        >>> graph.transitive_reduction().parents('A')
+        frozenset({'B'})
+
+    Cached graphs memoize every node's ancestors, descendants and depth as
+    they are computed, and discard them whenever the graph changes.
+
+    :param strict: whether to reject cycle-creating edges in :py:meth:`add`
+    :param cached: whether to memoize reachability queries
     """
 
     ### CLASS VARIABLES ###
 
-    __slots__ = ("_parents_to_children", "_children_to_parents")
+    __slots__ = (
+        "_children_to_parents",
+        "_closures",
+        "_order",
+        "_order_maximum",
+        "_order_minimum",
+        "_parents_to_children",
+    )
+
+    ### INNER CLASSES ###
+
+    @dataclasses.dataclass(frozen=True)
+    class Execution:
+        """
+        The outcome of calling a function on one node during
+        :py:meth:`~uqbar.containers.DependencyGraph.execute`.
+
+        ``status`` is one of ``"finished"``, ``"failed"`` or ``"cancelled"``.
+        ``elapsed_time`` is measured in the worker, in seconds, and is ``None``
+        for cancelled nodes.
+        """
+
+        node: Hashable
+        status: str
+        result: Any = None
+        exception: Optional[BaseException] = None
+        elapsed_time: Optional[float] = None
 
     ### INITIALIZER ###
 
-    def __init__(self):
+    def __init__(self, strict=False, cached=False):
         self._parents_to_children = collections.OrderedDict()
         self._children_to_parents = collections.OrderedDict()
+        self._closures = (
+            {"ancestors": {}, "depth": {}, "descendants": {}} if cached else None
+        )
+        # Strict graphs rank every node so that children rank below parents.
+        self._order = {} if strict else None
+        self._order_maximum = 0
+        self._order_minimum = 0
 
     ### SPECIAL METHODS ###
 
@@ -64,26 +223,185 @@ class DependencyGraph:
         return parents, children
 
     def __iter__(self):
-        trellis = self.copy()
-        while len(trellis):
-            yield trellis.pop()
+        yield from _iterate(*self._prepare_peel())
 
     def __len__(self):
         return len(self._parents_to_children)
 
+    ### PRIVATE METHODS ###
+
+    def _closure(self, expr, mapping, cache):
+        """
+        Collect the nodes reachable from ``expr`` through ``mapping``.
+
+        With a cache, closures are computed bottom-up in depth-first
+        post-order and memoized for every node visited along the way.
+        """
+        if expr not in self:
+            raise ValueError("{!r} not in {}".format(expr, type(self)))
+        if cache is not None:
+            if expr in cache:
+                return cache[expr]
+            cyclic, path, stack = False, {expr}, [(expr, iter(mapping[expr]))]
+            while stack and not cyclic:
+                node, neighbors = stack[-1]
+                for neighbor in neighbors:
+                    if neighbor in cache:
+                        continue
+                    if neighbor in path:
+                        # Nodes on a cycle share their closure; search below.
+                        cyclic = True
+                    else:
+                        path.add(neighbor)
+                        stack.append((neighbor, iter(mapping[neighbor])))
+                    break
+                else:
+                    stack.pop()
+                    path.remove(node)
+                    closure = set(mapping[node])
+                    for neighbor in mapping[node]:
+                        closure.update(cache[neighbor])
+                    cache[node] = frozenset(closure)
+            if not cyclic:
+                return cache[expr]
+        closure, stack = set(), [expr]
+        while stack:
+            for neighbor in mapping[stack.pop()]:
+                if neighbor not in closure:
+                    closure.add(neighbor)
+                    stack.append(neighbor)
+        return frozenset(closure)
+
+    def _invalidate_closures(self):
+        if self._closures is not None:
+            for cache in self._closures.values():
+                cache.clear()
+
+    def _insert_order(self, child, parent):
+        """
+        Rank ``child`` and ``parent`` before the edge between them is added,
+        raising ``ValueError`` if the edge would close a cycle.
+        """
+        order = self._order
+        if parent is not None:
+            if parent == child:
+                raise ValueError(
+                    "Adding {!r} as a child of {!r} would create a cycle.".format(
+                        child, parent
+                    )
+                )
+            # New parents rank highest and new children lowest, so edges
+            # touching a new node never need reordering.
+            if parent not in order:
+                self._order_maximum += 1
+                order[parent] = self._order_maximum
+        if child not in order:
+            self._order_minimum -= 1
+            order[child] = self._order_minimum
+        if parent is None or order[child] < order[parent]:
+            return
+        lower, upper = order[parent], order[child]
+        # Search up from the parent through nodes ranked below the child. If
+        # the child is reached, it is already an ancestor of the parent.
+        ancestors, stack = {parent}, [parent]
+        while stack:
+            for node in self._children_to_parents[stack.pop()]:
+                if node == child:
+                    raise ValueError(
+                        "Adding {!r} as a child of {!r} would create a cycle.".format(
+                            child, parent
+                        )
+                    )
+                if node not in ancestors and order[node] < upper:
+                    ancestors.add(node)
+                    stack.append(node)
+        # Search down from the child through nodes ranked above the parent.
+        descendants, stack = {child}, [child]
+        while stack:
+            for node in self._parents_to_children[stack.pop()]:
+                if node not in descendants and lower < order[node]:
+                    descendants.add(node)
+                    stack.append(node)
+        # Reuse the affected ranks, placing the descendants below the
+        # ancestors while keeping each group's relative order.
+        nodes = sorted(descendants, key=order.__getitem__)
+        nodes.extend(sorted(ancestors, key=order.__getitem__))
+        for node, rank in zip(nodes, sorted(order[node] for node in nodes)):
+            order[node] = rank
+
+    def _prepare_peel(self):
+        """
+        Snapshot the graph as insertion-ordered nodes, the indices of each
+        node's parents, and each node's number of children.
+        """
+        nodes = list(self._parents_to_children)
+        indices = {node: i for i, node in enumerate(nodes)}
+        parent_indices = [
+            [indices[parent] for parent in self._children_to_parents[node]]
+            for node in nodes
+        ]
+        counts = [len(self._parents_to_children[node]) for node in nodes]
+        return nodes, parent_indices, counts
+
     ### PUBLIC METHODS ###
 
     def add(self, child, parent=None):
+        if self._order is not None:
+            self._insert_order(child, parent)
+        self._invalidate_closures()
         if parent is not None and parent not in self:
             self.add(parent)
-        self._parents_to_children.setdefault(child, [])
-        parents = self._children_to_parents.setdefault(child, [])
+        self._parents_to_children.setdefault(child, {})
+        parents = self._children_to_parents.setdefault(child, {})
         if parent is not None:
-            if parent not in parents:
-                parents.append(parent)
-            children = self._parents_to_children[parent]
-            if child not in children:
-                children.append(child)
+            parents[parent] = None
+            self._parents_to_children[parent][child] = None
+
+    def add_edges(self, edges):
+        """
+        Add many ``(child, parent)`` pairs at once.
+
+        Equivalent to calling :py:meth:`add` on each pair, but without the
+        per-call overhead. A ``None`` parent adds the child alone.
+
+        ::
+
+            >>> import uqbar.containers
+            >>> graph = uqbar.containers.DependencyGraph()
+            >>> graph.add_edges([('A', 'B'), ('C', 'A'), ('C', 'B'), ('D', None)])
+            >>> list(graph)
+            ['C', 'A', 'B', 'D']
+
+        """
+        if self._order is not None:
+            for child, parent in edges:
+                self.add(child, parent=parent)
+            return
+        self._invalidate_closures()
+        parents_to_children = self._parents_to_children
+        children_to_parents = self._children_to_parents
+        for child, parent in edges:
+            if parent is not None:
+                children = parents_to_children.get(parent)
+                if children is None:
+                    children = parents_to_children[parent] = {}
+                    children_to_parents[parent] = {}
+                children[child] = None
+            parents = children_to_parents.get(child)
+            if parents is None:
+                parents = children_to_parents[child] = {}
+                parents_to_children[child] = {}
+            if parent is not None:
+                parents[parent] = None
+
+    def ancestors(self, expr):
+        """
+        Get the nodes reachable from ``expr`` through its parents.
+
+        ``expr`` is only included if it lies on a cycle.
+        """
+        cache = self._closures["ancestors"] if self._closures is not None else None
+        return self._closure(expr, self._children_to_parents, cache)
 
     def children(self, expr):
         if expr not in self:
@@ -91,23 +409,222 @@ class DependencyGraph:
         return frozenset(self._parents_to_children[expr])
 
     def copy(self):
-        copied = type(self)()
+        copied = type(self)(strict=self.strict, cached=self.cached)
+        if self._order is not None:
+            copied._order = self._order.copy()
+            copied._order_maximum = self._order_maximum
+            copied._order_minimum = self._order_minimum
         copied._parents_to_children = self._parents_to_children.copy()
         for parent, children in copied._parents_to_children.items():
-            copied._parents_to_children[parent] = list(children)
+            copied._parents_to_children[parent] = children.copy()
         copied._children_to_parents = self._children_to_parents.copy()
         for child, parents in copied._children_to_parents.items():
-            copied._children_to_parents[child] = list(parents)
+            copied._children_to_parents[child] = parents.copy()
         return copied
 
+    def depth(self, expr):
+        """
+        Get the number of edges on the longest path from ``expr`` up to a node
+        without parents.
+
+        Raises ``ValueError`` if ``expr`` has a cycle among its ancestors.
+        """
+        if expr not in self:
+            raise ValueError("{!r} not in {}".format(expr, type(self)))
+        depths = self._closures["depth"] if self._closures is not None else {}
+        if expr in depths:
+            return depths[expr]
+        mapping = self._children_to_parents
+        path, stack = {expr}, [(expr, iter(mapping[expr]))]
+        while stack:
+            node, parents = stack[-1]
+            for parent in parents:
+                if parent in depths:
+                    continue
+                if parent in path:
+                    raise ValueError("Graph contains cycles.")
+                path.add(parent)
+                stack.append((parent, iter(mapping[parent])))
+                break
+            else:
+                stack.pop()
+                path.remove(node)
+                depths[node] = max(
+                    (depths[parent] + 1 for parent in mapping[node]), default=0
+                )
+        return depths[expr]
+
+    def descendants(self, expr):
+        """
+        Get the nodes reachable from ``expr`` through its children.
+
+        ``expr`` is only included if it lies on a cycle.
+        """
+        cache = self._closures["descendants"] if self._closures is not None else None
+        return self._closure(expr, self._parents_to_children, cache)
+
+    def execute(
+        self,
+        function,
+        max_workers=None,
+        use_processes=False,
+        cancel_on_failure=True,
+        return_exceptions=False,
+    ):
+        """
+        Call ``function`` on every node, concurrently, in dependency order.
+
+        A node is submitted to the pool as soon as all of its children have
+        finished, so independent branches never wait on one another.
+
+        ::
+
+            >>> import uqbar.containers
+            >>> graph = uqbar.containers.DependencyGraph()
+            >>> graph.add('a', parent='b')
+            >>> graph.add('c', parent='b')
+            >>> executions = graph.execute(str.upper, max_workers=2)
+            >>> list(executions)[-1]
+            'b'
+
+        ::
+
+            >>> for node, execution in sorted(executions.items()):
+            ...     print(node, execution.status, execution.result)
+            ...
+            a finished A
+            b finished B
+            c finished C
+
+        When ``function`` raises, pending nodes are cancelled if
+        ``cancel_on_failure`` is true. Otherwise only the failed node's
+        ancestors are cancelled and independent nodes keep running. Once
+        running calls have finished the first exception is re-raised, unless
+        ``return_exceptions`` is true.
+
+        :param function: a callable taking a node; must be picklable when
+            ``use_processes`` is true
+        :param max_workers: the pool size, defaulting to the pool's own default
+        :param use_processes: whether to use a process pool instead of threads
+        :param cancel_on_failure: whether to cancel all pending nodes on the
+            first failure
+        :param return_exceptions: whether to return failures rather than raise
+        :returns: a dictionary of nodes to
+            :py:class:`~uqbar.containers.DependencyGraph.Execution` records, in
+            the order the nodes completed, followed by any cancelled nodes
+
+        Raises ``ValueError`` if the graph contains cycles.
+        """
+        if not self.is_acyclic():
+            raise ValueError("Graph contains cycles.")
+        nodes, parent_indices, counts = self._prepare_peel()
+        executions = {}
+        failures = []
+        blocked = set()
+        pending = {}
+        if use_processes:
+            executor_class = concurrent.futures.ProcessPoolExecutor
+        else:
+            executor_class = concurrent.futures.ThreadPoolExecutor
+        with executor_class(max_workers=max_workers) as executor:
+
+            def submit(i):
+                future = executor.submit(_call_timed, function, nodes[i])
+                pending[future] = i
+
+            for i, count in enumerate(counts):
+                if not count:
+                    submit(i)
+            while pending:
+                done, _ = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for i, future in sorted((pending.pop(_), _) for _ in done):
+                    node = nodes[i]
+                    if future.cancelled():
+                        continue
+                    try:
+                        result, exception, elapsed_time = future.result()
+                    except Exception as caught:
+                        # The pool itself failed, e.g. an unpicklable result.
+                        result, exception, elapsed_time = None, caught, None
+                    if exception is None:
+                        executions[node] = self.Execution(
+                            node, "finished", result, None, elapsed_time
+                        )
+                    else:
+                        executions[node] = self.Execution(
+                            node, "failed", None, exception, elapsed_time
+                        )
+                        failures.append(exception)
+                        if cancel_on_failure:
+                            for other_future in pending:
+                                other_future.cancel()
+                        else:
+                            stack = [i]
+                            while stack:
+                                for j in parent_indices[stack.pop()]:
+                                    if j not in blocked:
+                                        blocked.add(j)
+                                        stack.append(j)
+                        continue
+                    for j in parent_indices[i]:
+                        counts[j] -= 1
+                        if counts[j] or j in blocked:
+                            continue
+                        if failures and cancel_on_failure:
+                            continue
+                        submit(j)
+        for node in nodes:
+            if node not in executions:
+                executions[node] = self.Execution(node, "cancelled")
+        if failures and not return_exceptions:
+            raise failures[0]
+        return executions
+
+    def find_cycle(self):
+        """
+        Find a cycle, as a list of nodes each of which is a parent of the
+        next, the last being a parent of the first.
+
+        Returns ``None`` if the graph is acyclic.
+        """
+        if self._order is not None:
+            return None
+        nodes, parent_indices, counts = self._prepare_peel()
+        counts = _peel(parent_indices, counts)
+        remaining = set(node for node, count in zip(nodes, counts) if count)
+        if not remaining:
+            return None
+        # Every remaining node has a remaining child, so walking children
+        # must eventually revisit a node.
+        path, positions = [], {}
+        node = next(node for node, count in zip(nodes, counts) if count)
+        while node not in positions:
+            positions[node] = len(path)
+            path.append(node)
+            node = next(
+                child for child in self._parents_to_children[node] if child in remaining
+            )
+        return path[positions[node] :]
+
     def is_acyclic(self):
-        trellis = self.copy()
-        while len(trellis):
-            try:
-                trellis.pop()
-            except ValueError:
-                return False
-        return True
+        if self._order is not None:
+            return True
+        _, parent_indices, counts = self._prepare_peel()
+        counts = _peel(parent_indices, counts)
+        return not any(counts)
+
+    def iter_levels(self):
+        """
+        Iterate the graph as frozensets of nodes which may be processed
+        together.
+
+        Each level holds the nodes whose children all appear in earlier levels.
+
+        Raises ``ValueError`` if the graph contains cycles.
+        """
+        yield from _iterate_levels(*self._prepare_peel())
 
     def parents(self, expr):
         if expr not in self:
@@ -129,7 +646,432 @@ class DependencyGraph:
     def remove(self, expr):
         if expr not in self:
             raise ValueError("{!r} not in {}".format(expr, type(self)))
+        self._invalidate_closures()
         for child in self._parents_to_children.pop(expr):
-            self._children_to_parents[child].remove(expr)
+            del self._children_to_parents[child][expr]
         for parent in self._children_to_parents.pop(expr):
-            self._parents_to_children[parent].remove(expr)
+            del self._parents_to_children[parent][expr]
+        if self._order is not None:
+            del self._order[expr]
+
+    def transitive_reduction(self):
+        """
+        Copy the graph without any edge whose parent is also reachable from
+        its child along a longer path.
+
+        Raises ``ValueError`` if the graph contains cycles.
+        """
+        reduced = self.copy()
+        ancestors = {}
+        # Reversed iteration visits every parent before its children.
+        for node in reversed(list(self)):
+            parents = self._children_to_parents[node]
+            indirect = set()
+            for parent in parents:
+                indirect.update(ancestors[parent])
+            for parent in parents:
+                if parent in indirect:
+                    del reduced._children_to_parents[node][parent]
+                    del reduced._parents_to_children[parent][node]
+            ancestors[node] = indirect.union(parents)
+        return reduced
+
+    def update(self, graph):
+        """
+        Add every node and edge of another graph, in its insertion order.
+
+        ::
+
+            >>> import uqbar.containers
+            >>> graph = uqbar.containers.DependencyGraph()
+            >>> graph.add('A', parent='B')
+            >>> other = uqbar.containers.DependencyGraph()
+            >>> other.add('B', parent='C')
+            >>> other.add('D')
+            >>> graph.update(other)
+            >>> list(graph)
+            ['A', 'B', 'C', 'D']
+
+        """
+        if self._order is not None:
+            self.add_edges((node, None) for node in graph._parents_to_children)
+            self.add_edges(
+                (child, parent)
+                for child, parents in graph._children_to_parents.items()
+                for parent in parents
+            )
+            return
+        self._invalidate_closures()
+        parents_to_children = self._parents_to_children
+        children_to_parents = self._children_to_parents
+        for node in graph._parents_to_children:
+            if node not in parents_to_children:
+                parents_to_children[node] = {}
+                children_to_parents[node] = {}
+        for child, parents in graph._children_to_parents.items():
+            children_to_parents[child].update(parents)
+            for parent in parents:
+                parents_to_children[parent][child] = None
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def cached(self):
+        return self._closures is not None
+
+    @property
+    def strict(self):
+        return self._order is not None
+
+
+class CompactDependencyGraph:
+    """
+    A dependency graph of hashables, stored as integer arrays.
+
+    Nodes are interned to dense integer IDs in insertion order, and edges are
+    stored in compressed sparse row (CSR) form: each node's parents (or
+    children) are a contiguous run of IDs in one flat array, located by an
+    offsets array. Iteration order matches
+    :py:class:`~uqbar.containers.DependencyGraph`.
+
+    ::
+
+        >>> import uqbar.containers
+        >>> graph = uqbar.containers.CompactDependencyGraph()
+        >>> graph.add('A', parent='B')
+        >>> graph.add('C', parent='A')
+        >>> graph.add('C', parent='B')
+        >>> graph.add('D', parent='C')
+        >>> graph.add('E')
+        >>> graph.add('F', parent='B')
+        >>> graph.add('F', parent='C')
+
+    ::
+
+        >>> list(graph)
+        ['D', 'E', 'F', 'C', 'A', 'B']
+
+    ::
+
+        >>> sorted(graph.parents('F'))
+        ['B', 'C']
+
+    Edges added since the last read are buffered and merged into the arrays
+    on the next read, so the compact backend suits graphs which are loaded
+    in bulk and then queried. Frozen graphs reject further edges, and can be
+    pickled, or written to a file and memory-mapped back without copying
+    their arrays:
+
+    ::
+
+        >>> import os, tempfile
+        >>> graph.freeze()
+        >>> with tempfile.TemporaryDirectory() as directory:
+        ...     path = os.path.join(directory, 'graph.bin')
+        ...     graph.write(path)
+        ...     mapped_graph = uqbar.containers.CompactDependencyGraph.read(path)
+        ...     print(list(mapped_graph))
+        ...     mapped_graph.release()
+        ...
+        ['D', 'E', 'F', 'C', 'A', 'B']
+
+    The arrays support the buffer protocol, and can be wrapped by NumPy with
+    ``numpy.frombuffer()``.
+    """
+
+    ### CLASS VARIABLES ###
+
+    __slots__ = (
+        "_child_offsets",
+        "_child_targets",
+        "_edges",
+        "_frozen",
+        "_indices",
+        "_mapping",
+        "_nodes",
+        "_parent_offsets",
+        "_parent_targets",
+    )
+
+    _header = struct.Struct("=4sQQQ")
+
+    _magic = b"UQDG"
+
+    ### INITIALIZER ###
+
+    def __init__(self):
+        self._nodes = []
+        self._indices = {}
+        self._edges = array("q")
+        self._frozen = False
+        self._mapping = None
+        self._parent_offsets = array("q", [0])
+        self._parent_targets = array("q")
+        self._child_offsets = array("q", [0])
+        self._child_targets = array("q")
+
+    ### SPECIAL METHODS ###
+
+    def __contains__(self, expr):
+        return expr in self._indices
+
+    def __getitem__(self, expr):
+        return self.parents(expr), self.children(expr)
+
+    def __getstate__(self):
+        self._build()
+        arrays = []
+        for buffer in (
+            self._parent_offsets,
+            self._parent_targets,
+            self._child_offsets,
+            self._child_targets,
+        ):
+            if not isinstance(buffer, array):
+                # Memory-mapped views pickle as plain arrays.
+                buffer, view = array("q"), buffer
+                buffer.frombytes(view.cast("B"))
+            arrays.append(buffer)
+        return (self._nodes, self._frozen, *arrays)
+
+    def __iter__(self):
+        yield from _iterate(*self._prepare_peel())
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __setstate__(self, state):
+        nodes, frozen, *arrays = state
+        self._nodes = list(nodes)
+        self._indices = {node: i for i, node in enumerate(self._nodes)}
+        self._edges = array("q")
+        self._frozen = frozen
+        self._mapping = None
+        (
+            self._parent_offsets,
+            self._parent_targets,
+            self._child_offsets,
+            self._child_targets,
+        ) = arrays
+
+    ### PRIVATE METHODS ###
+
+    def _build(self):
+        """
+        Merge any buffered edges into the CSR arrays.
+        """
+        if not self._edges and len(self._parent_offsets) == len(self._nodes) + 1:
+            return
+        parents = self._rows(self._parent_offsets, self._parent_targets)
+        children = self._rows(self._child_offsets, self._child_targets)
+        edges = self._edges
+        for child, parent in zip(edges[::2], edges[1::2]):
+            parents[child].append(parent)
+            children[parent].append(child)
+        (
+            self._parent_offsets,
+            self._parent_targets,
+        ) = self._pack(parents)
+        self._child_offsets, self._child_targets = self._pack(children)
+        self._edges = array("q")
+
+    def _index(self, expr):
+        try:
+            return self._indices[expr]
+        except KeyError:
+            raise ValueError("{!r} not in {}".format(expr, type(self)))
+
+    def _intern(self, expr):
+        index = self._indices.get(expr)
+        if index is None:
+            index = self._indices[expr] = len(self._nodes)
+            self._nodes.append(expr)
+        return index
+
+    def _pack(self, rows):
+        offsets, targets = array("q", [0]), array("q")
+        for row in rows:
+            if len(row) > 1:
+                row = dict.fromkeys(row)
+            targets.extend(row)
+            offsets.append(len(targets))
+        return offsets, targets
+
+    def _prepare_peel(self):
+        self._build()
+        offsets, targets = self._parent_offsets, self._parent_targets
+        parent_indices = [
+            targets[start:stop] for start, stop in zip(offsets, offsets[1:])
+        ]
+        offsets = self._child_offsets
+        counts = [stop - start for start, stop in zip(offsets, offsets[1:])]
+        return list(self._nodes), parent_indices, counts
+
+    def _rows(self, offsets, targets):
+        rows = [list(targets[start:stop]) for start, stop in zip(offsets, offsets[1:])]
+        rows.extend([] for _ in range(len(self._nodes) - len(rows)))
+        return rows
+
+    ### PUBLIC METHODS ###
+
+    def add(self, child, parent=None):
+        if self._frozen:
+            raise TypeError("{} is frozen.".format(type(self).__name__))
+        if parent is not None:
+            parent_index = self._intern(parent)
+        child_index = self._intern(child)
+        if parent is not None:
+            self._edges.append(child_index)
+            self._edges.append(parent_index)
+
+    def add_edges(self, edges):
+        """
+        Add many ``(child, parent)`` pairs at once.
+        """
+        for child, parent in edges:
+            self.add(child, parent=parent)
+
+    def children(self, expr):
+        index = self._index(expr)
+        self._build()
+        offsets = self._child_offsets
+        nodes = self._nodes
+        return frozenset(
+            nodes[i] for i in self._child_targets[offsets[index] : offsets[index + 1]]
+        )
+
+    def freeze(self):
+        """
+        Merge buffered edges and reject any further additions.
+        """
+        self._build()
+        self._frozen = True
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Create a compact copy of a :py:class:`~uqbar.containers.DependencyGraph`.
+        """
+        compact_graph = cls()
+        nodes = compact_graph._nodes = list(graph._parents_to_children)
+        indices = compact_graph._indices = {node: i for i, node in enumerate(nodes)}
+        for attributes, mapping in [
+            (("_parent_offsets", "_parent_targets"), graph._children_to_parents),
+            (("_child_offsets", "_child_targets"), graph._parents_to_children),
+        ]:
+            targets = array("q", (indices[_] for node in nodes for _ in mapping[node]))
+            offsets = array("q", [0])
+            offsets.extend(itertools.accumulate(len(mapping[node]) for node in nodes))
+            for attribute, buffer in zip(attributes, (offsets, targets)):
+                setattr(compact_graph, attribute, buffer)
+        return compact_graph
+
+    def is_acyclic(self):
+        _, parent_indices, counts = self._prepare_peel()
+        return not any(_peel(parent_indices, counts))
+
+    def iter_levels(self):
+        """
+        Iterate the graph as frozensets of nodes which may be processed
+        together, as :py:meth:`~uqbar.containers.DependencyGraph.iter_levels`.
+        """
+        yield from _iterate_levels(*self._prepare_peel())
+
+    def parents(self, expr):
+        index = self._index(expr)
+        self._build()
+        offsets = self._parent_offsets
+        nodes = self._nodes
+        return frozenset(
+            nodes[i] for i in self._parent_targets[offsets[index] : offsets[index + 1]]
+        )
+
+    @classmethod
+    def read(cls, path, memory_map=True):
+        """
+        Read a frozen graph written by :py:meth:`write`.
+
+        The arrays are memory-mapped read-only unless ``memory_map`` is false,
+        in which case the file is read into memory. Call :py:meth:`release` to
+        close a memory-mapped file before discarding the graph.
+        """
+        with open(path, "rb") as file_pointer:
+            if memory_map:
+                buffer = mmap.mmap(file_pointer.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buffer = file_pointer.read()
+        magic, node_count, edge_count, nodes_size = cls._header.unpack_from(buffer)
+        if magic != cls._magic:
+            if memory_map:
+                buffer.close()
+            raise ValueError("{} is not a compact dependency graph.".format(path))
+        offset = cls._header.size
+        nodes = pickle.loads(buffer[offset : offset + nodes_size])
+        offset += nodes_size + -(offset + nodes_size) % 8
+        view = memoryview(buffer)
+        arrays = []
+        for length in (node_count + 1, edge_count, node_count + 1, edge_count):
+            arrays.append(view[offset : offset + length * 8].cast("q"))
+            offset += length * 8
+        graph = cls.__new__(cls)
+        graph.__setstate__((nodes, True, *arrays))
+        if memory_map:
+            graph._mapping = buffer
+        return graph
+
+    def release(self):
+        """
+        Close a graph's memory-mapped file, leaving the graph empty.
+        """
+        mapping = self._mapping
+        if mapping is None:
+            return
+        self.__init__()
+        self._frozen = True
+        mapping.close()
+
+    def to_graph(self):
+        """
+        Create a :py:class:`~uqbar.containers.DependencyGraph` copy.
+        """
+        self._build()
+        graph = DependencyGraph()
+        nodes = self._nodes
+        for attribute, offsets, targets in [
+            ("_children_to_parents", self._parent_offsets, self._parent_targets),
+            ("_parents_to_children", self._child_offsets, self._child_targets),
+        ]:
+            mapping = getattr(graph, attribute)
+            for node, start, stop in zip(nodes, offsets, offsets[1:]):
+                mapping[node] = dict.fromkeys(nodes[i] for i in targets[start:stop])
+        return graph
+
+    def write(self, path):
+        """
+        Write the graph's arrays to ``path``, for use with :py:meth:`read`.
+
+        Arrays are written in native byte order.
+        """
+        self._build()
+        nodes = pickle.dumps(self._nodes, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(path, "wb") as file_pointer:
+            file_pointer.write(
+                self._header.pack(
+                    self._magic, len(self._nodes), len(self._parent_targets), len(nodes)
+                )
+            )
+            file_pointer.write(nodes)
+            file_pointer.write(bytes(-(self._header.size + len(nodes)) % 8))
+            for buffer in (
+                self._parent_offsets,
+                self._parent_targets,
+                self._child_offsets,
+                self._child_targets,
+            ):
+                file_pointer.write(buffer)
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def frozen(self):
+        return self._frozen
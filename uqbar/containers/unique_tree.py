@@ -1,11 +1,10 @@
 import collections
-import copy
+import contextlib
+import sys
 import threading
 import typing
 from typing import Optional
 
-from ..iterables import nwise
-
 
 class UniqueTreeNode:
     """
@@ -13,10 +12,25 @@ class UniqueTreeNode:
 
     Unique tree nodes may have at most one parent and may appear only once in
     the tree.
+
+    Unique tree classes define ``__slots__``, so their own attributes are
+    stored compactly. Instances still accept ad-hoc attributes, in a
+    ``__dict__`` which is only allocated once one is set.
     """
 
     ### CLASS VARIABLES ###
 
+    __slots__ = (
+        "__dict__",
+        "__weakref__",
+        "_cached_graph_order",
+        "_cached_parentage",
+        "_cached_snapshot",
+        "_concurrent",
+        "_name",
+        "_parent",
+    )
+
     _state_flag_names: typing.Tuple[str, ...] = ()
 
     ### INITIALIZER ###
@@ -24,6 +38,29 @@ class UniqueTreeNode:
     def __init__(self, name: Optional[str] = None) -> None:
         self._name = name
         self._parent = None
+        self._cached_graph_order: Optional[typing.Tuple[int, ...]] = None
+        self._cached_parentage: Optional[typing.Tuple["UniqueTreeNode", ...]] = None
+        self._cached_snapshot: Optional["UniqueTreeSnapshot"] = None
+        self._concurrent = False
+
+    ### SPECIAL METHODS ###
+
+    def __getstate__(self):
+        state = {}
+        for class_ in type(self).__mro__:
+            for name in class_.__dict__.get("__slots__", ()):
+                if name not in ("__dict__", "__weakref__") and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        state.update(getattr(self, "__dict__", {}))
+        # Cached state refers to the original nodes, so copies recompute it.
+        state["_cached_graph_order"] = None
+        state["_cached_parentage"] = None
+        state["_cached_snapshot"] = None
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
 
     ### PRIVATE METHODS ###
 
@@ -41,6 +78,29 @@ class UniqueTreeNode:
                 for y in cls._iterate_nodes(x):
                     yield y
 
+    def _find_root(self):
+        node = self
+        while node._parent is not None:
+            node = node._parent
+        return node
+
+    def _get_child_nodes(self):
+        return ()
+
+    def _mark_concurrent(self):
+        """
+        Flag this node and its descendants as belonging to a concurrent tree.
+
+        Every node in a concurrent tree is flagged, so the walk stops at nodes
+        already flagged.
+        """
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            if not node._concurrent:
+                node._concurrent = True
+                nodes.extend(node._get_child_nodes())
+
     def _get_node_state_flags(self):
         state_flags = {}
         for name in self._state_flag_names:
@@ -51,47 +111,141 @@ class UniqueTreeNode:
                     break
         return state_flags
 
+    def _invalidate_snapshot(self):
+        """
+        Drop the cached snapshots of this node and its ancestors.
+
+        Snapshots are built bottom-up, so an ancestor's snapshot is only ever
+        cached if this node's is, and the walk stops at the first ancestor
+        without one.
+        """
+        node = self
+        while node is not None and node._cached_snapshot is not None:
+            node._cached_snapshot = None
+            node = node._parent
+
+    def _invalidate_cached_state(self, parentage=True):
+        """
+        Clear cached graph-order (and optionally parentage) for this node and
+        its descendants.
+
+        A node's cache is only ever populated after its parent's cache, so the
+        walk stops at any node whose cache is already empty.
+        """
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            if parentage:
+                if node._cached_parentage is None and node._cached_graph_order is None:
+                    continue
+                node._cached_parentage = None
+            elif node._cached_graph_order is None:
+                continue
+            node._cached_graph_order = None
+            nodes.extend(node._get_child_nodes())
+
+    @contextlib.contextmanager
+    def _lock_trees(self, nodes=()):
+        """
+        Hold the locks of this node's tree and of the trees ``nodes`` belong
+        to, for those trees in concurrent mode.
+
+        Roots are guessed from cached parentage without filling any cache, then
+        re-checked by walking parent pointers once the locks are held, retrying
+        if a subtree moved between trees in the meantime. Locks are acquired in
+        a fixed order, so concurrent moves between two trees cannot deadlock.
+
+        Nodes which have never belonged to a concurrent tree skip all of this.
+        """
+        if not self._concurrent and not any(node._concurrent for node in nodes):
+            yield
+            return
+        while True:
+            guesses = []
+            locks = {}
+            for node in (self, *nodes):
+                parentage = node._cached_parentage
+                root = node._find_root() if parentage is None else parentage[-1]
+                lock = getattr(root, "_tree_lock", None)
+                guesses.append((node, root, lock))
+                if lock is not None:
+                    locks[id(lock)] = lock
+            if not locks:
+                yield
+                return
+            with contextlib.ExitStack() as stack:
+                for _, lock in sorted(locks.items()):
+                    stack.enter_context(lock)
+                if all(
+                    node._find_root() is root
+                    and getattr(root, "_tree_lock", None) is lock
+                    for node, root, lock in guesses
+                ):
+                    yield
+                    return
+
     def _mark_entire_tree_for_later_update(self):
-        for node in self.parentage:
+        if not self._state_flag_names:
+            return
+        parentage = self.parentage
+        for i, node in enumerate(parentage):
+            pending_updates = getattr(node, "_pending_updates", None)
+            if pending_updates is None:
+                continue
+            # Defer until the enclosing batch exits.
+            for pending_node in parentage[: i + 1]:
+                _, names = pending_updates.setdefault(
+                    id(pending_node), (pending_node, set())
+                )
+                names.update(self._state_flag_names)
+            return
+        for node in parentage:
             for name in self._state_flag_names:
                 setattr(node, name, False)
 
+    def _get_name_registry(self):
+        """
+        Get the root container whose name registry holds this node, or
+        ``None`` if this node has no parent.
+        """
+        if self._parent is None:
+            return None
+        return self.parentage[-1]
+
     def _remove_from_parent(self):
-        if self._parent is not None and self in self._parent:
-            self._parent._children.remove(self)
+        if self._parent is not None:
+            self._parent._invalidate_snapshot()
+            if self in self._parent:
+                self._parent._remove_child(self)
         self._parent = None
 
-    def _remove_named_children_from_parentage(self, old_parent, name_dictionary):
-        if old_parent is None or not name_dictionary:
-            return
-        for parent in old_parent.parentage:
-            named_children = parent._named_children
-            for name in name_dictionary:
-                for node in name_dictionary[name]:
-                    named_children[name].remove(node)
-                if not named_children[name]:
-                    del named_children[name]
-
-    def _restore_named_children_to_parentage(self, new_parent, name_dictionary):
-        if new_parent is None or not name_dictionary:
-            return
-        for parent in new_parent.parentage:
-            named_children = parent._named_children
-            for name in name_dictionary:
-                if name in named_children:
-                    named_children[name].update(name_dictionary[name])
+    def _reset_name_registry(self, name_dictionary=None):
+        pass
+
+    def _set_name(self, expr):
+        self._invalidate_snapshot()
+        old_name = self._name
+        registry = self._get_name_registry()
+        if registry is not None:
+            named_children = registry._named_children
+            registry._sorted_named_children.pop(old_name, None)
+            registry._sorted_named_children.pop(expr, None)
+            if old_name is not None:
+                named_children[old_name].remove(self)
+                if not named_children[old_name]:
+                    del named_children[old_name]
+            if expr is not None:
+                if expr not in named_children:
+                    named_children[expr] = set([self])
                 else:
-                    named_children[name] = copy.copy(name_dictionary[name])
+                    named_children[expr].add(self)
+        self._name = expr
 
     def _set_parent(self, new_parent):
-        old_parent = self._parent
-        named_children = self._cache_named_children()
-        self._remove_from_parent()
-        self._remove_named_children_from_parentage(old_parent, named_children)
-        self._parent = new_parent
-        self._restore_named_children_to_parentage(new_parent, named_children)
-        if new_parent is None:
-            self._mark_entire_tree_for_later_update()
+        if new_parent is not None:
+            new_parent._attach_children([self])
+        elif self._parent is not None:
+            self._parent._detach_children([self])
 
     ### PUBLIC PROPERTIES ###
 
@@ -131,14 +285,24 @@ class UniqueTreeNode:
             d (1, 1)
 
         """
-        graph_order = []
-        for parent, child in nwise(reversed(self.parentage)):
-            try:
-                index = parent.index(child)
-            except AttributeError:
-                index = 0
-            graph_order.append(index)
-        return tuple(graph_order)
+        if self._cached_graph_order is None:
+            uncached_nodes = []
+            node = self
+            while node is not None and node._cached_graph_order is None:
+                uncached_nodes.append(node)
+                node = node._parent
+            graph_order = () if node is None else node._cached_graph_order
+            for node in reversed(uncached_nodes):
+                parent = node._parent
+                if parent is not None:
+                    try:
+                        index = parent.index(node)
+                    except AttributeError:
+                        index = 0
+                    graph_order += (index,)
+                    parent._children_graph_ordered = True
+                node._cached_graph_order = graph_order
+        return self._cached_graph_order
 
     @property
     def name(self):
@@ -147,19 +311,8 @@ class UniqueTreeNode:
     @name.setter
     def name(self, expr):
         assert isinstance(expr, (str, type(None)))
-        old_name = self._name
-        for parent in self.parentage[1:]:
-            named_children = parent._named_children
-            if old_name is not None:
-                named_children[old_name].remove(self)
-                if not named_children[old_name]:
-                    del named_children[old_name]
-            if expr is not None:
-                if expr not in named_children:
-                    named_children[expr] = set([self])
-                else:
-                    named_children[expr].add(self)
-        self._name = expr
+        with self._lock_trees():
+            self._set_name(expr)
 
     @property
     def parent(self):
@@ -167,12 +320,17 @@ class UniqueTreeNode:
 
     @property
     def parentage(self):
-        parentage = []
-        node = self
-        while node is not None:
-            parentage.append(node)
-            node = getattr(node, "parent", None)
-        return tuple(parentage)
+        if self._cached_parentage is None:
+            uncached_nodes = []
+            node = self
+            while node is not None and node._cached_parentage is None:
+                uncached_nodes.append(node)
+                node = node._parent
+            parentage = () if node is None else node._cached_parentage
+            for node in reversed(uncached_nodes):
+                parentage = (node,) + parentage
+                node._cached_parentage = parentage
+        return self._cached_parentage
 
     @property
     def root(self):
@@ -183,22 +341,61 @@ class UniqueTreeNode:
 
 
 class UniqueTreeContainer(UniqueTreeNode):
+    """
+    A container node in a "unique" tree.
+
+    Names are registered only on the root container of each tree, which maps
+    every name to the set of descendants bearing it. Containers below the root
+    answer named lookups by filtering the root's registry through a lazily-built
+    table of pre-order intervals, so moving a subtree costs time proportional to
+    the subtree rather than to its names times its depth.
+
+    Trees are not thread-safe by default. See :py:meth:`enable_concurrency`.
+    """
+
+    ### CLASS VARIABLES ###
+
+    __slots__ = (
+        "_children_graph_ordered",
+        "_descendant_intervals",
+        "_named_children",
+        "_pending_updates",
+        "_sorted_named_children",
+        "_tree_lock",
+    )
+
     ### INITIALIZER ###
 
     def __init__(self, children=None, name=None):
         UniqueTreeNode.__init__(self, name=name)
+        self._children_graph_ordered = False
+        self._descendant_intervals = None
         self._named_children = {}
+        self._pending_updates = None
+        self._sorted_named_children = {}
+        self._tree_lock = None
 
     ### SPECIAL METHODS ###
 
     def __contains__(self, expr):
         if isinstance(expr, str):
-            return expr in self._named_children
+            return self._has_named_descendant(expr)
         for x in self._children:
             if x is expr:
                 return True
         return False
 
+    def __getstate__(self):
+        state = super().__getstate__()
+        # Positions are keyed by identity, so copies must renumber.
+        state["_descendant_intervals"] = None
+        state["_sorted_named_children"] = {}
+        state["_tree_lock"] = self._tree_lock is not None
+        if "_child_positions" in state:
+            state["_child_positions"] = {}
+            state["_numbered_child_count"] = 0
+        return state
+
     def __iter__(self):
         for child in self._children:
             yield child
@@ -206,15 +403,297 @@ class UniqueTreeContainer(UniqueTreeNode):
     def __len__(self):
         return len(self._children)
 
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        # Locks cannot be copied, so copies of concurrent trees get their own.
+        self._tree_lock = threading.RLock() if self._tree_lock else None
+
     ### PRIVATE METHODS ###
 
+    def _attach_children(self, nodes):
+        """
+        Reparent ``nodes`` to this container.
+
+        Subtrees arriving from other trees have their names moved between root
+        registries in one merged pass per registry. Subtrees moved within this
+        tree keep their registrations, and only the affected sorted-name caches
+        are dropped. Callers are responsible for inserting ``nodes`` into
+        ``_children``.
+        """
+        node_ids = set(id(node) for node in nodes)
+        if len(node_ids) != len(nodes) or any(
+            id(parent) in node_ids for node in nodes for parent in node.parentage[1:]
+        ):
+            # Nested or repeated nodes must be moved one at a time.
+            for node in nodes:
+                self._attach_children([node])
+            return
+        self._invalidate_snapshot()
+        registry = self.parentage[-1]
+        old_registries = {}
+        new_name_dictionary = {}
+        for node in nodes:
+            old_registry = node._get_name_registry()
+            if registry._tree_lock is None:
+                # Subtrees arriving from a concurrent tree keep it concurrent.
+                old_root = node if old_registry is None else old_registry
+                registry._tree_lock = getattr(old_root, "_tree_lock", None)
+                if registry._tree_lock is not None:
+                    registry._mark_concurrent()
+            name_dictionary = node._cache_named_children()
+            if old_registry is registry:
+                # Moved within this tree: names are unchanged, but their order
+                # may not be.
+                for name in name_dictionary:
+                    registry._sorted_named_children.pop(name, None)
+                continue
+            if old_registry is not None:
+                _, old_name_dictionary = old_registries.setdefault(
+                    id(old_registry), (old_registry, {})
+                )
+                self._merge_named_children(old_name_dictionary, name_dictionary)
+            self._merge_named_children(new_name_dictionary, name_dictionary)
+        for old_registry, old_name_dictionary in old_registries.values():
+            old_registry._unregister_named_children(old_name_dictionary)
+        for node in nodes:
+            node._remove_from_parent()
+            node._parent = self
+            node._invalidate_cached_state()
+            node._reset_name_registry()
+            if registry._tree_lock is not None:
+                node._mark_concurrent()
+        registry._register_named_children(new_name_dictionary)
+
     def _cache_named_children(self):
+        """
+        Get the names of this container and all of its descendants.
+
+        Roots read their registry; other containers walk their subtree.
+        """
         name_dictionary = super()._cache_named_children()
-        if hasattr(self, "_named_children"):
-            for name, children in self._named_children.items():
-                name_dictionary[name] = copy.copy(children)
+        if self._parent is None:
+            self._merge_named_children(name_dictionary, self._named_children)
+            return name_dictionary
+        for node in self.depth_first():
+            if node._name is not None:
+                name_dictionary.setdefault(node._name, set()).add(node)
         return name_dictionary
 
+    def _detach_children(self, nodes):
+        """
+        Orphan ``nodes``, unregistering their names from this tree's root in a
+        single pass. Each orphaned container becomes the root of its own
+        registry.
+        """
+        self._invalidate_snapshot()
+        registry = self.parentage[-1]
+        name_dictionary = {}
+        for node in nodes:
+            node_name_dictionary = node._cache_named_children()
+            self._merge_named_children(name_dictionary, node_name_dictionary)
+            node._remove_from_parent()
+            node._invalidate_cached_state()
+            node._reset_name_registry(node_name_dictionary)
+            if isinstance(node, UniqueTreeContainer):
+                # Orphans share the old tree's lock, as other threads may still
+                # be waiting on it to mutate them.
+                node._tree_lock = registry._tree_lock
+        registry._unregister_named_children(name_dictionary)
+        for node in nodes:
+            node._mark_entire_tree_for_later_update()
+
+    def _get_child_nodes(self):
+        return self._children
+
+    def _get_descendant_intervals(self):
+        """
+        Get a map of ``id(node)`` to ``(pre, post)`` for this container and its
+        descendants, where ``pre`` is a node's pre-order number and ``post`` is
+        the largest pre-order number in its subtree.
+
+        A node is a proper descendant of a container exactly when its ``pre``
+        falls in ``(pre, post]`` of that container. The table is rebuilt lazily
+        after any structural change beneath this container.
+        """
+        if self._descendant_intervals is None:
+            intervals = {id(self): [0, 0]}
+            open_nodes = [self]
+            count = 0
+            for node, depth in self.depth_first(with_depth=True):
+                count += 1
+                while len(open_nodes) > depth:
+                    intervals[id(open_nodes.pop())][1] = count - 1
+                intervals[id(node)] = [count, count]
+                open_nodes.append(node)
+            for node in open_nodes:
+                intervals[id(node)][1] = count
+            self._descendant_intervals = intervals
+        return self._descendant_intervals
+
+    def _get_named_child_index(self, name, node):
+        nodes, positions = self._get_sorted_named_children(name)
+        if positions is None:
+            positions = {id(x): i for i, x in enumerate(nodes)}
+            self._sorted_named_children[name] = (nodes, positions)
+        return positions[id(node)]
+
+    def _get_sorted_named_children(self, name):
+        """
+        Get the descendants named ``name`` in graph order, with a lazily-built
+        identity-to-index map.
+
+        Entries are dropped whenever the set of descendants named ``name``
+        changes or one of them is re-ordered in place. Insertions and removals
+        elsewhere shift graph-orders uniformly, so they leave the relative order
+        of the remaining nodes intact.
+        """
+        try:
+            return self._sorted_named_children[name]
+        except KeyError:
+            pass
+        if self._parent is not None:
+            nodes, _ = self.root._get_sorted_named_children(name)
+            nodes = tuple(self._filter_descendants(nodes))
+            if not nodes:
+                raise KeyError(name)
+            return nodes, None
+        nodes = tuple(sorted(self._named_children[name], key=lambda x: x.graph_order))
+        self._sorted_named_children[name] = entry = (nodes, None)
+        return entry
+
+    def _filter_descendants(self, nodes):
+        """
+        Yield those of ``nodes``, all in this container's tree, which descend
+        from this container.
+        """
+        intervals = self.parentage[-1]._get_descendant_intervals()
+        start, stop = intervals[id(self)]
+        for node in nodes:
+            if start < intervals[id(node)][0] <= stop:
+                yield node
+
+    def _has_named_descendant(self, name):
+        if self._parent is None:
+            return name in self._named_children
+        nodes = self.root._named_children.get(name, ())
+        return any(True for _ in self._filter_descendants(nodes))
+
+    def _get_position(self, node):
+        """
+        Get the position of ``node`` in a sequence container's children, or
+        ``None`` if ``node`` is not a child.
+
+        Positions are keyed by identity. Positions from
+        ``_numbered_child_count`` onward may be stale and are renumbered
+        lazily on the first lookup that needs them.
+        """
+        children = self._children
+        position = self._child_positions.get(id(node))
+        if position is not None and position < self._numbered_child_count:
+            if children[position] is node:
+                return position
+        if self._numbered_child_count < len(children):
+            positions = self._child_positions
+            for i in range(self._numbered_child_count, len(children)):
+                positions[id(children[i])] = i
+            self._numbered_child_count = len(children)
+            position = positions.get(id(node))
+            if position is not None and children[position] is node:
+                return position
+        return None
+
+    def _insert_positions(self, start_index, count):
+        children = self._children
+        if self._numbered_child_count >= start_index:
+            if start_index + count == len(children):
+                positions = self._child_positions
+                for i in range(start_index, len(children)):
+                    positions[id(children[i])] = i
+                self._numbered_child_count = len(children)
+            else:
+                self._numbered_child_count = start_index
+        self._invalidate_graph_order(start_index)
+
+    def _invalidate_graph_order(self, start_index=0):
+        self.parentage[-1]._descendant_intervals = None
+        # Skip the walk unless some child has cached its graph order.
+        if not self._children_graph_ordered:
+            return
+        if not start_index:
+            self._children_graph_ordered = False
+        for child in self._children[start_index:]:
+            child._invalidate_cached_state(parentage=False)
+
+    @staticmethod
+    def _merge_named_children(name_dictionary, other_name_dictionary):
+        for name, nodes in other_name_dictionary.items():
+            name_dictionary.setdefault(name, set()).update(nodes)
+
+    def _register_named_children(self, name_dictionary):
+        """
+        Add ``name_dictionary`` to this root container's registry.
+        """
+        self._descendant_intervals = None
+        named_children = self._named_children
+        for name, nodes in name_dictionary.items():
+            self._sorted_named_children.pop(name, None)
+            if name in named_children:
+                named_children[name].update(nodes)
+            else:
+                named_children[name] = set(nodes)
+
+    def _reset_name_registry(self, name_dictionary=None):
+        """
+        Replace this container's registry after it is reparented.
+
+        Attached containers keep no registry. Orphaned containers register
+        ``name_dictionary``, their subtree's names, less their own.
+        """
+        self._descendant_intervals = None
+        self._named_children = {}
+        self._sorted_named_children = {}
+        if self._parent is not None or not name_dictionary:
+            return
+        self._register_named_children(name_dictionary)
+        if self._name is not None:
+            self._named_children[self._name].discard(self)
+            if not self._named_children[self._name]:
+                del self._named_children[self._name]
+
+    def _remove_child(self, node):
+        self._writable_children().remove(node)
+
+    def _remove_position(self, node, index):
+        if self.parentage[-1]._tree_lock is not None:
+            # Replace rather than mutate, so lock-free readers keep a stable list.
+            self._children = self._children[:index] + self._children[index + 1 :]
+        else:
+            del self._children[index]
+        self._child_positions.pop(id(node), None)
+        self._numbered_child_count = min(self._numbered_child_count, index)
+        self._invalidate_graph_order(index)
+
+    def _writable_children(self):
+        """
+        Get ``_children`` for mutating in place, first replacing it with a copy
+        in concurrent trees, so lock-free readers keep a stable container.
+        """
+        if self.parentage[-1]._tree_lock is not None:
+            self._children = self._children.copy()
+        return self._children
+
+    def _unregister_named_children(self, name_dictionary):
+        """
+        Remove ``name_dictionary`` from this root container's registry.
+        """
+        self._descendant_intervals = None
+        named_children = self._named_children
+        for name, nodes in name_dictionary.items():
+            self._sorted_named_children.pop(name, None)
+            named_children[name].difference_update(nodes)
+            if not named_children[name]:
+                del named_children[name]
+
     ### PRIVATE PROPERTIES ###
 
     @property
@@ -223,16 +702,269 @@ class UniqueTreeContainer(UniqueTreeNode):
 
     ### PUBLIC METHODS ###
 
-    def depth_first(self, top_down=True, prototype=None):
-        for child in tuple(self):
-            if top_down:
-                if not prototype or isinstance(child, prototype):
-                    yield child
-            if isinstance(child, UniqueTreeContainer):
-                yield from child.depth_first(top_down=top_down, prototype=prototype)
-            if not top_down:
-                if not prototype or isinstance(child, prototype):
-                    yield child
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Defer state-flag invalidation for mutations under this container until
+        the outermost batch exits.
+
+        ::
+
+            >>> from uqbar.containers import UniqueTreeList, UniqueTreeNode
+            >>> container = UniqueTreeList()
+            >>> with container.batch():
+            ...     for _ in range(3):
+            ...         container.append(UniqueTreeNode())
+            ...
+            >>> len(container)
+            3
+
+        """
+        if self._pending_updates is not None:
+            yield self
+            return
+        self._pending_updates = {}
+        try:
+            yield self
+        finally:
+            pending_updates, self._pending_updates = self._pending_updates, None
+            if pending_updates:
+                for node, names in pending_updates.values():
+                    for name in names:
+                        setattr(node, name, False)
+                self._mark_entire_tree_for_later_update()
+
+    def depth_first(self, top_down=True, prototype=None, prune=None, with_depth=False):
+        """
+        Iterate descendants depth-first.
+
+        Traversal uses an explicit stack rather than nested generators, so
+        arbitrarily deep trees neither recurse nor pay per-level generator
+        overhead. Each container's children are snapshotted when it is entered,
+        so the tree may be mutated during iteration.
+
+        ::
+
+            >>> from uqbar.containers import UniqueTreeList, UniqueTreeNode
+            >>> root = UniqueTreeList(name="root")
+            >>> outer = UniqueTreeList(name="outer")
+            >>> inner = UniqueTreeList(name="inner")
+            >>> root.extend([UniqueTreeNode(name="a"), outer])
+            >>> outer.extend([inner, UniqueTreeNode(name="d")])
+            >>> inner.extend([UniqueTreeNode(name="b"), UniqueTreeNode(name="c")])
+
+        ::
+
+            >>> [node.name for node in root.depth_first()]
+            ['a', 'outer', 'inner', 'b', 'c', 'd']
+
+        ::
+
+            >>> [node.name for node in root.depth_first(top_down=False)]
+            ['a', 'b', 'c', 'inner', 'd', 'outer']
+
+        ::
+
+            >>> for node, depth in root.depth_first(
+            ...     prune=lambda node: node.name == "inner",
+            ...     with_depth=True,
+            ... ):
+            ...     print(depth, node.name)
+            ...
+            1 a
+            1 outer
+            2 inner
+            2 d
+
+        :param top_down: whether to yield containers before (pre-order) or after
+            (post-order) their descendants
+        :param prototype: a type or tuple of types to filter yielded nodes by
+        :param prune: a predicate; containers for which it returns true are
+            yielded but not descended into
+        :param with_depth: whether to yield ``(node, depth)`` pairs, where
+            children of this container have depth 1
+        """
+        stack = [(self, iter(tuple(self._get_child_nodes())))]
+        while stack:
+            parent, iterator = stack[-1]
+            for child in iterator:
+                if top_down and (not prototype or isinstance(child, prototype)):
+                    yield (child, len(stack)) if with_depth else child
+                if isinstance(child, UniqueTreeContainer) and not (
+                    prune and prune(child)
+                ):
+                    stack.append((child, iter(tuple(child._get_child_nodes()))))
+                    break
+                if not top_down and (not prototype or isinstance(child, prototype)):
+                    yield (child, len(stack)) if with_depth else child
+            else:
+                stack.pop()
+                if (
+                    not top_down
+                    and stack
+                    and (not prototype or isinstance(parent, prototype))
+                ):
+                    yield (parent, len(stack)) if with_depth else parent
+
+    def enable_concurrency(self):
+        """
+        Make this container's tree safe to mutate from many threads.
+
+        Structural mutations and renames anywhere in the tree are serialized
+        on a single re-entrant lock held by the tree's root. Subtrees attached
+        to the tree join it, and subtrees detached from it keep sharing its
+        lock. Containers of every kind replace, rather than mutate, their
+        children's list, set or dict, so iteration, ``len()``, indexing,
+        ``children`` and :py:meth:`depth_first` may run lock-free, each seeing
+        every container as it stood at some moment.
+
+        Queries which consult cached state, such as ``parentage``,
+        ``graph_order``, ``index()`` and lookups by name, and any
+        read-then-write sequence, should run inside :py:meth:`locked`.
+
+        ::
+
+            >>> import threading
+            >>> from uqbar.containers import UniqueTreeList, UniqueTreeNode
+            >>> root = UniqueTreeList()
+            >>> root.enable_concurrency()
+            >>> def work():
+            ...     for _ in range(100):
+            ...         root.append(UniqueTreeList([UniqueTreeNode(name="leaf")]))
+            ...
+            >>> threads = [threading.Thread(target=work) for _ in range(4)]
+            >>> for thread in threads:
+            ...     thread.start()
+            ...
+            >>> for thread in threads:
+            ...     thread.join()
+            ...
+            >>> with root.locked():
+            ...     len(root), len(root["leaf"])
+            ...
+            (400, 400)
+
+        """
+        with self._lock_trees():
+            root = self.parentage[-1]
+            if root._tree_lock is None:
+                root._tree_lock = threading.RLock()
+                root._mark_concurrent()
+
+    def snapshot(self):
+        """
+        Take an immutable snapshot of this container and its descendants.
+
+        Snapshots are cached on the nodes they are taken from, and mutating or
+        renaming a node drops only the cached snapshots along its path to the
+        root. Taking a new snapshot rebuilds just those, and shares every
+        unchanged subtree with earlier snapshots, so its cost is proportional
+        to what changed rather than to the size of the tree.
+
+        ::
+
+            >>> from uqbar.containers import UniqueTreeList, UniqueTreeNode
+            >>> root = UniqueTreeList(name="root")
+            >>> left = UniqueTreeList([UniqueTreeNode(name="a")], name="left")
+            >>> right = UniqueTreeList([UniqueTreeNode(name="b")], name="right")
+            >>> root.extend([left, right])
+            >>> before = root.snapshot()
+            >>> right.append(UniqueTreeNode(name="c"))
+            >>> after = root.snapshot()
+
+        ::
+
+            >>> [node.name for node in before.depth_first()]
+            ['left', 'a', 'right', 'b']
+
+        ::
+
+            >>> [node.name for node in after.depth_first()]
+            ['left', 'a', 'right', 'b', 'c']
+
+        ::
+
+            >>> after[0] is before[0], after[1] is before[1]
+            (True, False)
+
+        Snapshots capture structure, names and, for dict nodes, keys only.
+        Each snapshot node's ``node`` is the live node it was taken from, whose
+        other state is not frozen.
+        """
+        with self._lock_trees():
+            if self._cached_snapshot is None:
+                for node in self.depth_first(
+                    top_down=False, prune=lambda x: x._cached_snapshot is not None
+                ):
+                    if node._cached_snapshot is None:
+                        node._cached_snapshot = UniqueTreeSnapshot._from_node(node)
+                self._cached_snapshot = UniqueTreeSnapshot._from_node(self)
+            return self._cached_snapshot
+
+    def find_all(self, name):
+        """
+        Iterate descendants named ``name`` in graph order.
+
+        ::
+
+            >>> from uqbar.containers import UniqueTreeList, UniqueTreeNode
+            >>> root = UniqueTreeList()
+            >>> inner = UniqueTreeList()
+            >>> root.extend([inner, UniqueTreeNode(name="foo")])
+            >>> inner.append(UniqueTreeNode(name="foo"))
+            >>> [node.graph_order for node in root.find_all("foo")]
+            [(0, 0), (1,)]
+
+        ::
+
+            >>> list(root.find_all("bar"))
+            []
+
+        """
+        if not self._has_named_descendant(name):
+            return iter(())
+        nodes, _ = self._get_sorted_named_children(name)
+        return iter(nodes)
+
+    def find_first(self, name):
+        """
+        Get the first descendant named ``name`` in graph order, or ``None``.
+
+        ::
+
+            >>> from uqbar.containers import UniqueTreeList, UniqueTreeNode
+            >>> root = UniqueTreeList()
+            >>> inner = UniqueTreeList()
+            >>> root.extend([inner, UniqueTreeNode(name="foo")])
+            >>> inner.append(UniqueTreeNode(name="foo"))
+            >>> root.find_first("foo").graph_order
+            (0, 0)
+
+        ::
+
+            >>> root.find_first("bar") is None
+            True
+
+        """
+        if not self._has_named_descendant(name):
+            return None
+        if name in self._sorted_named_children:
+            return self._sorted_named_children[name][0][0]
+        if self._parent is not None:
+            return next(self.find_all(name))
+        return min(self._named_children[name], key=lambda x: x.graph_order)
+
+    @contextlib.contextmanager
+    def locked(self):
+        """
+        Hold the lock of this container's tree, if it is concurrent, for the
+        duration of the block.
+
+        The lock is re-entrant, so mutations may be made inside the block. For
+        trees not in concurrent mode this does nothing.
+        """
+        with self._lock_trees():
+            yield self
 
     def recurse(self, prototype=None):
         return self.depth_first(prototype=prototype)
@@ -243,6 +975,13 @@ class UniqueTreeContainer(UniqueTreeNode):
     def children(self):
         return tuple(self._children)
 
+    @property
+    def is_concurrent(self):
+        """
+        Is this container's tree in concurrent mode?
+        """
+        return getattr(self._find_root(), "_tree_lock", None) is not None
+
 
 class UniqueTreeList(UniqueTreeContainer):
     """
@@ -254,51 +993,64 @@ class UniqueTreeList(UniqueTreeContainer):
     the tree.
     """
 
+    ### CLASS VARIABLES ###
+
+    __slots__ = ("_child_positions", "_children", "_numbered_child_count")
+
     ### INITIALIZER ###
 
     def __init__(self, children=None, name=None):
         super().__init__(name=name)
         self._children = []
+        self._child_positions = {}
+        self._numbered_child_count = 0
         if children is not None:
             self[:] = children
 
     ### SPECIAL METHODS ###
 
+    def __contains__(self, expr):
+        if isinstance(expr, str):
+            return self._has_named_descendant(expr)
+        return self._get_position(expr) is not None
+
     def __delitem__(self, i):
-        if isinstance(i, str):
-            children = tuple(self._named_children[i])
-            for child in children:
-                parent = child.parent
-                del parent[parent.index(child)]
-            return
-        if isinstance(i, int):
-            if i < 0:
-                i = len(self) + i
-            i = slice(i, i + 1)
-        self.__setitem__(i, [])
-        self._mark_entire_tree_for_later_update()
+        with self._lock_trees():
+            if isinstance(i, str):
+                children, _ = self._get_sorted_named_children(i)
+                for child in children:
+                    parent = child.parent
+                    del parent[parent.index(child)]
+                return
+            if isinstance(i, int):
+                if i < 0:
+                    i = len(self) + i
+                i = slice(i, i + 1)
+            self.__setitem__(i, [])
+            self._mark_entire_tree_for_later_update()
 
     def __getitem__(self, expr):
         if isinstance(expr, (int, slice)):
             return self._children[expr]
         elif isinstance(expr, str):
-            result = sorted(self._named_children[expr], key=lambda x: x.graph_order)
+            result, _ = self._get_sorted_named_children(expr)
             if len(result) == 1:
                 return result[0]
-            return result
+            return list(result)
         raise ValueError(expr)
 
     def __setitem__(self, i, new_items):
         if isinstance(i, int):
             new_items = self._prepare_setitem_single(new_items)
-            start_index, stop_index, _ = slice(i, i + 1).indices(len(self))
+            i = slice(i, i + 1)
         else:
             new_items = self._prepare_setitem_multiple(new_items)
+        with self._lock_trees(new_items):
             start_index, stop_index, _ = i.indices(len(self))
-        old_items = self[start_index:stop_index]
-        self._validate(new_items, old_items, start_index, stop_index)
-        self._set_items(new_items, old_items, start_index, stop_index)
-        self._mark_entire_tree_for_later_update()
+            old_items = self[start_index:stop_index]
+            self._validate(new_items, old_items, start_index, stop_index)
+            self._set_items(new_items, old_items, start_index, stop_index)
+            self._mark_entire_tree_for_later_update()
 
     ### PRIVATE METHODS ###
 
@@ -308,12 +1060,21 @@ class UniqueTreeList(UniqueTreeContainer):
     def _prepare_setitem_single(self, expr):
         return [expr]
 
+    def _remove_child(self, node):
+        self._remove_position(node, self.index(node))
+
     def _set_items(self, new_items, old_items, start_index, stop_index):
-        for old_item in old_items:
-            old_item._set_parent(None)
-        for new_item in new_items:
-            new_item._set_parent(self)
-        self._children.__setitem__(slice(start_index, start_index), new_items)
+        if old_items:
+            self._detach_children(old_items)
+        self._attach_children(new_items)
+        children = self._children
+        start_index = min(start_index, len(children))
+        if self.parentage[-1]._tree_lock is not None:
+            # Replace rather than mutate, so lock-free readers keep a stable list.
+            self._children = children[:start_index] + new_items + children[start_index:]
+        else:
+            children.__setitem__(slice(start_index, start_index), new_items)
+        self._insert_positions(start_index, len(new_items))
 
     def _validate(self, new_nodes, old_nodes, start_index, stop_index):
         parentage = self.parentage
@@ -326,15 +1087,17 @@ class UniqueTreeList(UniqueTreeContainer):
     ### PUBLIC METHODS ###
 
     def append(self, expr):
-        self.__setitem__(slice(len(self), len(self)), [expr])
+        self.extend([expr])
 
     def extend(self, expr):
-        self.__setitem__(slice(len(self), len(self)), expr)
+        # Clamped to the length at mutation time, which may differ from now
+        # if other threads are appending too.
+        self.__setitem__(slice(sys.maxsize, sys.maxsize), expr)
 
     def index(self, expr):
-        for i, child in enumerate(self._children):
-            if child is expr:
-                return i
+        position = self._get_position(expr)
+        if position is not None:
+            return position
         message = "{!r} not in {!r}."
         message = message.format(expr, self)
         raise ValueError(message)
@@ -343,13 +1106,15 @@ class UniqueTreeList(UniqueTreeContainer):
         self.__setitem__(slice(i, i), [expr])
 
     def pop(self, i=-1):
-        node = self[i]
-        del self[i]
+        with self._lock_trees():
+            node = self[i]
+            del self[i]
         return node
 
     def remove(self, node):
-        i = self.index(node)
-        del self[i]
+        with self._lock_trees():
+            i = self.index(node)
+            del self[i]
 
 
 class UniqueTreeTuple(UniqueTreeContainer):
@@ -357,23 +1122,34 @@ class UniqueTreeTuple(UniqueTreeContainer):
     A tuple-like node in a "unique" tree.
     """
 
+    ### CLASS VARIABLES ###
+
+    __slots__ = ("_child_positions", "_children", "_numbered_child_count")
+
     ### INITIALIZER ###
 
     def __init__(self, children=None, name=None):
         super().__init__(name=name)
         self._children = []
+        self._child_positions = {}
+        self._numbered_child_count = 0
         self._mutate(slice(None), children or ())
 
     ### SPECIAL METHODS ###
 
+    def __contains__(self, expr):
+        if isinstance(expr, str):
+            return self._has_named_descendant(expr)
+        return self._get_position(expr) is not None
+
     def __getitem__(self, expr):
         if isinstance(expr, (int, slice)):
             return self._children[expr]
         elif isinstance(expr, str):
-            result = sorted(self._named_children[expr], key=lambda x: x.graph_order)
+            result, _ = self._get_sorted_named_children(expr)
             if len(result) == 1:
                 return result[0]
-            return result
+            return list(result)
         raise ValueError(expr)
 
     ### PRIVATE METHODS ###
@@ -381,14 +1157,15 @@ class UniqueTreeTuple(UniqueTreeContainer):
     def _mutate(self, i, new_items):
         if isinstance(i, int):
             new_items = self._prepare_setitem_single(new_items)
-            start_index, stop_index, _ = slice(i, i + 1).indices(len(self))
+            i = slice(i, i + 1)
         else:
             new_items = self._prepare_setitem_multiple(new_items)
+        with self._lock_trees(new_items):
             start_index, stop_index, _ = i.indices(len(self))
-        old_items = self[start_index:stop_index]
-        self._validate(new_items, old_items, start_index, stop_index)
-        self._set_items(new_items, old_items, start_index, stop_index)
-        self._mark_entire_tree_for_later_update()
+            old_items = self[start_index:stop_index]
+            self._validate(new_items, old_items, start_index, stop_index)
+            self._set_items(new_items, old_items, start_index, stop_index)
+            self._mark_entire_tree_for_later_update()
 
     def _prepare_setitem_multiple(self, expr):
         return list(expr)
@@ -396,12 +1173,21 @@ class UniqueTreeTuple(UniqueTreeContainer):
     def _prepare_setitem_single(self, expr):
         return [expr]
 
+    def _remove_child(self, node):
+        self._remove_position(node, self.index(node))
+
     def _set_items(self, new_items, old_items, start_index, stop_index):
-        for old_item in old_items:
-            old_item._set_parent(None)
-        for new_item in new_items:
-            new_item._set_parent(self)
-        self._children.__setitem__(slice(start_index, start_index), new_items)
+        if old_items:
+            self._detach_children(old_items)
+        self._attach_children(new_items)
+        children = self._children
+        start_index = min(start_index, len(children))
+        if self.parentage[-1]._tree_lock is not None:
+            # Replace rather than mutate, so lock-free readers keep a stable list.
+            self._children = children[:start_index] + new_items + children[start_index:]
+        else:
+            children.__setitem__(slice(start_index, start_index), new_items)
+        self._insert_positions(start_index, len(new_items))
 
     def _validate(self, new_nodes, old_nodes, start_index, stop_index):
         parentage = self.parentage
@@ -414,9 +1200,9 @@ class UniqueTreeTuple(UniqueTreeContainer):
     ### PUBLIC METHODS ###
 
     def index(self, expr):
-        for i, child in enumerate(self._children):
-            if child is expr:
-                return i
+        position = self._get_position(expr)
+        if position is not None:
+            return position
         message = "{!r} not in {!r}."
         message = message.format(expr, self)
         raise ValueError(message)
@@ -427,6 +1213,10 @@ class UniqueTreeSet(UniqueTreeContainer):
     A set-like node in a "unique" tree.
     """
 
+    ### CLASS VARIABLES ###
+
+    __slots__ = ("_children", "_lock")
+
     ### INITIALIZER ###
 
     def __init__(self, children=None, name=None):
@@ -439,19 +1229,18 @@ class UniqueTreeSet(UniqueTreeContainer):
     ### PRIVATE METHODS ###
 
     def _mutate(self, new_nodes, old_nodes):
-        with self._lock:
+        new_nodes = list(new_nodes)
+        with self._lock_trees(new_nodes), self._lock:
             self._validate(new_nodes, old_nodes)
             self._update_parentage(new_nodes, old_nodes)
             self._mark_entire_tree_for_later_update()
 
     def _update_parentage(self, new_nodes, old_nodes):
-        for old_node in old_nodes:
-            old_node._set_parent(None)
-        for new_node in new_nodes:
-            new_node._set_parent(self)
-        self._children.update(new_nodes)
+        self._detach_children(list(old_nodes))
+        self._attach_children(list(new_nodes))
+        self._writable_children().update(new_nodes)
 
-    def _validate(self, new_nodes):
+    def _validate(self, new_nodes, old_nodes):
         parentage = self.parentage
         for new_node in new_nodes:
             if not isinstance(new_node, self._node_class):
@@ -465,22 +1254,22 @@ class UniqueTreeSet(UniqueTreeContainer):
         self._mutate(new_nodes=(node,), old_nodes=())
 
     def clear(self):
-        self._mutate(new_nodes=(), old_nodes=self._children)
+        with self._lock_trees():
+            self._mutate(new_nodes=(), old_nodes=tuple(self._children))
 
     def pop(self):
-        with self._lock:
-            node = self._children.pop()
+        with self._lock_trees(), self._lock:
+            node = self._writable_children().pop()
             self._mutate(new_nodes=(), old_nodes=(node,))
         return node
 
     def remove(self, node):
-        with self._lock:
-            self._children.remove(node)
+        with self._lock_trees(), self._lock:
+            self._writable_children().remove(node)
             self._mutate(new_nodes=(), old_nodes=(node,))
 
     def update(self, expr):
-        with self._lock:
-            self._mutate(new_nodes=expr, old_nodes=())
+        self._mutate(new_nodes=expr, old_nodes=())
 
 
 class UniqueTreeDict(UniqueTreeContainer):
@@ -488,6 +1277,10 @@ class UniqueTreeDict(UniqueTreeContainer):
     A dict-like node in a "unique" tree.
     """
 
+    ### CLASS VARIABLES ###
+
+    __slots__ = ("_children", "_children_reversed", "_lock")
+
     ### INITIALIZER ###
 
     def __init__(self, children=None, name=None):
@@ -504,7 +1297,7 @@ class UniqueTreeDict(UniqueTreeContainer):
         return key in self._children
 
     def __delitem__(self, key):
-        with self._lock:
+        with self._lock_trees(), self._lock:
             self._mutate([], [(key, self._children[key])])
 
     def __getitem__(self, key):
@@ -518,40 +1311,43 @@ class UniqueTreeDict(UniqueTreeContainer):
 
     ### PRIVATE METHODS ###
 
+    def _get_child_nodes(self):
+        return self._children.values()
+
     def _mutate(self, new_items, old_items):
-        with self._lock:
+        new_nodes = [node for _, node in new_items]
+        with self._lock_trees(new_nodes), self._lock:
             self._validate(new_items, old_items)
             new_nodes, old_nodes = self._update_items(new_items, old_items)
             self._update_parentage(new_nodes, old_nodes)
             self._mark_entire_tree_for_later_update()
 
     def _update_items(self, new_items, old_items):
+        children = self._writable_children()
         new_nodes, old_nodes = set(), set()
         for old_key, old_node in old_items:
             old_nodes.add(old_node)
-            self._children.pop(old_key)
+            children.pop(old_key)
             self._children_reversed.pop(old_node)
         for _, new_node in new_items:
             new_nodes.add(new_node)
         for new_key, new_node in new_items:
-            if new_key in self._children:
+            if new_key in children:
                 # pre-existing key
-                old_node = self[new_key]
+                old_node = children[new_key]
                 if old_node not in new_nodes:
                     old_nodes.add(old_node)
                     self._children_reversed.pop(old_node)
             if new_node in self._children_reversed:
                 # pre-existing node
-                self._children.pop(self._children_reversed[new_node])
-            self._children[new_key] = new_node
+                children.pop(self._children_reversed[new_node])
+            children[new_key] = new_node
             self._children_reversed[new_node] = new_key
         return new_nodes, old_nodes
 
     def _update_parentage(self, new_nodes, old_nodes):
-        for old_node in old_nodes:
-            old_node._set_parent(None)
-        for new_node in new_nodes:
-            new_node._set_parent(self)
+        self._detach_children(list(old_nodes))
+        self._attach_children(list(new_nodes))
 
     def _validate(self, new_items, old_items):
         parentage = self.parentage
@@ -564,16 +1360,8 @@ class UniqueTreeDict(UniqueTreeContainer):
     ### PUBLIC METHODS ###
 
     def clear(self):
-        self._mutate([], list(self.items()))
-
-    def depth_first(self, top_down=True):
-        for child in tuple(self.values()):
-            if top_down:
-                yield child
-            if isinstance(child, UniqueTreeContainer):
-                yield from child.depth_first(top_down=top_down)
-            if not top_down:
-                yield child
+        with self._lock_trees():
+            self._mutate([], list(self.items()))
 
     def get(self, key, default=None):
         return self._children.get(key, default)
@@ -585,9 +1373,10 @@ class UniqueTreeDict(UniqueTreeContainer):
         return self._children.keys()
 
     def pop(self, *args):
-        with self._lock:
-            value = self._children.pop(*args)
-            self._children[args[0]] = value
+        with self._lock_trees(), self._lock:
+            if len(args) > 1 and args[0] not in self._children:
+                return args[1]
+            value = self._children[args[0]]
             self._mutate([], [(args[0], value)])
             return value
 
@@ -606,3 +1395,143 @@ class UniqueTreeDict(UniqueTreeContainer):
 
     def values(self):
         return self._children.values()
+
+
+class UniqueTreeSnapshot:
+    """
+    An immutable snapshot of a node in a "unique" tree.
+
+    Snapshots are taken with :py:meth:`UniqueTreeContainer.snapshot`. They
+    record the name and children of the node they were taken from, and are
+    shared between successive snapshots of unchanged subtrees, so they carry no
+    parent. Snapshots of :py:class:`UniqueTreeDict` nodes also record their
+    children's keys, in order.
+
+    Children and keys are held in tuples, and attributes can't be reassigned
+    once a snapshot is built, so a snapshot can be shared freely; copying one
+    returns it unchanged.
+    """
+
+    ### CLASS VARIABLES ###
+
+    __slots__ = ("_children", "_keys", "_name", "_node")
+
+    ### INITIALIZER ###
+
+    def __init__(self, node, name=None, children=(), keys=None):
+        children = tuple(children)
+        if keys is not None:
+            keys = tuple(keys)
+            if len(keys) != len(children):
+                raise ValueError("Expected one key per child.")
+        object.__setattr__(self, "_node", node)
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_children", children)
+        object.__setattr__(self, "_keys", keys)
+
+    ### SPECIAL METHODS ###
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getitem__(self, expr):
+        return self._children[expr]
+
+    def __iter__(self):
+        return iter(self._children)
+
+    def __len__(self):
+        return len(self._children)
+
+    def __reduce__(self):
+        return type(self), (self._node, self._name, self._children, self._keys)
+
+    def __repr__(self):
+        return "<{} of {!r}>".format(type(self).__name__, self._node)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    ### PRIVATE METHODS ###
+
+    @classmethod
+    def _from_node(cls, node):
+        children = getattr(node, "_children", None)
+        return cls(
+            node,
+            name=node._name,
+            children=(child._cached_snapshot for child in node._get_child_nodes()),
+            keys=tuple(children) if isinstance(children, dict) else None,
+        )
+
+    ### PUBLIC METHODS ###
+
+    def depth_first(self, top_down=True, with_depth=False):
+        """
+        Iterate descendant snapshots depth-first.
+
+        :param top_down: whether to yield snapshots before (pre-order) or after
+            (post-order) their descendants
+        :param with_depth: whether to yield ``(snapshot, depth)`` pairs, where
+            children of this snapshot have depth 1
+        """
+        stack = [(self, iter(self._children))]
+        while stack:
+            parent, iterator = stack[-1]
+            for child in iterator:
+                if top_down:
+                    yield (child, len(stack)) if with_depth else child
+                if child._children:
+                    stack.append((child, iter(child._children)))
+                    break
+                if not top_down:
+                    yield (child, len(stack)) if with_depth else child
+            else:
+                stack.pop()
+                if not top_down and stack:
+                    yield (parent, len(stack)) if with_depth else parent
+
+    def find_all(self, name):
+        """
+        Iterate descendant snapshots named ``name`` depth-first.
+        """
+        for snapshot in self.depth_first():
+            if snapshot._name == name:
+                yield snapshot
+
+    def items(self):
+        """
+        Iterate ``(key, child snapshot)`` pairs of a snapshot of a
+        :py:class:`UniqueTreeDict`.
+        """
+        if self._keys is None:
+            raise TypeError(f"{self!r} is not a snapshot of a mapping")
+        return zip(self._keys, self._children)
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def children(self):
+        return self._children
+
+    @property
+    def keys(self):
+        """
+        The children's keys, for snapshots of :py:class:`UniqueTreeDict`
+        nodes, and otherwise ``None``.
+        """
+        return self._keys
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def node(self):
+        return self._node
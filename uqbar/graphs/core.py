@@ -110,9 +110,9 @@ class Graph(UniqueTreeList):
         return str(self)
 
     def __format_graphviz__(self) -> str:
-        def recurse(graph):
-            indent = "    "
-            result = []
+        indent = "    "
+
+        def open_graph(graph, depth):
             if not graph.parent:
                 name = graph.name or "G"
                 if graph.is_digraph:
@@ -127,36 +127,23 @@ class Graph(UniqueTreeList):
                 else:
                     name = graph._get_canonical_name()
                 string = "subgraph {} {{".format(Attributes._format_value(name))
-            result.append(string)
-            if graph.attributes:
-                attributes = "graph {}".format(
-                    format(graph.attributes, "graphviz")
-                ).split("\n")
-                result.extend(indent + line for line in attributes)
-            if graph.node_attributes:
-                attributes = "node {}".format(
-                    format(graph.node_attributes, "graphviz")
-                ).split("\n")
-                result.extend(indent + line for line in attributes)
-            if graph.edge_attributes:
-                attributes = "edge {}".format(
-                    format(graph.edge_attributes, "graphviz")
-                ).split("\n")
-                result.extend(indent + line for line in attributes)
-            for child in graph:
-                if isinstance(child, type(self)):
-                    lines = (indent + line for line in recurse(child))
-                else:
-                    lines = (
-                        indent + line for line in format(child, "graphviz").split("\n")
-                    )
-                result.extend(lines)
-            if graph in edge_parents:
-                for edge in edge_parents[graph]:
-                    lines = format(edge, "graphviz").split("\n")
-                    result.extend(indent + line for line in lines)
-            result.append("}")
-            return result
+            result.append(indent * depth + string)
+            for prefix, attributes in (
+                ("graph", graph.attributes),
+                ("node", graph.node_attributes),
+                ("edge", graph.edge_attributes),
+            ):
+                if attributes:
+                    lines = "{} {}".format(
+                        prefix, format(attributes, "graphviz")
+                    ).split("\n")
+                    result.extend(indent * (depth + 1) + line for line in lines)
+
+        def close_graph(graph, depth):
+            for edge in edge_parents.get(graph, ()):
+                lines = format(edge, "graphviz").split("\n")
+                result.extend(indent * (depth + 1) + line for line in lines)
+            result.append(indent * depth + "}")
 
         all_edges: Set[Edge] = set()
         for child in self.depth_first():
@@ -171,7 +158,24 @@ class Graph(UniqueTreeList):
             highest_parent = edge._get_highest_parent()
             edge_parents.setdefault(highest_parent, []).append(edge)
 
-        return "\n".join(recurse(self))
+        result: List[str] = []
+        open_graph(self, 0)
+        open_graphs = [self]
+        graph_class = type(self)
+        for child, depth in self.depth_first(
+            prune=lambda x: not isinstance(x, graph_class), with_depth=True
+        ):
+            while len(open_graphs) > depth:
+                close_graph(open_graphs.pop(), len(open_graphs))
+            if isinstance(child, graph_class):
+                open_graph(child, depth)
+                open_graphs.append(child)
+            else:
+                lines = format(child, "graphviz").split("\n")
+                result.extend(indent * depth + line for line in lines)
+        while open_graphs:
+            close_graph(open_graphs.pop(), len(open_graphs))
+        return "\n".join(result)
 
     ### PRIVATE METHODS ###
 
@@ -183,9 +187,10 @@ class Graph(UniqueTreeList):
             name = self.name
             root = self.root
             if root:
-                instances = root[self.name]
-                if not isinstance(instances, type(self)):
-                    name = "{}_{}".format(name, instances.index(self))
+                instances, _ = root._get_sorted_named_children(self.name)
+                if len(instances) > 1:
+                    index = root._get_named_child_index(self.name, self)
+                    name = "{}_{}".format(name, index)
             suffix = name
         elif self.graph_order:
             suffix = "_".join(str(x) for x in self.graph_order)
@@ -289,9 +294,10 @@ class Node(UniqueTreeList):
         if self.name is not None:
             root = self.root
             if root:
-                instances = root[self.name]
-                if instances is not self:
-                    return "{}_{}".format(self.name, instances.index(self))
+                instances, _ = root._get_sorted_named_children(self.name)
+                if len(instances) > 1:
+                    index = root._get_named_child_index(self.name, self)
+                    return "{}_{}".format(self.name, index)
             return self.name
         elif self.graph_order:
             suffix = "_".join(str(x) for x in self.graph_order)
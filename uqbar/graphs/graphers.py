@@ -31,28 +31,29 @@ class Grapher:
     ### SPECIAL METHODS ###
 
     def __call__(self):
-        with Timer() as format_timer:
-            string = self.get_string()
-        format_time = format_timer.elapsed_time
-        layout = self.get_layout()
-        format_ = self.get_format()
-        render_prefix = self.get_render_prefix(string)
-        render_directory_path = self.get_render_directory()
-        input_path = (render_directory_path / render_prefix).with_suffix(".dot")
-        self.persist_string(string, input_path)
-        render_command = self.get_render_command(format_, input_path, layout)
-        with Timer() as render_timer:
-            log, success = self.run_command(render_command)
-        render_time = render_timer.elapsed_time
-        self.persist_log(log, input_path.with_suffix(".log"))
-        output_directory_path = self.get_output_directory()
-        output_paths = self.migrate_assets(
-            render_prefix, render_directory_path, output_directory_path
-        )
-        openable_paths = []
-        for output_path in self.get_openable_paths(format_, output_paths):
-            openable_paths.append(output_path)
-            self.open_output_path(output_path)
+        with Timer(name="uqbar.graphs.Grapher"):
+            with Timer(name="format") as format_timer:
+                string = self.get_string()
+            format_time = format_timer.elapsed_time
+            layout = self.get_layout()
+            format_ = self.get_format()
+            render_prefix = self.get_render_prefix(string)
+            render_directory_path = self.get_render_directory()
+            input_path = (render_directory_path / render_prefix).with_suffix(".dot")
+            self.persist_string(string, input_path)
+            render_command = self.get_render_command(format_, input_path, layout)
+            with Timer(name="render") as render_timer:
+                log, success = self.run_command(render_command)
+            render_time = render_timer.elapsed_time
+            self.persist_log(log, input_path.with_suffix(".log"))
+            output_directory_path = self.get_output_directory()
+            output_paths = self.migrate_assets(
+                render_prefix, render_directory_path, output_directory_path
+            )
+            openable_paths = []
+            for output_path in self.get_openable_paths(format_, output_paths):
+                openable_paths.append(output_path)
+                self.open_output_path(output_path)
         return output_path, format_time, render_time, success, log
 
     ### PUBLIC METHODS ###
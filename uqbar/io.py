@@ -3,16 +3,212 @@ Tools for IO and file-system manipulation.
 """
 
 import collections
+import concurrent.futures
+import contextvars
 import cProfile
+import dataclasses
+import fnmatch
 import io
+import itertools
+import json
+import locale
+import math
 import os
 import platform
 import pstats
+import random
+import re
+import secrets
+import signal
+import stat
 import subprocess
 import sys
+import threading
 import time
+import tracemalloc
 from pathlib import Path
-from typing import Generator, List, Optional, Sequence, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Generator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+
+class CaptureBuffer:
+    """
+    A write-only text stream for capturing output cheaply.
+
+    Writes are coalesced into chunks rather than kept individually, and
+    anything written beyond ``max_size`` bytes (measured as UTF-8) is dropped,
+    with ``truncation_marker`` written in its place.
+
+    ..  container:: example
+
+        ::
+
+            >>> import uqbar.io
+            >>> buffer_ = uqbar.io.CaptureBuffer(max_size=12)
+            >>> with uqbar.io.RedirectedStreams(stdout=buffer_):
+            ...     for _ in range(1000):
+            ...         print("hello, world!")
+            ...
+
+        ::
+
+            >>> print(buffer_.getvalue())
+            hello, world
+            [output truncated]
+            <BLANKLINE>
+
+        ::
+
+            >>> buffer_.size, buffer_.truncated
+            (12, True)
+
+    :param max_size: the most bytes to keep, or ``None`` for no limit
+    :param truncation_marker: the text to write in place of dropped output
+    :param chunk_size: how many characters of writes to accumulate before
+        joining them into a chunk
+    """
+
+    ### CLASS VARIABLES ###
+
+    encoding = "utf-8"
+
+    errors = "strict"
+
+    ### INITIALIZER ###
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        truncation_marker: str = "\n[output truncated]\n",
+        chunk_size: int = 65536,
+    ) -> None:
+        if max_size is not None and max_size < 0:
+            raise ValueError(max_size)
+        self._max_size = max_size
+        self._truncation_marker = truncation_marker
+        self._chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._chunks: List[str] = []
+        self._pending: List[str] = []
+        self._pending_size = 0
+        self._size = 0
+        self._truncated = False
+
+    ### PRIVATE METHODS ###
+
+    def _append(self, string: str) -> None:
+        self._pending.append(string)
+        self._pending_size += len(string)
+        if self._pending_size >= self._chunk_size:
+            self._chunks.append("".join(self._pending))
+            self._pending.clear()
+            self._pending_size = 0
+
+    ### PUBLIC METHODS ###
+
+    def clear(self) -> None:
+        """
+        Discard the captured output and reset the size limit.
+        """
+        with self._lock:
+            self._chunks.clear()
+            self._pending.clear()
+            self._pending_size = self._size = 0
+            self._truncated = False
+
+    def drain(self) -> str:
+        """
+        Return and discard the captured output, without resetting the size
+        limit.
+        """
+        with self._lock:
+            value = "".join(self._chunks + self._pending)
+            self._chunks.clear()
+            self._pending.clear()
+            self._pending_size = 0
+        return value
+
+    def flush(self) -> None:
+        pass
+
+    def getvalue(self) -> str:
+        """
+        Return the captured output.
+        """
+        with self._lock:
+            value = "".join(self._chunks + self._pending)
+            self._chunks[:] = [value] if value else []
+            self._pending.clear()
+            self._pending_size = 0
+        return value
+
+    def isatty(self) -> bool:
+        return False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, string: str) -> int:
+        """
+        Write `string`, or as much of it as fits under the size limit.
+        """
+        with self._lock:
+            if self._truncated:
+                return len(string)
+            size = len(string) if string.isascii() else len(string.encode())
+            if self._max_size is not None and self._size + size > self._max_size:
+                remaining = self._max_size - self._size
+                if string.isascii():
+                    prefix = string[:remaining]
+                else:
+                    prefix = string.encode()[:remaining].decode(errors="ignore")
+                    remaining = len(prefix.encode())
+                self._append(prefix + self._truncation_marker)
+                self._size += remaining
+                self._truncated = True
+            else:
+                self._append(string)
+                self._size += size
+        return len(string)
+
+    def writelines(self, lines) -> None:
+        for line in lines:
+            self.write(line)
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def closed(self) -> bool:
+        return False
+
+    @property
+    def max_size(self) -> Optional[int]:
+        return self._max_size
+
+    @property
+    def size(self) -> int:
+        """
+        The number of bytes captured since creation or the last
+        :py:meth:`clear`, excluding any truncation marker.
+        """
+        return self._size
+
+    @property
+    def truncated(self) -> bool:
+        return self._truncated
 
 
 class DirectoryChange:
@@ -58,24 +254,507 @@ class DirectoryChange:
         return self._verbose
 
 
+class MemoryProfiler:
+    """
+    A context manager for profiling memory allocation in blocks of code.
+
+    Built on :py:mod:`tracemalloc`, which it starts if it is not already
+    tracing, and stops again afterwards. Reports the net allocation over the
+    block, the peak allocation above the block's starting point, and the
+    allocation sites whose usage grew or shrank the most.
+
+    Memory profilers nest: each block reports only its own allocations, while
+    its enclosing profiler records the nested block's results as a child.
+
+    ::
+
+        >>> from uqbar.io import MemoryProfiler
+        >>> with MemoryProfiler(name="outer", verbose=False) as outer:
+        ...     kept = bytearray(2_000_000)
+        ...     with MemoryProfiler(name="inner", verbose=False) as inner:
+        ...         _ = bytearray(8_000_000)
+        ...         del _
+        ...
+        >>> outer.net > 1_900_000, inner.net < 100_000, inner.peak > 7_900_000
+        (True, True, True)
+
+    ::
+
+        >>> [child["name"] for child in outer.as_dict()["children"]]
+        ['inner']
+
+    :param name: a label for the block
+    :param group_by: how to group allocation sites: ``"lineno"``,
+        ``"filename"`` or ``"traceback"``
+    :param limit: how many allocation sites to report
+    :param frame_count: how many frames to record per allocation, if this
+        profiler starts tracing
+    :param verbose: whether to print the report on exiting the context
+    :param logger_func: the function to print the report with
+    """
+
+    ### CLASS VARIABLES ###
+
+    _active: List["MemoryProfiler"] = []
+
+    ### INITIALIZER ###
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        group_by: str = "lineno",
+        limit: int = 10,
+        frame_count: int = 1,
+        verbose: bool = True,
+        logger_func=None,
+    ) -> None:
+        if group_by not in ("filename", "lineno", "traceback"):
+            raise ValueError(group_by)
+        self._name = name
+        self._group_by = group_by
+        self._limit = limit
+        self._frame_count = frame_count
+        self._verbose = bool(verbose)
+        self._logger_func = logger_func
+        self._children: List[Dict[str, Any]] = []
+        self._net: Optional[int] = None
+        self._peak: Optional[int] = None
+        self._sites: List[Dict[str, Any]] = []
+        self._peak_size = 0
+        self._start_size = 0
+
+    ### SPECIAL METHODS ###
+
+    def __enter__(self) -> "MemoryProfiler":
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start(self._frame_count)
+        self._children = []
+        self._net = self._peak = None
+        self._sites = []
+        # Snapshot before measuring, so the snapshot's own size cancels out.
+        self._start_snapshot = tracemalloc.take_snapshot()
+        self._start_size, peak = tracemalloc.get_traced_memory()
+        # Resetting the peak would lose it for any enclosing profilers, so
+        # hand it to them first.
+        for profiler in self._active:
+            profiler._peak_size = max(profiler._peak_size, peak)
+        tracemalloc.reset_peak()
+        self._peak_size = 0
+        self._active.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        size, peak = tracemalloc.get_traced_memory()
+        self._active.remove(self)
+        for profiler in self._active:
+            profiler._peak_size = max(profiler._peak_size, peak)
+        self._peak_size = max(self._peak_size, peak)
+        self._net = size - self._start_size
+        self._peak = self._peak_size - self._start_size
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        start_snapshot = self._start_snapshot.filter_traces(filters)
+        end_snapshot = tracemalloc.take_snapshot().filter_traces(filters)
+        del self._start_snapshot
+        if self._started_tracing:
+            tracemalloc.stop()
+        statistics = end_snapshot.compare_to(start_snapshot, self._group_by)
+        self._sites = [
+            {
+                "site": self._label(statistic.traceback),
+                "size": statistic.size_diff,
+                "count": statistic.count_diff,
+            }
+            for statistic in statistics[: self._limit]
+            if statistic.size_diff
+        ]
+        if self._active:
+            self._active[-1]._children.append(self.as_dict())
+        if self._verbose:
+            (self._logger_func or print)(self.report())
+
+    ### PRIVATE METHODS ###
+
+    @staticmethod
+    def _format_size(size: int) -> str:
+        for unit in ("B", "KiB", "MiB"):
+            if abs(size) < 1024:
+                break
+            size /= 1024  # type: ignore
+        else:
+            unit = "GiB"
+        return f"{size:+.1f} {unit}" if unit != "B" else f"{size:+d} B"
+
+    def _label(self, traceback: tracemalloc.Traceback) -> str:
+        if self._group_by == "filename":
+            return traceback[0].filename
+        return "; ".join(f"{_.filename}:{_.lineno}" for _ in traceback)
+
+    ### PUBLIC METHODS ###
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the block: its name, net and peak allocation in bytes, top
+        allocation sites, and the summaries of any nested blocks.
+        """
+        return {
+            "name": self._name,
+            "net": self._net,
+            "peak": self._peak,
+            "sites": list(self._sites),
+            "children": list(self._children),
+        }
+
+    def report(self) -> str:
+        """
+        Render the summary as text.
+        """
+        if self._net is None or self._peak is None:
+            return ""
+        lines = [
+            "{}net {}, peak {}".format(
+                f"{self._name}: " if self._name else "",
+                self._format_size(self._net),
+                self._format_size(self._peak).lstrip("+"),
+            )
+        ]
+        for site in self._sites:
+            lines.append(
+                "    {:>12} {:>+8}  {}".format(
+                    self._format_size(site["size"]), site["count"], site["site"]
+                )
+            )
+        return "\n".join(lines)
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def name(self) -> Optional[str]:
+        return self._name
+
+    @property
+    def net(self) -> Optional[int]:
+        """
+        The net change in traced memory over the block, in bytes.
+        """
+        return self._net
+
+    @property
+    def peak(self) -> Optional[int]:
+        """
+        The peak traced memory during the block, in bytes above the memory
+        traced on entering it.
+        """
+        return self._peak
+
+    @property
+    def sites(self) -> List[Dict[str, Any]]:
+        return list(self._sites)
+
+
 class Profiler:
     """
     A context manager for profiling blocks of code.
+
+    Profiles either deterministically, via :py:mod:`cProfile`, or by sampling
+    the call stack whenever the process has used ``interval`` seconds of CPU
+    time, which is far cheaper but requires ``signal.setitimer`` and the main
+    thread.
+
+    Each block writes its results to a new file in ``output_directory``, named
+    after ``name``, the time, the process and a per-process counter, so that
+    profiled blocks never overwrite each other: deterministic profiles as
+    :py:mod:`pstats` dumps, sampled profiles as collapsed stacks, one
+    ``frame;frame;frame count`` line per distinct stack, as read by
+    flamegraph tools.
+
+    ::
+
+        >>> import tempfile
+        >>> from uqbar.io import Profiler
+        >>> with tempfile.TemporaryDirectory() as temporary_directory:
+        ...     with Profiler(
+        ...         output_directory=temporary_directory, limit=3, verbose=False
+        ...     ) as profiler:
+        ...         _ = sorted(range(1000), key=str)
+        ...     print(profiler.output_path.suffix)
+        ...
+        .prof
+
+    ::
+
+        >>> profiler.as_dict()["functions"][0]["function"]
+        '~:0(<built-in method builtins.sorted>)'
+
+    :param mode: ``"deterministic"`` or ``"sampling"``
+    :param sort_keys: :py:mod:`pstats` sort keys; sampled profiles accept
+        ``"cumulative"``, ``"tottime"`` and ``"name"``
+    :param limit: how many functions to report, defaulting to all
+    :param output_directory: where to write results, defaulting to the current
+        working directory
+    :param name: the prefix of the output file names
+    :param interval: the sampling interval, in seconds of CPU time
+    :param verbose: whether to print the report on exiting the context
+    :param logger_func: the function to print the report with
     """
 
+    ### CLASS VARIABLES ###
+
+    _counter = itertools.count(1)
+
+    _sampling_sort_keys = {
+        "cumtime": "cumulative",
+        "cumulative": "cumulative",
+        "name": "function",
+        "time": "self",
+        "tottime": "self",
+    }
+
+    ### INITIALIZER ###
+
+    def __init__(
+        self,
+        mode: str = "deterministic",
+        sort_keys: Sequence[str] = ("cumulative",),
+        limit: Optional[int] = None,
+        output_directory: Optional[Union[str, Path]] = None,
+        name: str = "profile",
+        interval: float = 0.001,
+        verbose: bool = True,
+        logger_func=None,
+    ) -> None:
+        if mode not in ("deterministic", "sampling"):
+            raise ValueError(mode)
+        if isinstance(sort_keys, str):
+            sort_keys = (sort_keys,)
+        valid_sort_keys = (
+            self._sampling_sort_keys
+            if mode == "sampling"
+            else pstats.Stats.sort_arg_dict_default
+        )
+        for sort_key in sort_keys:
+            if sort_key not in valid_sort_keys:
+                raise ValueError(sort_key)
+        self._mode = mode
+        self._sort_keys = tuple(sort_keys)
+        self._limit = limit
+        self._output_directory = output_directory
+        self._name = name
+        self._interval = interval
+        self._verbose = bool(verbose)
+        self._logger_func = logger_func
+        self._output_path: Optional[Path] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._samples: collections.Counter = collections.Counter()
+
+    ### SPECIAL METHODS ###
+
     def __enter__(self) -> "Profiler":
-        self._profiler = cProfile.Profile()
-        self._profiler.enable()
+        output_directory = Path(self._output_directory or Path.cwd())
+        output_directory.mkdir(parents=True, exist_ok=True)
+        self._output_path = output_directory / "{}-{}-{}-{}{}".format(
+            self._name,
+            time.strftime("%Y%m%d-%H%M%S"),
+            os.getpid(),
+            next(self._counter),
+            ".prof" if self._mode == "deterministic" else ".collapsed",
+        )
+        if self._mode == "deterministic":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+            return self
+        if not hasattr(signal, "setitimer"):
+            raise RuntimeError("Sampling requires signal.setitimer()")
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("Sampling requires the main thread")
+        if signal.getitimer(signal.ITIMER_PROF)[0]:
+            raise RuntimeError("Another sampling profiler is active")
+        self._samples.clear()
+        self._entry_frame = sys._getframe(1)
+        self._sample_time = time.process_time_ns()
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self._interval, self._interval)
         return self
 
     def __exit__(self, exc_type, exc_value, traceback) -> None:
-        self._profiler.disable()
-        stream = io.StringIO()
-        profiler_stats = pstats.Stats(self._profiler, stream=stream)
-        profiler_stats = profiler_stats.sort_stats("cumulative")
-        profiler_stats.print_stats()
-        print(stream.getvalue())
-        profiler_stats.dump_stats("stats.profile")
+        assert self._output_path is not None
+        if self._mode == "deterministic":
+            assert self._profiler is not None
+            self._profiler.disable()
+            self._profiler.dump_stats(self._output_path)
+        else:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler)
+            del self._entry_frame
+            with open(self._output_path, "w") as file_pointer:
+                for stack, count in self._samples.items():
+                    labels = (self._label_code(_).replace(";", ",") for _ in stack)
+                    print(";".join(labels), count, file=file_pointer)
+        if self._verbose:
+            (self._logger_func or print)(self.report())
+
+    ### PRIVATE METHODS ###
+
+    @staticmethod
+    def _label(filename: str, line_number: int, function_name: str) -> str:
+        return f"{filename}:{line_number}({function_name})"
+
+    @classmethod
+    def _label_code(cls, code) -> str:
+        return cls._label(
+            code.co_filename,
+            code.co_firstlineno,
+            getattr(code, "co_qualname", code.co_name),
+        )
+
+    def _sample(self, signal_number, frame) -> None:
+        # Signals arrive between bytecodes, so ticks elapsing inside one long
+        # C call coalesce into a single signal: weight each sample by the CPU
+        # time since the last.
+        sample_time = time.process_time_ns()
+        ticks = max(1, round((sample_time - self._sample_time) / 1e9 / self._interval))
+        self._sample_time = sample_time
+        stack = []
+        while frame is not None:
+            stack.append(frame.f_code)
+            if frame is self._entry_frame:
+                break
+            frame = frame.f_back
+        stack.reverse()
+        self._samples[tuple(stack)] += ticks
+
+    def _sampled_functions(self) -> List[Dict[str, Any]]:
+        self_counts: collections.Counter = collections.Counter()
+        cumulative_counts: collections.Counter = collections.Counter()
+        for stack, count in self._samples.items():
+            self_counts[stack[-1]] += count
+            for code in set(stack):
+                cumulative_counts[code] += count
+        functions: List[Dict[str, Any]] = [
+            {
+                "function": self._label_code(code),
+                "calls": None,
+                "self": self_counts[code] * self._interval,
+                "cumulative": count * self._interval,
+            }
+            for code, count in cumulative_counts.items()
+        ]
+        for sort_key in reversed(self._sort_keys):
+            field = self._sampling_sort_keys[sort_key]
+            functions.sort(key=lambda x: x[field], reverse=field != "function")
+        return functions[: self._limit]
+
+    ### PUBLIC METHODS ###
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Summarize the profile: its mode and output path, and the top functions
+        with their call counts (``None`` when sampling), and self and cumulative
+        times in seconds.
+        """
+        if self._mode == "sampling":
+            functions = self._sampled_functions()
+        else:
+            stats = self.stats
+            functions = []
+            if stats is not None:
+                stats.sort_stats(*self._sort_keys)
+                for key in stats.fcn_list[: self._limit]:  # type: ignore
+                    _, calls, self_time, cumulative_time, _ = stats.stats[key]  # type: ignore
+                    functions.append(
+                        {
+                            "function": self._label(*key),
+                            "calls": calls,
+                            "self": self_time,
+                            "cumulative": cumulative_time,
+                        }
+                    )
+        return {
+            "mode": self._mode,
+            "output_path": str(self._output_path) if self._output_path else None,
+            "functions": functions,
+        }
+
+    def report(self) -> str:
+        """
+        Render the profile as text.
+        """
+        if self._mode == "deterministic":
+            stats = self.stats
+            if stats is None:
+                return ""
+            stream = io.StringIO()
+            stats.stream = stream  # type: ignore
+            stats.sort_stats(*self._sort_keys)
+            stats.print_stats(*([self._limit] if self._limit is not None else []))
+            return stream.getvalue()
+        lines = [
+            "{:.3f}s sampled every {}s".format(
+                sum(self._samples.values()) * self._interval, self._interval
+            ),
+            "{:>10} {:>11}  function".format("self", "cumulative"),
+        ]
+        for function in self._sampled_functions():
+            lines.append(
+                "{:>9.3f}s {:>10.3f}s  {}".format(
+                    function["self"], function["cumulative"], function["function"]
+                )
+            )
+        return "\n".join(lines)
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    @property
+    def output_path(self) -> Optional[Path]:
+        return self._output_path
+
+    @property
+    def samples(self) -> collections.Counter:
+        """
+        The sampled stacks, outermost frame first, mapped to how many sampling
+        intervals each was seen for.
+        """
+        return self._samples
+
+    @property
+    def stats(self) -> Optional[pstats.Stats]:
+        if self._profiler is None:
+            return None
+        return pstats.Stats(self._profiler)
+
+
+class _ContextStream:
+    """
+    A stand-in for ``sys.stdout`` or ``sys.stderr`` which writes to the
+    stream redirected to in the current context, if any, and otherwise to the
+    stream it replaced.
+    """
+
+    def __init__(
+        self, fallback: Any, variable: contextvars.ContextVar[Optional[Any]]
+    ) -> None:
+        self._fallback = fallback
+        self._variable = variable
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target(), name)
+
+    def _target(self) -> Any:
+        stream = self._variable.get()
+        return self._fallback if stream is None else stream
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def write(self, string: str) -> int:
+        return self._target().write(string)
 
 
 class RedirectedStreams:
@@ -103,19 +782,66 @@ class RedirectedStreams:
             >>> print(result)
             hello, world!
 
+    By default, ``sys.stdout`` and ``sys.stderr`` are swapped out for the
+    whole process. With ``per_context=True`` they're swapped out only for the
+    current :py:mod:`contextvars` context, so concurrent asyncio tasks, each
+    running in its own context, can capture their own output without
+    interfering:
+
+    ..  container:: example
+
+        ::
+
+            >>> import asyncio
+            >>> async def shout(name):
+            ...     buffer_ = uqbar.io.CaptureBuffer()
+            ...     with uqbar.io.RedirectedStreams(stdout=buffer_, per_context=True):
+            ...         for _ in range(3):
+            ...             print(name.upper())
+            ...             await asyncio.sleep(0)
+            ...     return buffer_.getvalue().split()
+            ...
+            >>> async def main():
+            ...     return await asyncio.gather(shout("foo"), shout("bar"))
+            ...
+            >>> asyncio.run(main())
+            [['FOO', 'FOO', 'FOO'], ['BAR', 'BAR', 'BAR']]
+
+    Contexts aren't shared with new threads, so output from threads started
+    during a per-context redirection isn't captured.
+
     This context manager is not reentrant. Use a separate instance when nesting
     multiple timers.
     """
 
+    ### CLASS VARIABLES ###
+
+    _context_count = 0
+
+    _context_lock = threading.Lock()
+
+    _stderr_variable: contextvars.ContextVar[Optional[Any]]
+    _stderr_variable = contextvars.ContextVar(
+        "uqbar.io.RedirectedStreams._stderr_variable", default=None
+    )
+
+    _stdout_variable: contextvars.ContextVar[Optional[Any]]
+    _stdout_variable = contextvars.ContextVar(
+        "uqbar.io.RedirectedStreams._stdout_variable", default=None
+    )
+
     ### INITIALIZER ###
 
-    def __init__(self, stdout=None, stderr=None):
+    def __init__(self, stdout=None, stderr=None, per_context=False):
         self._stdout = stdout or sys.stdout
         self._stderr = stderr or sys.stderr
+        self._per_context = bool(per_context)
 
     ### SPECIAL METHODS ###
 
     def __enter__(self):
+        if self._per_context:
+            return self._enter_context()
         self._old_stdout, self._old_stderr = sys.stdout, sys.stderr
         self._old_stdout.flush()
         self._old_stderr.flush()
@@ -123,6 +849,8 @@ class RedirectedStreams:
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
+        if self._per_context:
+            return self._exit_context()
         try:
             self._stdout.flush()
             self._stderr.flush()
@@ -130,8 +858,50 @@ class RedirectedStreams:
             sys.stdout = self._old_stdout
             sys.stderr = self._old_stderr
 
+    ### PRIVATE METHODS ###
+
+    def _enter_context(self):
+        with self._context_lock:
+            if not RedirectedStreams._context_count:
+                sys.stdout = _ContextStream(sys.stdout, self._stdout_variable)
+                sys.stderr = _ContextStream(sys.stderr, self._stderr_variable)
+            RedirectedStreams._context_count += 1
+        # Redirecting to the stand-ins themselves would loop forever.
+        if isinstance(self._stdout, _ContextStream):
+            self._stdout = self._stdout._target()
+        if isinstance(self._stderr, _ContextStream):
+            self._stderr = self._stderr._target()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        self._tokens = (
+            self._stdout_variable.set(self._stdout),
+            self._stderr_variable.set(self._stderr),
+        )
+        return self
+
+    def _exit_context(self):
+        try:
+            self._stdout.flush()
+            self._stderr.flush()
+        finally:
+            stdout_token, stderr_token = self._tokens
+            self._stdout_variable.reset(stdout_token)
+            self._stderr_variable.reset(stderr_token)
+            with self._context_lock:
+                RedirectedStreams._context_count -= 1
+                if not RedirectedStreams._context_count:
+                    # Leave alone any streams swapped in since.
+                    if isinstance(sys.stdout, _ContextStream):
+                        sys.stdout = sys.stdout._fallback
+                    if isinstance(sys.stderr, _ContextStream):
+                        sys.stderr = sys.stderr._fallback
+
     ### PUBLIC PROPERTIES ###
 
+    @property
+    def per_context(self):
+        return self._per_context
+
     @property
     def stderr(self):
         return self._stderr
@@ -145,12 +915,16 @@ class Timer:
     """
     A context manager for timing blocks of code.
 
-    This context manager is not reentrant. Use a separate instance when nesting
-    multiple timers.
+    This context manager is reentrant: the same instance may be nested, or
+    entered concurrently from several threads or asyncio tasks.
 
     :param exit_message: message to print on entering the context
     :param enter_message: message to print on exiting the context
     :param verbose: whether to print output
+    :param name: if given, record each span in ``registry``, under this name
+        prefixed by the names of any enclosing named spans
+    :param registry: the registry to record spans in, defaulting to the
+        process-wide :py:attr:`Timer.registry`
 
     ::
 
@@ -164,13 +938,46 @@ class Timer:
         Looping!
         Elapsed time: 0.0...
 
+    Named timers nest, and are aggregated per name:
+
+    ::
+
+        >>> from uqbar.io import TimerRegistry
+        >>> registry = TimerRegistry()
+        >>> for _ in range(3):
+        ...     with Timer(name="build", registry=registry):
+        ...         with Timer(name="parse", registry=registry):
+        ...             pass
+        ...         with Timer(name="write", registry=registry):
+        ...             pass
+        ...
+        >>> for name, statistics in registry.as_dict().items():
+        ...     print(name, statistics["count"])
+        ...
+        build 3
+        build/parse 3
+        build/write 3
+
     """
 
+    ### CLASS VARIABLES ###
+
+    registry: ClassVar["TimerRegistry"]
+
+    # The innermost span open in the current thread or task, as a linked list
+    # of (timer, slash-joined name path, start time, enclosing span) nodes.
+    _span: contextvars.ContextVar[Optional[tuple]]
+    _span = contextvars.ContextVar("uqbar.io.Timer._span", default=None)
+
+    ### INITIALIZER ###
+
     def __init__(
         self,
         exit_message: Optional[str] = None,
         enter_message: Optional[str] = None,
         verbose: bool = True,
+        name: Optional[str] = None,
+        registry: Optional["TimerRegistry"] = None,
     ) -> None:
         if enter_message is not None:
             enter_message = str(enter_message)
@@ -178,32 +985,59 @@ class Timer:
         if exit_message is not None:
             exit_message = str(exit_message)
         self._exit_message = exit_message
-        self._start_time: Optional[float] = None
-        self._stop_time: Optional[float] = None
+        self._name = name
+        self._registry = registry
+        self._start_time: Optional[int] = None
+        self._stop_time: Optional[int] = None
         self._verbose = bool(verbose)
 
     ### SPECIAL METHODS ###
 
     def __enter__(self) -> "Timer":
-        if self.enter_message and self.verbose:
-            print(self.enter_message)
+        if self._enter_message and self._verbose:
+            print(self._enter_message)
+        span = self._span.get()
+        path = span[1] if span is not None else ""
+        if self._name is not None:
+            path = f"{path}/{self._name}" if path else self._name
         self._stop_time = None
-        self._start_time = time.time()
+        self._start_time = start_time = time.perf_counter_ns()
+        self._span.set((self, path, start_time, span))
         return self
 
     def __exit__(self, exc_type, exc_value, traceback) -> None:
-        self._stop_time = time.time()
-        if self.exit_message and self.verbose:
-            print(self.exit_message, self.elapsed_time)
+        stop_time = time.perf_counter_ns()
+        # Timers normally exit innermost first, but find this timer's span
+        # wherever it is, and keep any spans still open inside it.
+        inner_spans = []
+        span = self._span.get()
+        while span is not None and span[0] is not self:
+            inner_spans.append(span)
+            span = span[3]
+        if span is None:
+            if exc_type is not None:
+                # Don't mask the exception already propagating.
+                return
+            raise RuntimeError("Timer exited in a context where it was not entered")
+        _, path, start_time, enclosing_span = span
+        for inner_span in reversed(inner_spans):
+            enclosing_span = (*inner_span[:3], enclosing_span)
+        self._span.set(enclosing_span)
+        self._start_time, self._stop_time = start_time, stop_time
+        if self._name is not None:
+            registry = self._registry if self._registry is not None else self.registry
+            registry.record(path, stop_time - start_time)
+        if self._exit_message and self._verbose:
+            print(self._exit_message, self.elapsed_time)
 
     ### PUBLIC PROPERTIES ###
 
     @property
     def elapsed_time(self) -> Union[float, None]:
-        if self.start_time is not None:
-            if self.stop_time is not None:
-                return self.stop_time - self.start_time
-            return time.time() - self.start_time
+        if self._start_time is not None:
+            if self._stop_time is not None:
+                return (self._stop_time - self._start_time) / 1e9
+            return (time.perf_counter_ns() - self._start_time) / 1e9
         return None
 
     @property
@@ -214,19 +1048,236 @@ class Timer:
     def exit_message(self) -> Union[str, None]:
         return self._exit_message
 
+    @property
+    def name(self) -> Union[str, None]:
+        return self._name
+
     @property
     def start_time(self) -> Union[float, None]:
-        return self._start_time
+        if self._start_time is not None:
+            return self._start_time / 1e9
+        return None
 
     @property
     def stop_time(self) -> Union[float, None]:
-        return self._stop_time
+        if self._stop_time is not None:
+            return self._stop_time / 1e9
+        return None
 
     @property
     def verbose(self) -> bool:
         return self._verbose
 
 
+class TimerRegistry:
+    """
+    A thread-safe aggregate of named :py:class:`Timer` spans.
+
+    Spans are keyed by their name, prefixed by the names of their enclosing
+    named spans and joined with slashes. Counts, totals and maxima are exact.
+    Percentiles are exact for up to ``sample_size`` spans per name, and beyond
+    that are estimated from a uniform random sample of that many durations, so
+    memory stays bounded however many spans are recorded.
+
+    ::
+
+        >>> from uqbar.io import TimerRegistry
+        >>> registry = TimerRegistry()
+        >>> for duration in [3, 1, 2]:
+        ...     registry.record("build", duration * 1_000_000)
+        ...
+        >>> registry.as_dict()
+        {'build': {'count': 3, 'total': 0.006, 'p50': 0.002, 'p95': 0.003, 'max': 0.003}}
+
+    :param sample_size: how many durations to keep per name for estimating
+        percentiles
+    """
+
+    ### INITIALIZER ###
+
+    def __init__(self, sample_size: int = 1024) -> None:
+        if sample_size < 1:
+            raise ValueError(sample_size)
+        # Name to [count, total, maximum, sampled durations].
+        self._durations: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random()
+        self._sample_size = sample_size
+
+    ### SPECIAL METHODS ###
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._durations
+
+    def __len__(self) -> int:
+        return len(self._durations)
+
+    ### PUBLIC METHODS ###
+
+    def as_dict(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """
+        Summarize each span name's count, and total, median, 95th percentile and
+        maximum durations in seconds, sorted by name, so spans follow their
+        parents.
+        """
+        with self._lock:
+            items = [
+                (name, count, total, maximum, sorted(sample))
+                for name, (count, total, maximum, sample) in self._durations.items()
+            ]
+        result = {}
+        for name, count, total, maximum, sample in sorted(
+            items, key=lambda x: x[0].split("/")
+        ):
+            result[name] = {
+                "count": count,
+                "total": total / 1e9,
+                "p50": sample[math.ceil(len(sample) * 0.5) - 1] / 1e9,
+                "p95": sample[math.ceil(len(sample) * 0.95) - 1] / 1e9,
+                "max": maximum / 1e9,
+            }
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._durations.clear()
+
+    def record(self, name: str, duration: int) -> None:
+        """
+        Record a span's duration, in nanoseconds.
+        """
+        with self._lock:
+            statistics = self._durations.get(name)
+            if statistics is None:
+                self._durations[name] = [1, duration, duration, [duration]]
+                return
+            statistics[0] += 1
+            statistics[1] += duration
+            if duration > statistics[2]:
+                statistics[2] = duration
+            sample = statistics[3]
+            if len(sample) < self._sample_size:
+                sample.append(duration)
+            else:
+                # Reservoir sampling: keep each duration with equal probability.
+                index = self._random.randrange(statistics[0])
+                if index < self._sample_size:
+                    sample[index] = duration
+
+    def report(self) -> str:
+        """
+        Render the summary as a table, indenting each span under its parent.
+        """
+        lines = []
+        for name, statistics in self.as_dict().items():
+            depth = name.count("/")
+            label = "  " * depth + name.rpartition("/")[-1]
+            lines.append(
+                "{:<40} {:>7} {:>10.4f}s {:>10.4f}s {:>10.4f}s {:>10.4f}s".format(
+                    label,
+                    statistics["count"],
+                    statistics["total"],
+                    statistics["p50"],
+                    statistics["p95"],
+                    statistics["max"],
+                )
+            )
+        header = "{:<40} {:>7} {:>11} {:>11} {:>11} {:>11}".format(
+            "name", "count", "total", "p50", "p95", "max"
+        )
+        return "\n".join([header, *lines])
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Serialize the summary to JSON, passing ``kwargs`` to
+        :py:func:`json.dumps`.
+        """
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+Timer.registry = TimerRegistry()
+
+
+@dataclasses.dataclass(frozen=True)
+class WriteReport:
+    """
+    The outcome of :py:func:`write_many`.
+
+    :param written: paths which did not exist
+    :param rewritten: paths which existed with different contents
+    :param preserved: paths which already held the same contents
+    """
+
+    written: Tuple[Path, ...] = ()
+    rewritten: Tuple[Path, ...] = ()
+    preserved: Tuple[Path, ...] = ()
+
+
+def _encode(contents: str) -> bytes:
+    # Match the bytes Path.write_text() would have written.
+    if os.linesep != "\n":
+        contents = contents.replace("\n", os.linesep)
+    encoding = "utf-8" if sys.flags.utf8_mode else locale.getpreferredencoding(False)
+    return contents.encode(encoding)
+
+
+def _file_equals(path: Path, data: bytes, chunk_size: int = 1 << 20) -> bool:
+    # Sizes are already known to match, so read exactly that much.
+    with open(path, "rb") as file_pointer:
+        for offset in range(0, len(data), chunk_size):
+            chunk = data[offset : offset + chunk_size]
+            if file_pointer.read(len(chunk)) != chunk:
+                return False
+    return True
+
+
+def _write_atomically(path: Path, contents: str) -> str:
+    data = _encode(contents)
+    # Write through symlinks, replacing the file they point to.
+    path = Path(os.path.realpath(path))
+    try:
+        stat_result: Optional[os.stat_result] = os.stat(path)
+    except FileNotFoundError:
+        stat_result = None
+    if (
+        stat_result is not None
+        and stat_result.st_size == len(data)
+        and _file_equals(path, data)
+    ):
+        return "preserved"
+    if stat_result is not None and stat_result.st_nlink > 1:
+        # Replacing a hardlinked file would unlink it from its other names.
+        with open(path, "wb") as file_pointer:
+            file_pointer.write(data)
+        return "rewritten"
+    # Create the temporary file ourselves, rather than via tempfile, so new
+    # files get the umask's permissions rather than 0o600.
+    while True:
+        temporary_path = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+        try:
+            file_descriptor = os.open(
+                temporary_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666
+            )
+            break
+        except FileExistsError:
+            continue
+    try:
+        with os.fdopen(file_descriptor, "wb") as file_pointer:
+            file_pointer.write(data)
+        if stat_result is not None:
+            os.chmod(temporary_path, stat.S_IMODE(stat_result.st_mode))
+            if hasattr(os, "chown"):
+                try:
+                    os.chown(temporary_path, stat_result.st_uid, stat_result.st_gid)
+                except PermissionError:
+                    pass  # Only privileged users may give files away.
+        os.replace(temporary_path, path)
+    except BaseException:
+        temporary_path.unlink(missing_ok=True)
+        raise
+    return "written" if stat_result is None else "rewritten"
+
+
 def find_common_prefix(paths: Sequence[Union[str, Path]]) -> Optional[Path]:
     """
     Find the common prefix of two or more paths.
@@ -260,6 +1311,82 @@ def find_common_prefix(paths: Sequence[Union[str, Path]]) -> Optional[Path]:
     return None
 
 
+class _ExecutableIndex:
+    """
+    The names in each ``PATH`` directory, scanned once and rescanned only
+    when ``PATH`` or the directory's modification time changes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._path = ""
+        self._path_extensions = ""
+        self._directory_names: List[str] = []
+        self._extensions: List[str] = []
+        self._entries: Dict[str, Tuple[int, Set[str]]] = {}
+
+    def _scan(self, directory_path: str) -> Optional[Set[str]]:
+        try:
+            mtime = os.stat(directory_path).st_mtime_ns
+        except OSError:
+            self._entries.pop(directory_path, None)
+            return None
+        entry = self._entries.get(directory_path)
+        if entry is None or entry[0] != mtime:
+            try:
+                with os.scandir(directory_path) as iterator:
+                    names = {os.path.normcase(_.name) for _ in iterator}
+            except OSError:
+                names = set()
+            entry = self._entries[directory_path] = (mtime, names)
+        return entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._path = self._path_extensions = ""
+            self._directory_names.clear()
+            self._extensions.clear()
+            self._entries.clear()
+
+    def find(self, names: Sequence[str], flags: int) -> Dict[str, List[str]]:
+        with self._lock:
+            path = os.environ.get("PATH", "")
+            path_extensions = os.environ.get("PATHEXT", "")
+            if (path, path_extensions) != (self._path, self._path_extensions):
+                self._path, self._path_extensions = path, path_extensions
+                self._directory_names = path.split(os.pathsep)
+                self._extensions = [_ for _ in path_extensions.split(os.pathsep) if _]
+                self._entries.clear()
+            # Names with a directory part aren't in any listing, so always
+            # check those.
+            candidates = [
+                (
+                    name,
+                    candidate,
+                    os.path.normcase(candidate),
+                    os.path.basename(candidate) != candidate,
+                )
+                for name in names
+                for candidate in [name]
+                + [str(Path(name).with_suffix(_)) for _ in self._extensions]
+            ]
+            found: Dict[str, List[str]] = {name: [] for name in names}
+            for directory_name in self._directory_names:
+                directory_path = os.path.abspath(directory_name or ".")
+                directory_entries = self._scan(directory_path)
+                if not directory_entries:
+                    continue
+                for name, candidate, normalized, has_directory in candidates:
+                    if normalized in directory_entries or has_directory:
+                        executable_path = Path(directory_path, candidate).resolve()
+                        if os.access(executable_path, flags):
+                            found[name].append(str(executable_path))
+        return found
+
+
+_executable_index = _ExecutableIndex()
+
+
 def find_executable(name: str, flags=os.X_OK) -> List[str]:
     """
     Finds executable `name`.
@@ -267,19 +1394,37 @@ def find_executable(name: str, flags=os.X_OK) -> List[str]:
     Similar to Unix ``which`` command.
 
     Returns list of zero or more full paths to `name`.
+
+    ``PATH`` directories are listed once and cached, and relisted only when
+    ``PATH`` or ``PATHEXT`` change, or when a directory's modification time
+    does.
+    """
+    return _executable_index.find([name], flags)[name]
+
+
+def find_executables(names: Sequence[str], flags=os.X_OK) -> Dict[str, List[str]]:
+    """
+    Finds several executables at once.
+
+    Returns a dictionary of each of `names` to a list of zero or more full
+    paths, as per :py:func:`find_executable`.
+
+    ::
+
+        >>> import sys
+        >>> from pathlib import Path
+        >>> from uqbar.io import find_executables
+        >>> found = find_executables(["python", "no-such-executable"])
+        >>> str(Path(sys.executable).resolve()) in found["python"]
+        True
+
+    ::
+
+        >>> found["no-such-executable"]
+        []
+
     """
-    result = []
-    extensions = [x for x in os.environ.get("PATHEXT", "").split(os.pathsep) if x]
-    for directory_name in os.environ.get("PATH", "").split(os.pathsep):
-        executable_path = Path(directory_name) / name
-        executable_path = executable_path.resolve().absolute()
-        if os.access(executable_path, flags):
-            result.append(str(executable_path))
-        for extension in extensions:
-            extension_path = executable_path.with_suffix(extension)
-            if os.access(extension_path, flags):
-                result.append(str(extension_path))
-    return result
+    return _executable_index.find(list(names), flags)
 
 
 def open_path(path: Path) -> None:
@@ -333,31 +1478,175 @@ def relative_to(source_path: Union[str, Path], target_path: Union[str, Path]) ->
     return result / target_path
 
 
+def _compile_patterns(
+    patterns: Optional[Sequence[str]],
+) -> Optional[Callable[[str], bool]]:
+    if patterns is None:
+        return None
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    regex = re.compile(
+        "|".join(fnmatch.translate(os.path.normcase(_)) for _ in patterns) or "(?!)"
+    )
+    return lambda name: regex.match(os.path.normcase(name)) is not None
+
+
+def _scan_directory(
+    directory_path: Path,
+    include: Optional[Callable[[str], bool]],
+    exclude: Optional[Callable[[str], bool]],
+    symlinks: str,
+    ancestry: FrozenSet[Tuple[int, int]] = frozenset(),
+) -> Tuple[List[Path], List[Path], Set[Path], FrozenSet[Tuple[int, int]]]:
+    directory_paths: List[Path] = []
+    file_paths: List[Path] = []
+    leaf_paths: Set[Path] = set()
+    real_directory_path = None
+    if symlinks == "follow":
+        # The identities of every directory on the path walked so far, so that
+        # links into any of them, directly or not, aren't followed.
+        stat_result = os.stat(directory_path)
+        ancestry = ancestry | {(stat_result.st_dev, stat_result.st_ino)}
+    with os.scandir(directory_path) as iterator:
+        entries = sorted(iterator, key=lambda x: x.name)
+    for entry in entries:
+        if exclude is not None and exclude(entry.name):
+            continue
+        is_symlink = entry.is_symlink()
+        if is_symlink and symlinks == "skip":
+            continue
+        # DirEntry caches its type from the directory listing, so only
+        # symlinks cost an extra stat here.
+        if entry.is_dir():
+            path = directory_path / entry.name
+            directory_paths.append(path)
+            if not is_symlink:
+                continue
+            if symlinks == "list":
+                leaf_paths.add(path)
+                continue
+            # Don't follow links back up into the directory being walked, or
+            # into any directory already on the walked path.
+            stat_result = entry.stat()
+            if (stat_result.st_dev, stat_result.st_ino) in ancestry:
+                leaf_paths.add(path)
+                continue
+            if real_directory_path is None:
+                real_directory_path = os.path.realpath(directory_path)
+            real_path = os.path.realpath(entry.path)
+            if os.path.commonpath([real_directory_path, real_path]) == real_path:
+                leaf_paths.add(path)
+        elif include is None or include(entry.name):
+            file_paths.append(directory_path / entry.name)
+    return directory_paths, file_paths, leaf_paths, ancestry
+
+
 def walk(
-    root_path: Union[str, Path], top_down: bool = True
-) -> Generator[Tuple[Path, Sequence[Path], Sequence[Path]], None, None]:
+    root_path: Union[str, Path],
+    top_down: bool = True,
+    *,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    symlinks: str = "follow",
+    max_workers: Optional[int] = None,
+) -> Generator[Tuple[Path, List[Path], List[Path]], None, None]:
     """
     Walks a directory tree.
 
     Like :py:func:`os.walk` but yielding instances of :py:class:`Path`
-    instead of strings.
+    instead of strings, with directory and file paths sorted by name.
+
+    ::
 
-    :param root_path: foo
-    :param top_down: bar
+        >>> import tempfile
+        >>> import uqbar.io
+        >>> with tempfile.TemporaryDirectory() as temporary_directory:
+        ...     root_path = Path(temporary_directory)
+        ...     for path in ["b/c.py", "b/d.txt", "a.py", "e/f.py"]:
+        ...         (root_path / path).parent.mkdir(exist_ok=True)
+        ...         (root_path / path).touch()
+        ...     for directory_path, _, file_paths in uqbar.io.walk(
+        ...         root_path, include=["*.py"], exclude=["e"]
+        ...     ):
+        ...         print(
+        ...             directory_path.relative_to(root_path).as_posix(),
+        ...             [_.name for _ in file_paths],
+        ...         )
+        ...
+        . ['a.py']
+        b ['c.py']
+
+    Directories are listed with :py:func:`os.scandir`, whose entries cache
+    their type, so no per-entry ``stat`` is needed. As with
+    :py:func:`os.walk`, removing paths from the yielded directory paths when
+    walking top-down prevents them from being walked.
+
+    :param root_path: the directory to walk
+    :param top_down: whether to yield directories before their subdirectories
+    :param include: glob patterns; if given, only list files whose names match
+        one of them
+    :param exclude: glob patterns; neither list nor walk files or directories
+        whose names match one of them
+    :param symlinks: how to treat symbolic links: ``"follow"`` walks linked
+        directories, except links to a directory already on the path being
+        walked, which are listed but not walked; ``"list"`` lists linked
+        directories without walking them; ``"skip"`` omits links entirely
+    :param max_workers: if given, list directories ahead of time on a pool of
+        this many threads, for slow or networked file-systems; output order is
+        unchanged
     """
+    if symlinks not in ("follow", "list", "skip"):
+        raise ValueError(symlinks)
     root_path = Path(root_path)
-    directory_paths, file_paths = [], []
-    for path in sorted(root_path.iterdir()):
-        if path.is_dir():
-            directory_paths.append(path)
-        else:
-            file_paths.append(path)
-    if top_down:
-        yield root_path, directory_paths, file_paths
-    for directory_path in directory_paths:
-        yield from walk(directory_path, top_down=top_down)
-    if not top_down:
-        yield root_path, directory_paths, file_paths
+    scan_arguments = (_compile_patterns(include), _compile_patterns(exclude), symlinks)
+    executor = None
+    if max_workers is not None:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    futures: dict = {}
+
+    def scan(directory_path, ancestry):
+        if directory_path in futures:
+            return futures.pop(directory_path).result()
+        return _scan_directory(directory_path, *scan_arguments, ancestry)
+
+    def prefetch(directory_paths, leaf_paths, ancestry):
+        if executor is None:
+            return
+        for directory_path in directory_paths:
+            if directory_path not in leaf_paths:
+                futures[directory_path] = executor.submit(
+                    _scan_directory, directory_path, *scan_arguments, ancestry
+                )
+
+    try:
+        stack: List[
+            Tuple[
+                Path,
+                Optional[Tuple[List[Path], List[Path]]],
+                FrozenSet[Tuple[int, int]],
+            ]
+        ] = [(root_path, None, frozenset())]
+        while stack:
+            directory_path, listing, ancestry = stack.pop()
+            if listing is not None:
+                yield directory_path, listing[0], listing[1]
+                continue
+            directory_paths, file_paths, leaf_paths, ancestry = scan(
+                directory_path, ancestry
+            )
+            if top_down:
+                yield directory_path, directory_paths, file_paths
+            else:
+                stack.append((directory_path, (directory_paths, file_paths), ancestry))
+            prefetch(directory_paths, leaf_paths, ancestry)
+            stack.extend(
+                (_, None, ancestry)
+                for _ in reversed(directory_paths)
+                if _ not in leaf_paths
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
 
 
 def write(
@@ -371,28 +1660,81 @@ def write(
 
     Creates any intermediate missing directories.
 
+    New contents replace the file atomically, via :py:func:`write_many`:
+    symlinks are written through and hardlinks are preserved, but other
+    processes holding the old file open keep seeing its old contents.
+
     :param contents: the file contents to write
     :param path: the path to write to
     :param verbose: whether to print output
     """
+    report = write_many({path: contents}, verbose=verbose, logger_func=logger_func)
+    return not report.preserved
+
+
+def write_many(
+    mapping: Mapping[Union[str, Path], str],
+    verbose: bool = False,
+    logger_func=None,
+    max_workers: Optional[int] = None,
+) -> WriteReport:
+    """
+    Writes many files at once, mapping paths to contents.
+
+    As :py:func:`write`, only writes out new contents if the old contents do
+    not match, but compares file sizes before any contents, and compares
+    contents chunk by chunk without decoding. Changed files are written to a
+    temporary sibling and moved into place with :py:func:`os.replace`, so
+    readers never see a partial file. Symlinks are written through, replacing
+    the file they point to, and existing files keep their permissions and,
+    where allowed, their owner and group. Files with several hardlinks are
+    instead rewritten in place, so as not to break the links.
+
+    ::
+
+        >>> import tempfile
+        >>> import uqbar.io
+        >>> with tempfile.TemporaryDirectory() as temporary_directory:
+        ...     with uqbar.io.DirectoryChange(temporary_directory):
+        ...         _ = uqbar.io.write_many({"a/one.txt": "1", "a/two.txt": "2"})
+        ...         report = uqbar.io.write_many(
+        ...             {"a/one.txt": "1", "a/two.txt": "II", "b/three.txt": "3"},
+        ...             verbose=True,
+        ...         )
+        ...
+        preserved a/one.txt
+        rewrote a/two.txt
+        wrote b/three.txt
+
+    ::
+
+        >>> [path.as_posix() for path in report.rewritten]
+        ['a/two.txt']
+
+    Creates each missing parent directory once.
+
+    :param mapping: a mapping of paths to file contents
+    :param verbose: whether to print output, in mapping order
+    :param logger_func: the function to print output with
+    :param max_workers: if given, compare and write files on a pool of this many
+        threads, for slow or networked file-systems
+    """
     print_func = logger_func or print
-    path = Path(path)
-    printed_path = str(path).replace(os.path.sep, "/")  # same display on Windows
-    if path.exists():
-        old_contents = path.read_text()
-        if old_contents == contents:
-            if verbose:
-                print_func(f"preserved {printed_path}")
-            return False
-        else:
-            path.write_text(contents)
-            if verbose:
-                print_func(f"rewrote {printed_path}")
-            return True
-    elif not path.exists():
-        if not path.parent.exists():
-            path.parent.mkdir(parents=True)
-        path.write_text(contents)
+    items = {Path(path): contents for path, contents in mapping.items()}
+    for parent_path in sorted(set(path.parent for path in items)):
+        parent_path.mkdir(parents=True, exist_ok=True)
+    if max_workers is None or len(items) < 2:
+        statuses = [
+            _write_atomically(path, contents) for path, contents in items.items()
+        ]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            statuses = list(executor.map(_write_atomically, items, items.values()))
+    results: dict = {"written": [], "rewritten": [], "preserved": []}
+    verbs = {"written": "wrote", "rewritten": "rewrote", "preserved": "preserved"}
+    for path, status in zip(items, statuses):
+        results[status].append(path)
         if verbose:
-            print_func(f"wrote {printed_path}")
-    return True
+            printed_path = str(path).replace(os.path.sep, "/")  # same on Windows
+            print_func(f"{verbs[status]} {printed_path}")
+    return WriteReport(**{key: tuple(value) for key, value in results.items()})
@@ -1,13 +1,211 @@
-import collections
+import collections.abc
 import itertools
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
-def flatten(iterable):
-    for x in iterable:
-        if isinstance(x, collections.Iterable):
-            yield from flatten(x)
+
+class SequenceView:
+    """
+    A read-only view of a sequence, through a range of its indices.
+
+    Views copy nothing: indexing, iterating and slicing all map back onto the
+    underlying sequence, so changes to the sequence show through.
+
+    ::
+
+        >>> import uqbar.iterables
+        >>> view = uqbar.iterables.SequenceView(list(range(10)), 2, None, 3)
+        >>> view
+        SequenceView([2, 5, 8])
+
+    ::
+
+        >>> len(view), view[-1], view[1:]
+        (3, 8, SequenceView([5, 8]))
+
+    :param sequence: the sequence to view
+    :param start: the first index, as for a slice
+    :param stop: the index to stop before, as for a slice
+    :param step: the distance between indices, as for a slice
+    """
+
+    ### CLASS VARIABLES ###
+
+    __slots__ = ("_range", "_sequence")
+
+    ### INITIALIZER ###
+
+    def __init__(self, sequence, start=None, stop=None, step=None):
+        self._sequence = sequence
+        self._range = range(*slice(start, stop, step).indices(len(sequence)))
+
+    ### SPECIAL METHODS ###
+
+    def __contains__(self, expr):
+        return any(x is expr or x == expr for x in self)
+
+    def __getitem__(self, expr):
+        if isinstance(expr, slice):
+            view = type(self).__new__(type(self))
+            view._sequence = self._sequence
+            view._range = self._range[expr]
+            return view
+        return self._sequence[self._range[expr]]
+
+    def __iter__(self):
+        return map(self._sequence.__getitem__, self._range)
+
+    def __len__(self):
+        return len(self._range)
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, list(self))
+
+    def __reversed__(self):
+        return map(self._sequence.__getitem__, reversed(self._range))
+
+    ### PUBLIC METHODS ###
+
+    def count(self, expr):
+        return sum(1 for x in self if x is expr or x == expr)
+
+    def index(self, expr):
+        for i, x in enumerate(self):
+            if x is expr or x == expr:
+                return i
+        raise ValueError("{!r} not in {}".format(expr, type(self).__name__))
+
+    ### PUBLIC PROPERTIES ###
+
+    @property
+    def sequence(self):
+        return self._sequence
+
+
+collections.abc.Sequence.register(SequenceView)
+
+
+def _is_buffer(expr):
+    try:
+        memoryview(expr)
+    except TypeError:
+        return False
+    return True
+
+
+def _as_array(expr):
+    if numpy is None or isinstance(expr, (str, bytes)):
+        return None
+    if isinstance(expr, numpy.ndarray):
+        return expr
+    if isinstance(expr, collections.abc.Sequence):
+        try:
+            array = numpy.asarray(expr)
+        except ValueError:  # Ragged nesting.
+            return None
+        if array.dtype != object:
+            return array
+    return None
+
+
+def _sliding_window(iterator, n):
+    window = collections.deque(itertools.islice(iterator, n - 1), maxlen=n)
+    for x in iterator:
+        window.append(x)
+        yield tuple(window)
+
+
+def chunked(sequence, size):
+    """
+    Iterate a sequence in chunks of ``size`` items, without copying.
+
+    Objects supporting the buffer protocol, such as ``bytes``, ``bytearray``
+    and ``array.array``, are chunked into ``memoryview`` slices. Other
+    sequences are chunked into :py:class:`SequenceView` instances.
+
+    ::
+
+        >>> import uqbar.iterables
+        >>> list(uqbar.iterables.chunked("abcdefg", 3))
+        [SequenceView(['a', 'b', 'c']),
+         SequenceView(['d', 'e', 'f']),
+         SequenceView(['g'])]
+
+    ::
+
+        >>> [bytes(chunk) for chunk in uqbar.iterables.chunked(b"abcdefg", 3)]
+        [b'abc', b'def', b'g']
+
+    """
+    if size < 1:
+        raise ValueError("size must be positive: {!r}".format(size))
+    if _is_buffer(sequence):
+        view = memoryview(sequence)
+        for start in range(0, len(view), size):
+            yield view[start : start + size]
+        return
+    length = len(sequence)
+    for start in range(0, length, size):
+        view = SequenceView.__new__(SequenceView)
+        view._sequence = sequence
+        view._range = range(start, min(start + size, length))
+        yield view
+
+
+def flatten(iterable, atom_types=(str, bytes), max_depth=None):
+    """
+    Flatten nested iterables, depth-first.
+
+    ::
+
+        >>> import uqbar.iterables
+        >>> list(uqbar.iterables.flatten([1, [2, (3, 4)], "five", [[b"six"]]]))
+        [1, 2, 3, 4, 'five', b'six']
+
+    ::
+
+        >>> list(uqbar.iterables.flatten([1, [2, [3, [4]]]], max_depth=2))
+        [1, 2, 3, [4]]
+
+    Nesting is tracked with an explicit stack, so arbitrarily deep inputs do
+    not exhaust the recursion limit.
+
+    :param iterable: the iterable to flatten
+    :param atom_types: a type or tuple of types to yield whole instead of
+        iterating, ``str`` and ``bytes`` by default
+    :param max_depth: how many levels of nesting to flatten, or ``None`` to
+        flatten completely
+    """
+    if max_depth is not None and max_depth < 1:
+        yield from iterable
+        return
+    # Whether each type seen so far should be yielded whole.
+    atomic = {}
+    stack = [iter(iterable)]
+    while stack:
+        # Iterables found on the deepest flattened level are yielded from
+        # directly rather than pushed.
+        is_last_level = len(stack) == max_depth
+        for x in stack[-1]:
+            class_ = type(x)
+            is_atom = atomic.get(class_)
+            if is_atom is None:
+                is_atom = atomic[class_] = issubclass(
+                    class_, atom_types
+                ) or not isinstance(x, collections.abc.Iterable)
+            if is_atom or (isinstance(x, str) and len(x) == 1):
+                # Single characters iterate to themselves.
+                yield x
+            elif is_last_level:
+                yield from x
+            else:
+                stack.append(iter(x))
+                break
         else:
-            yield x
+            stack.pop()
 
 
 def group_by_count(iterable, count):
@@ -20,26 +218,109 @@ def group_by_count(iterable, count):
 
 
 def nwise(iterable, n=2):
-    iterables = itertools.tee(iterable, n)
-    temp = []
-    for idx, it in enumerate(iterables):
-        it = itertools.islice(it, idx, None)
-        temp.append(it)
-    return zip(*temp)
+    return sliding_window(iterable, n)
 
 
 def repeat_to_length(sequence, length):
-    for i, x in enumerate(itertools.cycle(sequence)):
-        if i >= length:
-            break
-        yield x
-
-
-def zip_cyclic(*args):
-    maximum_i = max(len(_) for _ in args) - 1
-    cycles = [itertools.cycle(_) for _ in args]
-    iterator = enumerate(zip(*cycles))
-    for i, result in iterator:
-        yield result
-        if i == maximum_i:
-            break
+    return itertools.islice(itertools.cycle(sequence), max(length, 0))
+
+
+def repeat_to_length_array(sequence, length):
+    """
+    Repeat a sequence cyclically to ``length`` items, as a NumPy array.
+
+    Arrays and sequences are gathered in one ``numpy.take()`` call, wrapping
+    indices modulo the sequence's length; multidimensional arrays repeat
+    along their first axis. When NumPy is unavailable, or ``sequence`` is
+    neither an array nor a sequence NumPy can convert to a homogeneous,
+    non-object array, falls back to :py:func:`repeat_to_length`.
+    """
+    array = _as_array(sequence)
+    if array is None:
+        return repeat_to_length(sequence, length)
+    if not len(array):
+        return array
+    return numpy.take(array, numpy.arange(max(length, 0)), axis=0, mode="wrap")
+
+
+def sliding_window(iterable, n=2):
+    """
+    Iterate overlapping windows of ``n`` consecutive items, as tuples.
+
+    ::
+
+        >>> import uqbar.iterables
+        >>> list(uqbar.iterables.sliding_window(range(5), 3))
+        [(0, 1, 2), (1, 2, 3), (2, 3, 4)]
+
+    Sequences are windowed by index, with one independent iterator per
+    offset. Other iterables are consumed once: small windows through
+    ``itertools.tee``, and larger windows, where tee's per-copy buffering
+    dominates, through a bounded ``collections.deque``.
+    """
+    if n < 1:
+        return iter(())
+    if isinstance(iterable, collections.abc.Sequence):
+        iterables = [iterable] * n
+    elif n < 64:
+        iterables = itertools.tee(iterable, n)
+    else:
+        return _sliding_window(iter(iterable), n)
+    return zip(*(itertools.islice(x, i, None) for i, x in enumerate(iterables)))
+
+
+def strided(sequence, step, start=0):
+    """
+    View every ``step``-th item of a sequence, beginning at ``start``,
+    without copying.
+
+    Objects supporting the buffer protocol are viewed through a
+    ``memoryview``, and other sequences through a :py:class:`SequenceView`.
+
+    ::
+
+        >>> import uqbar.iterables
+        >>> uqbar.iterables.strided(list(range(10)), 4, start=1)
+        SequenceView([1, 5, 9])
+
+    """
+    if _is_buffer(sequence):
+        return memoryview(sequence)[start::step]
+    return SequenceView(sequence, start, None, step)
+
+
+def zip_cyclic(*args, length=None):
+    if length is None:
+        length = max(map(len, args))
+    return itertools.islice(zip(*map(itertools.cycle, args)), max(length, 0))
+
+
+def zip_cyclic_arrays(*args, length=None):
+    """
+    Repeat each argument cyclically to a common length, as NumPy arrays.
+
+    Where :py:func:`zip_cyclic` yields one tuple per index, this returns one
+    array per argument: columns rather than rows. The common length is that
+    of the longest argument, unless ``length`` is given, in which case no
+    argument's length is computed. Any empty argument empties every array.
+    When NumPy is unavailable, or any argument can't be converted as for
+    :py:func:`repeat_to_length_array`, falls back to :py:func:`zip_cyclic`,
+    returning one tuple per argument instead.
+
+    ::
+
+        >>> import uqbar.iterables
+        >>> uqbar.iterables.zip_cyclic_arrays(iter([1, 2]), "abc", length=3)
+        ((1, 2, 1), ('a', 'b', 'c'))
+
+    """
+    arrays = [_as_array(_) for _ in args]
+    if not arrays or any(_ is None for _ in arrays):
+        rows = list(zip_cyclic(*args, length=length))
+        return tuple(tuple(row[i] for row in rows) for i in range(len(args)))
+    if length is None:
+        length = max(map(len, arrays))
+    if not all(map(len, arrays)):
+        length = 0
+    indices = numpy.arange(max(length, 0))
+    return tuple(numpy.take(_, indices, axis=0, mode="wrap") for _ in arrays)
@@ -29,6 +29,23 @@ This extension provides the following configuration values:
     list of class paths to extensions, e.g.
     ``["uqbar.book.extensions.GraphExtension"]``
 
+``uqbar_book_max_output_size``:
+    the most bytes of output to capture from each literal block, or ``None``
+    for no limit; output beyond that is replaced with a truncation marker
+
+``uqbar_book_profile``:
+    what to profile, writing one profile per run: ``"doctree-read"`` for
+    each document's ``doctree-read`` handling, ``"suite"`` for each suite of
+    literal blocks, or ``False`` for nothing
+
+``uqbar_book_profile_directory``:
+    where to write profiles, defaulting to a ``uqbar-profiles`` directory
+    beside the doctree directory
+
+``uqbar_book_profile_mode``:
+    how to profile, ``"deterministic"`` or ``"sampling"``, as for
+    :py:class:`uqbar.io.Profiler`
+
 ``uqbar_book_strict``:
     whether to fail the Sphinx build on encountering an unexpected error
 
@@ -42,7 +59,10 @@ This extension provides the following configuration values:
 """
 
 import asyncio
+import contextlib
 import importlib
+import pathlib
+import re
 from typing import Any, Dict
 
 from docutils.nodes import SkipNode
@@ -67,10 +87,33 @@ from ..book import (
     uqbar_book_defaults_block,
     uqbar_book_import_block,
 )
+from ..io import Profiler
 
 logger = logging.getLogger(__name__)
 
 
+@contextlib.contextmanager
+def maybe_profile(app, scope, name):
+    """
+    Profiles the block if ``uqbar_book_profile`` selects ``scope``.
+    """
+    if app.config["uqbar_book_profile"] != scope:
+        yield
+        return
+    output_directory = app.config["uqbar_book_profile_directory"] or (
+        pathlib.Path(app.doctreedir).parent / "uqbar-profiles"
+    )
+    with Profiler(
+        mode=app.config["uqbar_book_profile_mode"],
+        name=re.sub(r"[^\w.-]+", "-", f"{scope}-{name}").strip("-"),
+        output_directory=output_directory,
+        verbose=False,
+    ) as profiler:
+        yield
+    logger.info(bold("[uqbar-book]"), nonl=True)
+    logger.info(" profiled {} {}: {}".format(scope, name, profiler.output_path))
+
+
 def on_builder_inited(app):
     """
     Hooks into Sphinx's ``builder-inited`` event.
@@ -117,6 +160,14 @@ def on_doctree_read(app, document):
     """
     Hooks into Sphinx's ``doctree-read`` event.
     """
+    with maybe_profile(app, "doctree-read", app.env.docname):
+        read_doctree(app, document)
+
+
+def read_doctree(app, document):
+    """
+    Interprets a document's literal blocks and rebuilds it with their output.
+    """
     literal_blocks = collect_literal_blocks(document)
     cache_mapping = group_literal_blocks_by_cache_path(literal_blocks)
     node_mapping = {}
@@ -124,6 +175,7 @@ def on_doctree_read(app, document):
     kwargs = dict(
         document=document,
         extensions=app.uqbar_book_extensions,
+        max_output_size=app.config["uqbar_book_max_output_size"],
         setup_lines=app.config["uqbar_book_console_setup"],
         teardown_lines=app.config["uqbar_book_console_teardown"],
         use_black=bool(app.config["uqbar_book_use_black"]),
@@ -133,14 +185,15 @@ def on_doctree_read(app, document):
         for cache_path, literal_block_groups in cache_mapping.items():
             for literal_blocks in literal_block_groups:
                 try:
-                    if use_cache:
-                        local_node_mapping = await interpret_code_blocks_with_cache(
-                            literal_blocks, cache_path, app.connection, **kwargs
-                        )
-                    else:
-                        local_node_mapping = await interpret_code_blocks(
-                            literal_blocks, **kwargs
-                        )
+                    with maybe_profile(app, "suite", cache_path or app.env.docname):
+                        if use_cache:
+                            local_node_mapping = await interpret_code_blocks_with_cache(
+                                literal_blocks, cache_path, app.connection, **kwargs
+                            )
+                        else:
+                            local_node_mapping = await interpret_code_blocks(
+                                literal_blocks, **kwargs
+                            )
                     node_mapping.update(local_node_mapping)
                 except ConsoleError as exception:
                     message = (
@@ -192,6 +245,10 @@ def setup(app) -> Dict[str, Any]:
     app.add_config_value(
         "uqbar_book_extensions", ["uqbar.book.extensions.GraphExtension"], "env"
     )
+    app.add_config_value("uqbar_book_max_output_size", None, "env")
+    app.add_config_value("uqbar_book_profile", False, "", types=[bool, str])
+    app.add_config_value("uqbar_book_profile_directory", None, "")
+    app.add_config_value("uqbar_book_profile_mode", "deterministic", "")
     app.add_config_value("uqbar_book_strict", False, "env")
     app.add_config_value("uqbar_book_use_black", False, "env")
     app.add_config_value("uqbar_book_use_cache", True, "env")